@@ -1,4 +1,20 @@
-from django.contrib import admin
+from collections import defaultdict
+from decimal import Decimal, InvalidOperation
+
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ActionForm
+from django.core.exceptions import PermissionDenied
+from django.db import router, transaction
+from django.db.models import Q
+from django.http import Http404
+from django.urls import path
+
+from .bulk import bulk_update, renumber
+from . import newsletter
+from .exports import FORMATS, export_response
+from .paginators import EstimatedCountPaginator
+from .search import matching_documents
 from .models import (
     Category,
     CategoryBullet,
@@ -7,21 +23,175 @@ from .models import (
     Feedback,
     BlogPost,
     NewsletterSubscription,
+    SearchDocument,
 )
 
 
+class StreamingExportMixin:
+    """
+    "Export selected" actions plus an export of the whole filtered changelist
+    (<changelist>/export/csv/?<filters>), both streamed row by row (exports.py).
+    Set export_fields, and export_headers for friendlier column names.
+    """
+
+    export_fields = ()
+    export_headers = None
+    change_list_template = "admin/export_change_list.html"
+    actions = ("export_csv", "export_jsonl")
+
+    def get_urls(self):
+        opts = self.model._meta
+        return [
+            path(
+                "export/<str:fmt>/",
+                self.admin_site.admin_view(self.export_view),
+                name=f"{opts.app_label}_{opts.model_name}_export",
+            ),
+        ] + super().get_urls()
+
+    def _export(self, queryset, fmt):
+        return export_response(queryset, self.export_fields, fmt, self.model._meta.model_name, self.export_headers)
+
+    def export_view(self, request, fmt):
+        if fmt not in FORMATS:
+            raise Http404
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        changelist = self.get_changelist_instance(request)
+        return self._export(changelist.get_queryset(request), fmt)
+
+    @admin.action(description="Export selected as CSV", permissions=["view"])
+    def export_csv(self, request, queryset):
+        return self._export(queryset, "csv")
+
+    @admin.action(description="Export selected as JSON Lines", permissions=["view"])
+    def export_jsonl(self, request, queryset):
+        return self._export(queryset, "jsonl")
+
+
+class BulkUpdateMixin:
+    """
+    Activate / deactivate actions, and list_editable saves, as queryset UPDATEs through
+    bulk.bulk_update(): no save() per row, and each cache version is bumped once after
+    commit however many rows change. A changelist save is one UPDATE per distinct set of
+    changed values (ticking "active" on 30 rows is one statement), in the same
+    transaction as the admin's log entries.
+    """
+
+    actions = ("activate", "deactivate")
+
+    def changelist_view(self, request, extra_context=None):
+        if not (self.list_editable and request.method == "POST" and "_save" in request.POST):
+            return super().changelist_view(request, extra_context)
+        request._list_edits = defaultdict(list)
+        with transaction.atomic(using=router.db_for_write(self.model)):
+            response = super().changelist_view(request, extra_context)
+            for changes, pks in request._list_edits.items():
+                bulk_update(self.model._default_manager.filter(pk__in=pks), **dict(changes))
+        return response
+
+    def save_model(self, request, obj, form, change):
+        # The changelist's list_editable form carries only those fields and the pk.
+        if change and set(form.fields) <= {*self.list_editable, self.model._meta.pk.name}:
+            changes = tuple(sorted((name, getattr(obj, name)) for name in form.changed_data))
+            edits = getattr(request, "_list_edits", None)
+            if changes and edits is None:
+                bulk_update(self.model._default_manager.filter(pk=obj.pk), **dict(changes))
+            elif changes:
+                edits[changes].append(obj.pk)
+            return
+        super().save_model(request, obj, form, change)
+
+    def _updated(self, request, rows):
+        opts = self.model._meta
+        name = opts.verbose_name if rows == 1 else opts.verbose_name_plural
+        self.message_user(request, f"{rows} {name} updated.", messages.SUCCESS)
+
+    def _action_data(self, request):
+        """Cleaned action_form fields; the admin only runs an action once the form is valid."""
+        form = self.action_form(request.POST)
+        form.fields["action"].choices = self.get_action_choices(request)
+        form.is_valid()
+        return form.cleaned_data
+
+    @admin.action(description="Activate selected %(verbose_name_plural)s", permissions=["change"])
+    def activate(self, request, queryset):
+        self._updated(request, bulk_update(queryset, is_active=True))
+
+    @admin.action(description="Deactivate selected %(verbose_name_plural)s", permissions=["change"])
+    def deactivate(self, request, queryset):
+        self._updated(request, bulk_update(queryset, is_active=False))
+
+    @admin.action(description="Renumber sort order (10, 20, 30, ...) in list order", permissions=["change"])
+    def renumber(self, request, queryset):
+        self._updated(request, renumber(queryset))
+
+
+class ProductActionForm(ActionForm):
+    discount_type = forms.ChoiceField(
+        label="Discount", choices=[("", "---------")] + Product.DiscountType.choices, required=False
+    )
+    # Parsed by the action: a field error here would fail the whole action form, which the
+    # admin reports as "No action selected".
+    discount_value = forms.CharField(
+        label="Value", required=False, widget=forms.TextInput(attrs={"inputmode": "decimal", "size": 6})
+    )
+    category = forms.ModelChoiceField(label="Category", queryset=Category.objects.all(), required=False)
+
+
 class ProductImageInline(admin.TabularInline):
     model = ProductImage
     extra = 1
 
 
 @admin.register(Product)
-class ProductAdmin(admin.ModelAdmin):
+class ProductAdmin(BulkUpdateMixin, admin.ModelAdmin):
     list_display = ("name", "category", "price", "quantity", "is_active")
+    list_select_related = ("category",)
     list_filter = ("category", "is_active")
     search_fields = ("name", "slug")
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     prepopulated_fields = {"slug": ("name",)}
     inlines = [ProductImageInline]
+    action_form = ProductActionForm
+    actions = ("activate", "deactivate", "set_discount", "move_to_category")
+
+    @admin.action(description="Set discount on selected products (Discount, Value)", permissions=["change"])
+    def set_discount(self, request, queryset):
+        data = self._action_data(request)
+        kind = data["discount_type"]
+        if not kind:
+            self.message_user(request, "Choose a discount type.", messages.ERROR)
+            return
+        try:
+            value = Decimal(data["discount_value"] or "0").quantize(Decimal("0.01"))
+        except InvalidOperation:
+            value = None
+        if value is None or value < 0:
+            self.message_user(request, "Enter a discount value of 0 or more.", messages.ERROR)
+            return
+        if kind == Product.DiscountType.NONE:
+            value = Decimal("0.00")
+        elif kind == Product.DiscountType.PERCENT and value > 100:
+            self.message_user(request, "Percent discount cannot exceed 100.", messages.ERROR)
+            return
+        skipped = 0
+        if kind == Product.DiscountType.FIXED:
+            # Same rule as Product.clean(): a fixed discount can't exceed the price.
+            skipped = queryset.filter(price__lt=value).count()
+            queryset = queryset.filter(price__gte=value)
+        self._updated(request, bulk_update(queryset, discount_type=kind, discount_value=value))
+        if skipped:
+            self.message_user(request, f"{skipped} priced below {value} left unchanged.", messages.WARNING)
+
+    @admin.action(description="Move selected products to category (Category)", permissions=["change"])
+    def move_to_category(self, request, queryset):
+        data = self._action_data(request)
+        if data["category"] is None:
+            self.message_user(request, "Choose a category.", messages.ERROR)
+            return
+        self._updated(request, bulk_update(queryset, category=data["category"]))
 
 
 class CategoryBulletInline(admin.TabularInline):
@@ -32,16 +202,17 @@ class CategoryBulletInline(admin.TabularInline):
 
 
 @admin.register(Category)
-class CategoryAdmin(admin.ModelAdmin):
+class CategoryAdmin(BulkUpdateMixin, admin.ModelAdmin):
     list_display = ("name", "kind", "is_active", "sort_order")
     list_filter = ("kind", "is_active")
     search_fields = ("name", "tagline", "short_description")
     prepopulated_fields = {"slug": ("name",)}
     inlines = [CategoryBulletInline]
+    actions = ("activate", "deactivate", "renumber")
 
 
 @admin.register(Feedback)
-class FeedbackAdmin(admin.ModelAdmin):
+class FeedbackAdmin(BulkUpdateMixin, StreamingExportMixin, admin.ModelAdmin):
     list_display = (
         "first_name",
         "last_name",
@@ -52,8 +223,33 @@ class FeedbackAdmin(admin.ModelAdmin):
     )
     list_filter = ("star_rating", "is_active")
     search_fields = ("first_name", "last_name", "email")
-    ordering = ("-star_rating",)
+    ordering = ("-star_rating", "-id")
     list_editable = ("is_active",)
+    actions = ("activate", "deactivate", "export_csv", "export_jsonl")
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    export_fields = (
+        "id",
+        "first_name",
+        "last_name",
+        "email",
+        "product__name",
+        "star_rating",
+        "testimonial",
+        "is_active",
+        "created_at",
+    )
+    export_headers = (
+        "id",
+        "first_name",
+        "last_name",
+        "email",
+        "product",
+        "star_rating",
+        "testimonial",
+        "is_active",
+        "created_at",
+    )
 
     def get_queryset(self, request):
         queryset = super().get_queryset(request)
@@ -65,7 +261,7 @@ class FeedbackAdmin(admin.ModelAdmin):
 # =========================
 
 @admin.register(BlogPost)
-class BlogPostAdmin(admin.ModelAdmin):
+class BlogPostAdmin(BulkUpdateMixin, admin.ModelAdmin):
     list_display = (
         "title",
         "topic",
@@ -82,12 +278,15 @@ class BlogPostAdmin(admin.ModelAdmin):
         "is_featured_home",
         "is_featured_page",
     )
+    # Excerpt and body text are matched through the search index (published posts) and a
+    # scan of the hidden ones, see get_search_results.
     search_fields = (
         "title",
         "slug",
-        "excerpt",
-        "body",
     )
+    search_help_text = "Title or slug, or words from the excerpt or body."
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     prepopulated_fields = {"slug": ("title",)}
     date_hierarchy = "published_at"
     ordering = ("sort_order", "-published_at")
@@ -97,6 +296,7 @@ class BlogPostAdmin(admin.ModelAdmin):
         "is_active",
         "sort_order",
     )
+    actions = ("activate", "deactivate", "feature_home", "unfeature_home", "renumber")
     readonly_fields = ("created_at", "updated_at")
     fieldsets = (
         (None, {
@@ -130,11 +330,41 @@ class BlogPostAdmin(admin.ModelAdmin):
         }),
     )
 
+    @admin.action(description="Feature selected posts on the home page", permissions=["change"])
+    def feature_home(self, request, queryset):
+        self._updated(request, bulk_update(queryset, is_featured_home=True))
+
+    @admin.action(description="Remove selected posts from the home page", permissions=["change"])
+    def unfeature_home(self, request, queryset):
+        self._updated(request, bulk_update(queryset, is_featured_home=False))
+
+    def get_search_results(self, request, queryset, search_term):
+        results, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        documents = matching_documents(search_term, SearchDocument.Kind.POST)
+        if documents is not None:
+            results |= queryset.filter(pk__in=documents)
+            # Only published posts are indexed; the hidden ones (drafts, retired posts) are
+            # few, so their text is scanned.
+            hidden = queryset.filter(is_active=False)
+            for term in search_term.split():
+                hidden = hidden.filter(Q(excerpt__icontains=term) | Q(body__icontains=term))
+            results |= hidden
+        return results, may_have_duplicates
+
 
 @admin.register(NewsletterSubscription)
-class NewsletterSubscriptionAdmin(admin.ModelAdmin):
+class NewsletterSubscriptionAdmin(StreamingExportMixin, admin.ModelAdmin):
     list_display = ("email", "is_active", "created_at", "unsubscribed_at")
     list_filter = ("is_active",)
     search_fields = ("email",)
     readonly_fields = ("created_at", "unsubscribed_at")
-    ordering = ("-created_at",)
+    ordering = ("-created_at", "-id")
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    export_fields = ("id", "email", "is_active", "created_at", "unsubscribed_at")
+    actions = ("unsubscribe", "export_csv", "export_jsonl")
+
+    @admin.action(description="Unsubscribe selected addresses", permissions=["change"])
+    def unsubscribe(self, request, queryset):
+        rows = newsletter.unsubscribe(queryset.values_list("email", flat=True))
+        self.message_user(request, f"{rows} unsubscribed.", messages.SUCCESS)
@@ -0,0 +1,191 @@
+"""
+Static bundles and the small minifiers used by `manage.py build_static`.
+
+Sources are static paths as found by the staticfiles finders. Bundles are written to
+STATIC_BUILD_DIR/bundles/<name>.<ext>, then collectstatic fingerprints and precompresses
+them. Templates load them with {% css_bundle %} / {% js_modules %}, which fall back to the
+individual source files when STATIC_BUNDLES is off (development). JS modules are minified
+one by one to STATIC_BUILD_DIR/bundles/js/<name>.js rather than concatenated.
+
+Critical CSS per page type is written by `manage.py build_critical_css` to
+STATIC_BUILD_DIR/critical/<type>.css and inlined by {% page_css %}, which then loads the
+page's bundles without blocking render.
+
+Responsive image variants are written by `manage.py optimize_static_images` next to the
+bundles, described by RESPONSIVE_MANIFEST, and emitted by {% static_img %}.
+"""
+import json
+import re
+from pathlib import Path
+
+from django.conf import settings
+
+CSS_BUNDLES = {
+    "base": [
+        "css/style.css",
+        "css/navbar.css",
+        "css/footer.css",
+        "css/shop/sidecart.css",
+    ],
+    "home": ["css/home/h_home.css"],
+    "category": ["css/category/c_category.css"],
+    "marquee": ["css/components/mrqs.css"],
+}
+
+# Bundles each page type needs, in cascade order. Templates pick their type with
+# {% page_css "<type>" %}; `manage.py build_critical_css` writes critical/<type>.css.
+PAGE_CSS = {
+    "home": ["base", "home", "category", "marquee"],
+    "category": ["base", "home", "category"],
+    "product": ["base", "home", "category"],
+    "blog": ["base", "home"],
+    "legal": ["base"],
+    "cart": ["base"],
+    "page": ["base", "home", "marquee"],
+}
+
+# ES modules. "main" runs on every page and dynamically imports the others as
+# "fsmd/<name>" when the page has markup for them; {% js_modules %} renders the import map.
+JS_MODULES = {
+    "main": "js/main.js",
+    "result_slider": "js/modules/result_slider.js",
+    "carousels": "js/modules/carousels.js",
+    "products": "js/modules/products.js",
+    "blog": "js/modules/blog.js",
+    "product_detail": "js/modules/product_detail.js",
+    "cart": "js/modules/cart.js",
+    "autocomplete": "js/modules/autocomplete.js",
+}
+
+
+def bundle_path(name: str, ext: str) -> str:
+    return f"bundles/{name}.{ext}"
+
+
+def module_path(name: str) -> str:
+    return f"bundles/js/{name}.js"
+
+
+_CSS_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+_CSS_SPACE = re.compile(r"\s+")
+_CSS_PUNCT = re.compile(r"\s*([{};,>])\s*")
+
+
+def minify_css(source: str) -> str:
+    css = _CSS_COMMENT.sub("", source)
+    css = _CSS_SPACE.sub(" ", css)
+    css = _CSS_PUNCT.sub(r"\1", css)
+    return css.replace(";}", "}").strip()
+
+
+_JS_LINE_COMMENT = re.compile(r"^\s*//.*$")
+_JS_BLOCK_COMMENT_LINE = re.compile(r"^\s*/\*.*\*/\s*$")
+
+
+def _js_line_state(line: str, stack: list) -> None:
+    """
+    Advance stack over one line: "`" while in template text, "{" inside a ${...}
+    expression, "*" inside a block comment. Quotes and // only matter in code, and
+    '...'/"..." strings can't span lines. Regex literals aren't recognised.
+    """
+    i, n, quote = 0, len(line), None
+    while i < n:
+        c, top = line[i], stack[-1] if stack else None
+        if top == "*":
+            if line.startswith("*/", i):
+                stack.pop()
+                i += 1
+        elif top == "`":
+            if c == "\\":
+                i += 1
+            elif c == "`":
+                stack.pop()
+            elif line.startswith("${", i):
+                stack.append("{")
+                i += 1
+        elif quote:
+            if c == "\\":
+                i += 1
+            elif c == quote:
+                quote = None
+        elif c in "'\"":
+            quote = c
+        elif c == "`":
+            stack.append("`")
+        elif line.startswith("//", i):
+            return
+        elif line.startswith("/*", i):
+            stack.append("*")
+            i += 1
+        elif c == "{" and top == "{":
+            stack.append("{")
+        elif c == "}" and top == "{":
+            stack.pop()
+        i += 1
+
+
+def minify_js(source: str) -> str:
+    """
+    Conservative, line-based: drops whole-line comments, indentation and blank lines.
+    Lines inside a template literal are part of its value, so they're kept verbatim,
+    including ones that look like comments. Never rewrites inside a line.
+    """
+    lines, stack = [], []
+    for line in source.splitlines():
+        in_literal = "`" in stack
+        _js_line_state(line, stack)
+        if in_literal:
+            lines.append(line if "`" in stack else line.rstrip())
+            continue
+        if _JS_LINE_COMMENT.match(line) or _JS_BLOCK_COMMENT_LINE.match(line):
+            continue
+        line = line.lstrip() if "`" in stack else line.strip()
+        if line:
+            lines.append(line)
+    return "\n".join(lines) + "\n"
+
+
+RESPONSIVE_WIDTHS = (480, 960, 1600)
+RESPONSIVE_FORMATS = ("avif", "webp")
+RESPONSIVE_MANIFEST = "images/responsive.json"
+RESPONSIVE_SOURCE_EXTS = (".jpg", ".jpeg", ".png")
+
+
+def variant_path(source: str, width: int, ext: str) -> str:
+    """images/home/faq.jpg -> images/home/faq.960w.webp"""
+    stem = source.rsplit(".", 1)[0]
+    return f"{stem}.{width}w.{ext}"
+
+
+_build_files = {}
+
+
+def read_build_file(name: str, parse=None, default=None):
+    """
+    A file under STATIC_BUILD_DIR, optionally parsed, or default if it doesn't exist.
+
+    Re-read only when the file's mtime changes, so a rebuild is picked up without a restart.
+    """
+    path = Path(settings.STATIC_BUILD_DIR) / name
+    try:
+        mtime = path.stat().st_mtime
+    except OSError:
+        return default
+    cached = _build_files.get(name)
+    if cached is None or cached[0] != mtime:
+        text = path.read_text(encoding="utf-8")
+        try:
+            data = parse(text) if parse else text
+        except ValueError:
+            data = default
+        cached = _build_files[name] = (mtime, data)
+    return cached[1]
+
+
+def responsive_manifest() -> dict:
+    """{source: {"width", "height", "bytes", "variants": {ext: [[width, path, bytes], ...]}}}"""
+    return read_build_file(RESPONSIVE_MANIFEST, json.loads, {})
+
+
+def critical_path(page_type: str) -> str:
+    return f"critical/{page_type}.css"
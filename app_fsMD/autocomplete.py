@@ -0,0 +1,99 @@
+"""
+Typeahead suggestions for the navbar search box.
+
+A prefix index over the active catalog (program and product names and slugs, straight
+from the CatalogSnapshot) and blog post titles, rebuilt at most once per content version
+in each process. Every word start of every name is a key ("glp" finds "Semaglutide
+(GLP-1)") in a sorted list, so a lookup is a couple of bisects and a short scan; no
+database query is made once the index exists.
+"""
+import bisect
+import re
+import unicodedata
+from array import array
+
+from django.core.cache import cache
+from django.urls import reverse
+
+from .catalog import get_catalog, site_cache_version
+from .models import BlogPost
+
+MIN_CHARS = 2
+MAX_SUGGESTIONS = 8
+# Keys looked at per group and lookup; a two-letter prefix can cover thousands.
+MAX_SCAN = 400
+
+KIND_RANK = {"program": 0, "product": 1, "post": 2}
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+
+def normalize(text: str) -> str:
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode()
+    return " ".join(_NON_WORD.sub(" ", text.lower()).split())
+
+
+class PrefixIndex:
+    """
+    Two sorted key lists: names from their first word, then from every later word. A name
+    that starts with the query always outranks one where a later word does.
+    """
+
+    __slots__ = ("version", "entries", "groups")
+
+    def __init__(self, version, entries):
+        """entries: [(label, url, kind, extra text to index such as the slug), ...]"""
+        self.version = version
+        self.entries = tuple((label, url, kind) for label, url, kind, _ in entries)
+        starts, later = set(), set()
+        for i, (label, _, _, extra) in enumerate(entries):
+            for text in (label, extra):
+                words = normalize(text).split(" ")
+                starts.add((" ".join(words), i))
+                later.update((" ".join(words[offset:]), i) for offset in range(1, len(words)))
+        self.groups = []
+        for pairs in (sorted(starts), sorted(later)):
+            self.groups.append(([key for key, _ in pairs], array("I", (i for _, i in pairs))))
+
+    def lookup(self, query: str, limit: int = MAX_SUGGESTIONS) -> list:
+        prefix = normalize(query)
+        if len(prefix) < MIN_CHARS:
+            return []
+        found = []
+        for keys, entry_ids in self.groups:
+            lo = bisect.bisect_left(keys, prefix)
+            hi = min(bisect.bisect_left(keys, prefix + "\x7f", lo), lo + MAX_SCAN)
+            seen = set(found)
+            group = {entry_ids[j] for j in range(lo, hi)} - seen
+            # Programs, then products, then posts; shorter names first.
+            found += sorted(group, key=lambda i: (KIND_RANK[self.entries[i][2]], len(self.entries[i][0])))
+            if len(found) >= limit:
+                break
+        return [self.entries[i] for i in found[:limit]]
+
+
+def _build(version) -> PrefixIndex:
+    catalog = get_catalog()
+    blog_url = reverse("blgs_updts")
+    entries = [(c.name, c.url, "program", c.slug) for c in catalog.categories]
+    entries += [(p.name, p.url, "product", f"{p.slug} {p.category.name}") for p in catalog.products]
+    entries += [
+        (title, f"{blog_url}?slug={slug}", "post", slug)
+        for title, slug in BlogPost.objects.filter(is_active=True).values_list("title", "slug")
+    ]
+    return PrefixIndex(version, entries)
+
+
+_index = None
+
+
+def index_version() -> tuple:
+    return site_cache_version(), cache.get_or_set("blog_cache_v", 1, None)
+
+
+def get_prefix_index() -> PrefixIndex:
+    global _index
+    v = index_version()
+    index = _index
+    if index is None or index.version != v:
+        index = _index = _build(v)
+    return index
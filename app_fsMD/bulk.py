@@ -0,0 +1,104 @@
+"""
+Bulk writes for admin actions and list_editable saves.
+
+`queryset.update()` is one UPDATE and sends no post_save, so none of the per-row work in
+signals.py runs: no WebP check and no cache version bump per row. `bulk_update()` does
+that work once for the whole set instead: it reindexes the rows when a searchable field
+changed, marks sitemap shards and related-product rows dirty, and bumps each cache
+version once, after the transaction commits.
+"""
+from django.db import transaction
+from django.db.models import Case, IntegerField, Value, When
+from django.utils import timezone
+
+from .models import BlogPost, Category, Feedback, Product
+from .related import mark_related_dirty
+from .search import index_posts, index_products
+from .signals import bump_on_commit
+from .sitemaps import mark_sitemaps_dirty
+
+RENUMBER_STEP = 10
+
+# Changes to these reach the search index and the related-product rows; anything else
+# (price, discount, stock, ordering, featured flags) only the cached pages.
+PRODUCT_LISTED = {"is_active", "category", "category_id", "name", "slug", "short_details", "long_details"}
+CATEGORY_LISTED = {"is_active", "name", "slug"}
+POST_LISTED = {"is_active", "title", "slug", "excerpt", "body"}
+
+
+def _products_changed(ids, fields, category_ids):
+    bump_on_commit("site_cache_v")
+    mark_sitemaps_dirty("products", ids)
+    if fields & PRODUCT_LISTED:
+        index_products(Product.objects.filter(pk__in=ids))
+        bump_on_commit("search_v")
+        mark_related_dirty(ids, category_ids)
+
+
+def _categories_changed(ids, fields, category_ids):
+    bump_on_commit("site_cache_v")
+    mark_sitemaps_dirty("categories", ids)
+    mark_sitemaps_dirty("products", Product.objects.filter(category__in=ids).values_list("pk", flat=True))
+    if fields & CATEGORY_LISTED:
+        products = Product.objects.filter(category__in=ids)
+        index_products(products)
+        bump_on_commit("search_v")
+        mark_related_dirty(list(products.values_list("pk", flat=True)), ids)
+
+
+def _posts_changed(ids, fields, category_ids):
+    bump_on_commit("blog_cache_v")
+    mark_sitemaps_dirty("blog", ids)
+    if fields & POST_LISTED:
+        index_posts(BlogPost.objects.filter(pk__in=ids))
+        bump_on_commit("search_v")
+
+
+def _feedback_changed(ids, fields, category_ids):
+    bump_on_commit("feedback_cache_v")
+
+
+AFTER_UPDATE = {
+    Product: _products_changed,
+    Category: _categories_changed,
+    BlogPost: _posts_changed,
+    Feedback: _feedback_changed,
+}
+
+
+def bulk_update(queryset, **changes) -> int:
+    """
+    queryset.update(**changes), plus what the rows' save() signals would have done, once
+    for all of them. Returns the number of rows updated.
+    """
+    model = queryset.model
+    if "updated_at" in {f.name for f in model._meta.concrete_fields}:
+        changes.setdefault("updated_at", timezone.now())
+
+    with transaction.atomic(using=queryset.db):
+        # Read first: the update can take rows out of the queryset's own filter.
+        ids = list(queryset.order_by().values_list("pk", flat=True))
+        if not ids:
+            return 0
+        category_ids = set()
+        if model is Product:
+            category_ids = set(Product.objects.filter(pk__in=ids).values_list("category_id", flat=True).distinct())
+            new_category = changes.get("category", changes.get("category_id"))
+            if new_category is not None:
+                category_ids.add(getattr(new_category, "pk", new_category))
+
+        rows = model._default_manager.filter(pk__in=ids).update(**changes)
+        AFTER_UPDATE[model](ids, set(changes), category_ids)
+    return rows
+
+
+def renumber(queryset, field: str = "sort_order", step: int = RENUMBER_STEP) -> int:
+    """Set `field` to step, 2 * step, ... following the queryset's order, in one UPDATE."""
+    ids = list(queryset.values_list("pk", flat=True))
+    if not ids:
+        return 0
+    position = Case(
+        *[When(pk=pk, then=Value(i * step)) for i, pk in enumerate(ids, 1)],
+        output_field=IntegerField(),
+    )
+    return bulk_update(queryset.model._default_manager.filter(pk__in=ids), **{field: position})
@@ -0,0 +1,221 @@
+"""
+Cart event log and "frequently bought together".
+
+Cart views record add / set / remove events into a per-process BufferedWriter; its
+thread writes them to CartEvent with one bulk insert every FLUSH_SECONDS (or sooner once
+FLUSH_SIZE are waiting), so a request never waits on the log.
+
+`aggregate()` (manage.py aggregate_cart_events) reads the log in id order from a saved
+cursor and streams it into ProductPair counts: each product added to a cart counts
+once against every product that cart already held. Only each batch and the touched
+carts' earlier items are in memory at a time.
+"""
+import math
+import secrets
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import connections, router, transaction
+from django.db.models import F, Min
+from django.utils import timezone
+
+from .models import AggregationCursor, CartEvent, ProductPair
+from .utils.buffers import BufferedWriter
+
+BASKET_SESSION_KEY = "cart_basket"
+
+FLUSH_SIZE = 200
+FLUSH_SECONDS = 2.0
+MAX_BUFFERED = 10_000
+
+CURSOR_NAME = "cart_pairs"
+# Events younger than this may still sit in another process's buffer, or be committed
+# out of id order by a concurrent flush; the aggregation leaves them for its next run.
+SETTLE_SECONDS = 60
+# A cart this full is a bot or a bulk order; later additions don't add pairs.
+MAX_BASKET_ITEMS = 25
+# Pairs seen in fewer carts than this are noise.
+MIN_PAIR_CARTS = 2
+TOP_PAIRS = 20
+
+_COUNTED = (CartEvent.Action.ADD, CartEvent.Action.SET)
+
+
+def pairs_version() -> int:
+    return cache.get_or_set("pairs_v", 1, None)
+
+
+def _bump_version() -> None:
+    try:
+        cache.incr("pairs_v")
+    except ValueError:
+        cache.set("pairs_v", 2, None)
+
+
+# Logging ----------------------------------------------------------------------------
+
+def _write_events(rows) -> None:
+    CartEvent.objects.bulk_create(
+        [
+            CartEvent(basket=basket, product_id=product_id, action=action, qty=qty, created_at=at)
+            for basket, product_id, action, qty, at in rows
+        ],
+        batch_size=500,
+    )
+
+
+_buffer = BufferedWriter(
+    "cart-events", _write_events, flush_size=FLUSH_SIZE, flush_seconds=FLUSH_SECONDS, max_buffered=MAX_BUFFERED
+)
+
+
+def basket_id(session) -> int:
+    """Random id for this session's cart, stable for the session's lifetime."""
+    basket = session.get(BASKET_SESSION_KEY)
+    if basket is None:
+        basket = session[BASKET_SESSION_KEY] = secrets.randbits(62)
+    return basket
+
+
+def log_cart_event(request, action, product_id: int, qty: int = 0) -> None:
+    _buffer.append((basket_id(request.session), int(product_id), int(action), max(0, int(qty)), timezone.now()))
+
+
+def flush_cart_events() -> int:
+    return _buffer.flush()
+
+
+# Aggregation ------------------------------------------------------------------------
+
+def _earlier_items(baskets, last_id: int) -> dict:
+    """{basket: {product ids}} from events already counted (id <= last_id)."""
+    items = defaultdict(set)
+    baskets = list(baskets)
+    for i in range(0, len(baskets), 500):
+        for basket, product_id in (
+            CartEvent.objects.filter(basket__in=baskets[i:i + 500], id__lte=last_id, action__in=_COUNTED)
+            .values_list("basket", "product_id")
+            .distinct()
+        ):
+            items[basket].add(product_id)
+    return items
+
+
+def _add_counts(deltas: Counter) -> None:
+    """ProductPair.carts += delta for each (a, b)."""
+    if not deltas:
+        return
+    connection = connections[router.db_for_write(ProductPair)]
+    if connection.vendor in ("sqlite", "postgresql"):
+        # One upsert statement executed per row, no read-back: both backends share the syntax.
+        table = connection.ops.quote_name(ProductPair._meta.db_table)
+        sql = (
+            f"INSERT INTO {table} (product_a, product_b, carts) VALUES (%s, %s, %s) "
+            f"ON CONFLICT (product_a, product_b) DO UPDATE SET carts = {table}.carts + excluded.carts"
+        )
+        with connection.cursor() as cursor:
+            cursor.executemany(sql, [(a, b, n) for (a, b), n in deltas.items()])
+        return
+    for (a, b), n in deltas.items():
+        if not ProductPair.objects.filter(product_a=a, product_b=b).update(carts=F("carts") + n):
+            ProductPair.objects.create(product_a=a, product_b=b, carts=n)
+
+
+def count_pairs(events, earlier: dict) -> Counter:
+    """
+    Pair deltas for (basket, product_id) events in log order. `earlier` holds each
+    basket's already-counted products and is updated in place.
+    """
+    deltas = Counter()
+    for basket, product_id in events:
+        held = earlier.setdefault(basket, set())
+        if product_id in held or len(held) >= MAX_BASKET_ITEMS:
+            continue
+        deltas[product_id, product_id] += 1
+        for other in held:
+            deltas[min(product_id, other), max(product_id, other)] += 1
+        held.add(product_id)
+    return deltas
+
+
+def aggregate(batch_size: int = 5000) -> dict:
+    """Count the settled events added since the last run into ProductPair."""
+    settled = timezone.now() - timedelta(seconds=SETTLE_SECONDS)
+    stats = {"events": 0, "pairs": 0}
+    while True:
+        with transaction.atomic():
+            cursor, _ = AggregationCursor.objects.select_for_update().get_or_create(name=CURSOR_NAME)
+            events = CartEvent.objects.filter(id__gt=cursor.last_id)
+            # created_at isn't monotonic in id (a delayed or retried flush, a late commit), so
+            # the batch stops below the first unsettled event rather than skipping past it.
+            unsettled = events.filter(created_at__gte=settled).aggregate(first=Min("id"))["first"]
+            if unsettled is not None:
+                events = events.filter(id__lt=unsettled)
+            batch = list(events.order_by("id").values_list("id", "basket", "product_id", "action")[:batch_size])
+            if not batch:
+                break
+            events = [(basket, product_id) for _, basket, product_id, action in batch if action in _COUNTED]
+            deltas = count_pairs(events, _earlier_items({basket for basket, _ in events}, cursor.last_id))
+            _add_counts(deltas)
+            cursor.last_id = batch[-1][0]
+            cursor.save(update_fields=["last_id", "updated_at"])
+        stats["events"] += len(batch)
+        stats["pairs"] += len(deltas)
+        if len(batch) < batch_size:
+            break
+    if stats["events"]:
+        _bump_version()
+    return stats
+
+
+def prune_events(days: int) -> int:
+    """Delete counted events older than `days`; returns the number deleted."""
+    cursor = AggregationCursor.objects.filter(name=CURSOR_NAME).first()
+    if cursor is None:
+        return 0
+    cutoff = timezone.now() - timedelta(days=days)
+    deleted, _ = CartEvent.objects.filter(id__lte=cursor.last_id, created_at__lt=cutoff).delete()
+    return deleted
+
+
+# Serving ----------------------------------------------------------------------------
+
+_scores = None
+
+
+def pair_scores() -> dict:
+    """
+    {product_id: {other_id: score}} for the TOP_PAIRS partners of each product, score =
+    carts with both / sqrt(carts with each). Loaded once per `pairs_v` in each process.
+    """
+    global _scores
+    v = pairs_version()
+    loaded = _scores
+    if loaded is None or loaded[0] != v:
+        singles, pairs = {}, []
+        for a, b, carts in ProductPair.objects.values_list("product_a", "product_b", "carts").iterator(chunk_size=5000):
+            if a == b:
+                singles[a] = carts
+            elif carts >= MIN_PAIR_CARTS:
+                pairs.append((a, b, carts))
+        partners = defaultdict(list)
+        for a, b, carts in pairs:
+            score = carts / math.sqrt(singles.get(a, carts) * singles.get(b, carts))
+            partners[a].append((score, b))
+            partners[b].append((score, a))
+        table = {pid: dict((b, s) for s, b in sorted(items, reverse=True)[:TOP_PAIRS]) for pid, items in partners.items()}
+        loaded = _scores = (v, table)
+    return loaded[1]
+
+
+def bought_together(product_ids, catalog, limit: int = 4) -> list:
+    """Active ProductRecords most often in a cart with any of product_ids, best first."""
+    scores = pair_scores()
+    wanted = set(product_ids)
+    totals = Counter()
+    for pid in wanted:
+        for other, score in scores.get(pid, {}).items():
+            if other not in wanted and other in catalog.products_by_id:
+                totals[other] += score
+    return [catalog.products_by_id[pid] for pid, _ in totals.most_common(limit)]
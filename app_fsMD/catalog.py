@@ -0,0 +1,214 @@
+"""
+One in-memory, read-only view of the active catalog per `site_cache_v`.
+
+The snapshot is built from four queries, pickled once into the shared cache and then
+memoised per worker process until the cache version changes, so every page shape
+(nav, listings, detail pages, marquee) is sliced from the same records.
+"""
+import time
+
+from django.core.cache import cache
+from django.db.models import Prefetch
+from django.urls import reverse
+
+from .models import Category, CategoryBullet, Product, ProductImage
+
+
+TTL_CATALOG = 60 * 60
+
+
+def site_cache_version() -> int:
+    return cache.get_or_set("site_cache_v", 1, None)
+
+
+def _image_url(field) -> str:
+    return field.url if field and getattr(field, "name", "") else ""
+
+
+class CategoryRecord:
+    __slots__ = (
+        "id",
+        "name",
+        "slug",
+        "url",
+        "kind",
+        "kind_label",
+        "tagline",
+        "short_description",
+        "long_description",
+        "image_url",
+        "sort_order",
+        "bullets",
+        "active_product_count",
+    )
+
+    def __init__(self, category: Category, url: str):
+        self.id = category.id
+        self.name = category.name
+        self.slug = category.slug
+        self.url = url
+        self.kind = category.kind
+        self.kind_label = category.get_kind_display()
+        self.tagline = category.tagline
+        self.short_description = category.short_description
+        self.long_description = category.long_description
+        self.image_url = _image_url(category.image)
+        self.sort_order = category.sort_order
+        self.bullets = tuple(b.text for b in category.bullets.all())
+        self.active_product_count = category.active_product_count
+
+    def __str__(self):
+        return self.name
+
+
+class ProductImageRecord:
+    __slots__ = ("url", "alt_text")
+
+    def __init__(self, url: str, alt_text: str):
+        self.url = url
+        self.alt_text = alt_text
+
+
+class ProductRecord:
+    __slots__ = (
+        "id",
+        "name",
+        "slug",
+        "url",
+        "category",
+        "category_id",
+        "short_details",
+        "long_details",
+        "main_image_url",
+        "images",
+        "price",
+        "final_price",
+        "discount_type",
+        "discount_value",
+        "quantity",
+        "requires_prescription",
+        "requires_consultation",
+        "created_at",
+        "updated_at",
+    )
+
+    def __init__(self, product: Product, category: CategoryRecord, url: str, images=()):
+        self.id = product.id
+        self.name = product.name
+        self.slug = product.slug
+        self.url = url
+        self.category = category
+        self.category_id = category.id
+        self.short_details = product.short_details
+        self.long_details = product.long_details
+        self.main_image_url = _image_url(product.main_image)
+        self.images = images
+        self.price = product.price
+        self.final_price = product.final_price
+        self.discount_type = product.discount_type
+        self.discount_value = product.discount_value
+        self.quantity = product.quantity
+        self.requires_prescription = product.requires_prescription
+        self.requires_consultation = product.requires_consultation
+        self.created_at = product.created_at
+        self.updated_at = product.updated_at
+
+    def __str__(self):
+        return self.name
+
+
+class CatalogSnapshot:
+    """
+    Active categories (sort_order, name) and active products in active categories (name),
+    indexed by id, slug and category. Treat every attribute as read-only: the same
+    instance is shared by all requests in the process.
+    """
+
+    __slots__ = (
+        "version",
+        "categories",
+        "products",
+        "categories_by_id",
+        "categories_by_slug",
+        "products_by_id",
+        "products_by_slug",
+        "products_by_category",
+        "build_seconds",
+    )
+
+    def __init__(self, version, categories, products, build_seconds=0.0):
+        self.version = version
+        self.categories = tuple(categories)
+        self.products = tuple(products)
+        self.categories_by_id = {c.id: c for c in self.categories}
+        self.categories_by_slug = {c.slug: c for c in self.categories}
+        self.products_by_id = {p.id: p for p in self.products}
+        self.products_by_slug = {p.slug: p for p in self.products}
+
+        by_category = {c.id: [] for c in self.categories}
+        for p in self.products:
+            by_category[p.category_id].append(p)
+        self.products_by_category = {cid: tuple(items) for cid, items in by_category.items()}
+        self.build_seconds = build_seconds
+
+    @classmethod
+    def build(cls, version=None) -> "CatalogSnapshot":
+        started = time.perf_counter()
+
+        # Reverse once and substitute: slugs never need escaping in these paths.
+        category_url = reverse("prgrm_dtls", kwargs={"slug": "slug"}).replace("slug", "{}", 1)
+        product_url = reverse("prdct_dtls", kwargs={"slug": "slug"}).replace("slug", "{}", 1)
+
+        categories = [
+            CategoryRecord(c, category_url.format(c.slug))
+            for c in Category.objects.filter(is_active=True)
+            .prefetch_related(
+                Prefetch(
+                    "bullets",
+                    queryset=CategoryBullet.objects.filter(is_active=True).order_by("sort_order", "id"),
+                )
+            )
+            .order_by("sort_order", "name")
+        ]
+        by_id = {c.id: c for c in categories}
+
+        # Gallery images grouped in one pass instead of a prefetch per product chunk.
+        image_storage = ProductImage._meta.get_field("image").storage
+        images = {}
+        for product_id, name, alt_text in (
+            ProductImage.objects.filter(is_active=True, product__is_active=True)
+            .order_by("sort_order", "id")
+            .values_list("product_id", "image", "alt_text")
+        ):
+            if name:
+                images.setdefault(product_id, []).append(ProductImageRecord(image_storage.url(name), alt_text))
+
+        products = [
+            ProductRecord(p, by_id[p.category_id], product_url.format(p.slug), tuple(images.get(p.id, ())))
+            for p in Product.objects.filter(is_active=True, category__is_active=True)
+            .order_by("name")
+            .iterator(chunk_size=2000)
+        ]
+
+        return cls(version, categories, products, time.perf_counter() - started)
+
+    def products_for(self, category_id) -> tuple:
+        return self.products_by_category.get(category_id, ())
+
+
+_snapshot = None
+
+
+def get_catalog() -> CatalogSnapshot:
+    """Return the snapshot for the current cache version, building it at most once per version."""
+    global _snapshot
+    v = site_cache_version()
+    snap = _snapshot
+    if snap is None or snap.version != v:
+        key = f"{v}:catalog_snapshot"
+        snap = cache.get(key)
+        if snap is None:
+            snap = CatalogSnapshot.build(v)
+            cache.set(key, snap, TTL_CATALOG)
+        _snapshot = snap
+    return snap
@@ -0,0 +1,189 @@
+"""
+Critical-CSS extraction used by `manage.py build_critical_css`.
+
+No browser is involved: a page is rendered through the test client, the tags, classes and
+ids of the elements above the fold (everything before <main> plus its first FOLD_SECTIONS
+top-level sections) are collected, and every rule whose selectors only mention those
+tokens is kept. Matching ignores combinators and structure, so it errs on the side of
+keeping a rule. @keyframes are kept when a kept rule names them.
+"""
+import re
+from html.parser import HTMLParser
+
+from .assets import minify_css
+
+FOLD_SECTIONS = 2
+
+# Classes main.js toggles on above-the-fold elements before the deferred CSS may have
+# arrived (the loader is hidden on `load`, the navbar goes transparent on scroll).
+RUNTIME_TOKENS = {".hidden", ".show", ".transparent", ".is-hidden"}
+
+_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+_PSEUDO_ARGS = re.compile(r":(?:not|is|where|has)\((?:[^()]|\([^()]*\))*\)")
+_PSEUDO = re.compile(r"::?[a-zA-Z-]+(?:\([^)]*\))?")
+_ATTR = re.compile(r"\[[^\]]*\]")
+_COMPOUND = re.compile(r"[\s>+~]+")
+_TOKEN = re.compile(r"([.#]?)(-?[_a-zA-Z][\w-]*)")
+_ANIMATION = re.compile(r"animation(?:-name)?\s*:([^;}]*)")
+
+
+class Rule:
+    __slots__ = ("prelude", "body", "children")
+
+    def __init__(self, prelude, body="", children=None):
+        self.prelude = prelude.strip()
+        self.body = body
+        self.children = children
+
+    @property
+    def at_name(self):
+        return self.prelude.split(None, 1)[0][1:].lower() if self.prelude.startswith("@") else ""
+
+    def css(self) -> str:
+        if self.children is not None:
+            return f"{self.prelude}{{{''.join(child.css() for child in self.children)}}}"
+        return f"{self.prelude}{{{self.body}}}"
+
+
+def parse_css(source: str) -> list:
+    rules, _ = _parse_block(_COMMENT.sub("", source), 0)
+    return rules
+
+
+def _parse_block(css: str, pos: int):
+    rules = []
+    while True:
+        brace = css.find("{", pos)
+        close = css.find("}", pos)
+        if brace == -1 or (close != -1 and close < brace):
+            return rules, (len(css) if close == -1 else close + 1)
+
+        prelude = css[pos:brace]
+        if ";" in prelude and prelude.lstrip().startswith("@"):
+            # Statement at-rules (@import, @charset) before the block; keep them verbatim.
+            head, prelude = prelude.rsplit(";", 1)
+            rules.extend(Rule(stmt, body=None) for stmt in head.split(";") if stmt.strip())
+
+        rule = Rule(prelude)
+        if rule.at_name in ("media", "supports", "layer", "container"):
+            rule.children, pos = _parse_block(css, brace + 1)
+        else:
+            depth, end = 1, brace + 1
+            while depth and end < len(css):
+                depth += {"{": 1, "}": -1}.get(css[end], 0)
+                end += 1
+            rule.body = css[brace + 1:end - 1]
+            pos = end
+        rules.append(rule)
+
+
+def selector_matches(selector: str, tokens: set) -> bool:
+    selector = _ATTR.sub("", _PSEUDO.sub("", _PSEUDO_ARGS.sub("", selector)))
+    for compound in _COMPOUND.split(selector.strip()):
+        for kind, name in _TOKEN.findall(compound):
+            token = kind + name if kind else name.lower()
+            if token not in tokens:
+                return False
+    return True
+
+
+def _keep(rule: Rule, tokens: set) -> bool:
+    if rule.body is None:
+        return True
+    if rule.at_name in ("font-face", "property", "page"):
+        return True
+    if rule.at_name:
+        return False
+    return any(selector_matches(selector, tokens) for selector in rule.prelude.split(","))
+
+
+def _filter(rules: list, tokens: set) -> list:
+    kept = []
+    for rule in rules:
+        if rule.children is not None:
+            children = _filter(rule.children, tokens)
+            if children:
+                kept.append(Rule(rule.prelude, children=children))
+        elif _keep(rule, tokens):
+            kept.append(rule)
+    return kept
+
+
+def _animations(rules: list) -> set:
+    names = set()
+    for rule in rules:
+        if rule.children is not None:
+            names |= _animations(rule.children)
+        elif rule.body:
+            for value in _ANIMATION.findall(rule.body):
+                names.update(re.findall(r"[_a-zA-Z][\w-]*", value))
+    return names
+
+
+def _keyframes(rules: list, names: set) -> list:
+    found = []
+    for rule in rules:
+        if rule.children is not None:
+            found += _keyframes(rule.children, names)
+        elif rule.at_name.endswith("keyframes") and rule.prelude.split()[-1] in names:
+            found.append(rule)
+    return found
+
+
+def extract_critical(css: str, tokens: set) -> str:
+    rules = parse_css(css)
+    kept = _filter(rules, tokens)
+    kept += _keyframes(rules, _animations(kept))
+    return minify_css("".join(rule.css() for rule in kept))
+
+
+def css_uses(css: str, tokens: set) -> int:
+    """Number of style rules in css that match the page at all."""
+    def count(rules):
+        return sum(count(r.children) if r.children is not None else (not r.at_name and _keep(r, tokens)) for r in rules)
+    return count(parse_css(css))
+
+
+class _TokenCollector(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.page, self.fold = {"*", "html", "body", ":root"}, {"*", "html", "body", ":root"}
+        self.in_main = False
+        self.depth = 0
+        self.sections = 0
+
+    def handle_starttag(self, tag, attrs):
+        tokens = {tag}
+        for key, value in attrs:
+            if key == "class" and value:
+                tokens.update("." + cls for cls in value.split())
+            elif key == "id" and value:
+                tokens.add("#" + value)
+        self.page |= tokens
+        if self.sections < FOLD_SECTIONS:
+            self.fold |= tokens
+
+        if tag == "main":
+            self.in_main, self.depth = True, 0
+        elif self.in_main and tag not in _VOID:
+            self.depth += 1
+
+    def handle_endtag(self, tag):
+        if tag == "main":
+            self.in_main = False
+            self.sections = FOLD_SECTIONS
+        elif self.in_main and tag not in _VOID:
+            self.depth -= 1
+            if self.depth == 0:
+                self.sections += 1
+
+
+_VOID = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+
+
+def page_tokens(html: str):
+    """(tokens used anywhere on the page, tokens used above the fold)"""
+    parser = _TokenCollector()
+    parser.feed(html)
+    parser.close()
+    return parser.page, parser.fold | RUNTIME_TOKENS
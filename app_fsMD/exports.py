@@ -0,0 +1,80 @@
+"""
+Streaming CSV / JSON Lines exports for the admin.
+
+Rows come from `.values_list(...).iterator(chunk_size=EXPORT_CHUNK)` (a server-side
+cursor on Postgres, chunked fetches on SQLite) and are encoded one at a time into a
+StreamingHttpResponse, so memory stays flat however many rows there are.
+"""
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+EXPORT_CHUNK = 2000
+# Lines are joined into blocks of about this size before they reach the server, rather
+# than one socket write per row.
+WRITE_BYTES = 64 * 1024
+FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "jsonl": "application/x-ndjson; charset=utf-8",
+}
+
+# Spreadsheet apps run cells starting with these as formulas.
+_FORMULA_START = ("=", "+", "-", "@", "\t", "\r")
+
+
+class _Echo:
+    """File-like object for csv.writer that hands each encoded line back."""
+
+    def write(self, value):
+        return value
+
+
+def _cell(value):
+    if value is None:
+        return ""
+    if isinstance(value, str) and value.startswith(_FORMULA_START):
+        return "'" + value
+    return value
+
+
+def iter_rows(queryset, fields):
+    # Primary-key order walks the table's own index; no sort over the whole result.
+    return queryset.order_by("pk").values_list(*fields).iterator(chunk_size=EXPORT_CHUNK)
+
+
+def iter_csv(queryset, fields, header=None):
+    writer = csv.writer(_Echo())
+    yield "\ufeff" + writer.writerow(header or fields)  # BOM: Excel reads the file as UTF-8
+    for row in iter_rows(queryset, fields):
+        yield writer.writerow([_cell(value) for value in row])
+
+
+def iter_jsonl(queryset, fields, header=None):
+    keys = header or fields
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    for row in iter_rows(queryset, fields):
+        yield encoder.encode(dict(zip(keys, row))) + "\n"
+
+
+def _blocks(lines):
+    block, size = [], 0
+    for line in lines:
+        block.append(line)
+        size += len(line)
+        if size >= WRITE_BYTES:
+            yield "".join(block)
+            block, size = [], 0
+    if block:
+        yield "".join(block)
+
+
+def export_response(queryset, fields, fmt: str, basename: str, header=None) -> StreamingHttpResponse:
+    rows = iter_csv(queryset, fields, header) if fmt == "csv" else iter_jsonl(queryset, fields, header)
+    response = StreamingHttpResponse(_blocks(rows), content_type=FORMATS[fmt])
+    stamp = timezone.now().strftime("%Y%m%d-%H%M")
+    response["Content-Disposition"] = f'attachment; filename="{basename}-{stamp}.{fmt}"'
+    response["Cache-Control"] = "no-store"
+    return response
@@ -0,0 +1,227 @@
+"""
+Faceted product listing over the CatalogSnapshot, for the /api/products/ JSON API.
+
+Each product gets one bit position, assigned in order of final price, and every facet
+value (category, kind, prescription, consultation, in stock) is a Python int used as a
+bitmap over those positions. Filtering is a few big-int ANDs, a price range is a
+contiguous run of bits found by bisect, and facet counts are `bit_count()`s. The index
+is rebuilt at most once per `site_cache_v` in each process; no query runs per request.
+"""
+import bisect
+from array import array
+from decimal import Decimal, InvalidOperation
+
+from .catalog import get_catalog
+
+DEFAULT_PER_PAGE = 24
+MAX_PER_PAGE = 60
+
+SORTS = ("name", "-name", "price", "-price", "newest")
+FLAGS = ("requires_prescription", "requires_consultation", "in_stock")
+_TRUE = {"1", "true", "yes", "on"}
+_FALSE = {"0", "false", "no", "off"}
+
+
+def _run(lo: int, hi: int) -> int:
+    """Bits lo..hi-1 set."""
+    return ((1 << hi) - 1) ^ ((1 << lo) - 1)
+
+
+class FacetIndex:
+    """
+    Bitmaps over the active products of one catalog version. Position i is the i-th
+    cheapest product (ties by name), so sorting by price is walking the bits in order.
+    """
+
+    __slots__ = ("version", "products", "prices", "all", "category", "kind", "flags", "orders", "_categories")
+
+    def __init__(self, catalog):
+        self.version = catalog.version
+        self.products = tuple(sorted(catalog.products, key=lambda p: (p.final_price, p.name)))
+        self.prices = [p.final_price for p in self.products]
+        self.all = _run(0, len(self.products))
+
+        self.category = {c.slug: 0 for c in catalog.categories}
+        self.kind = {}
+        self.flags = dict.fromkeys(FLAGS, 0)
+        for i, p in enumerate(self.products):
+            bit = 1 << i
+            self.category[p.category.slug] |= bit
+            self.kind[p.category.kind] = self.kind.get(p.category.kind, 0) | bit
+            if p.requires_prescription:
+                self.flags["requires_prescription"] |= bit
+            if p.requires_consultation:
+                self.flags["requires_consultation"] |= bit
+            if p.quantity > 0:
+                self.flags["in_stock"] |= bit
+
+        positions = range(len(self.products))
+        by_name = sorted(positions, key=lambda i: self.products[i].name.lower())
+        by_newest = sorted(positions, key=lambda i: self.products[i].created_at, reverse=True)
+        self.orders = {
+            "name": array("I", by_name),
+            "-name": array("I", reversed(by_name)),
+            "price": array("I", positions),
+            "-price": array("I", reversed(positions)),
+            "newest": array("I", by_newest),
+        }
+        self._categories = catalog.categories
+
+    def price_mask(self, low=None, high=None) -> int:
+        lo = 0 if low is None else bisect.bisect_left(self.prices, low)
+        hi = len(self.prices) if high is None else bisect.bisect_right(self.prices, high)
+        return _run(lo, hi) if lo < hi else 0
+
+    def _masks(self, filters: dict) -> dict:
+        """One mask per active filter, keyed by facet, so counts can leave their own out."""
+        masks = {}
+        if filters["category"]:
+            masks["category"] = self._any(self.category, filters["category"])
+        if filters["kind"]:
+            masks["kind"] = self._any(self.kind, filters["kind"])
+        for flag in FLAGS:
+            wanted = filters[flag]
+            if wanted is not None:
+                masks[flag] = self.flags[flag] if wanted else self.all & ~self.flags[flag]
+        if filters["price_min"] is not None or filters["price_max"] is not None:
+            masks["price"] = self.price_mask(filters["price_min"], filters["price_max"])
+        return masks
+
+    @staticmethod
+    def _any(bitmaps: dict, values) -> int:
+        mask = 0
+        for value in values:
+            mask |= bitmaps.get(value, 0)
+        return mask
+
+    def _combine(self, masks: dict, skip=None) -> int:
+        mask = self.all
+        for facet, m in masks.items():
+            if facet != skip:
+                mask &= m
+        return mask
+
+    def _counts(self, masks: dict) -> dict:
+        """Disjunctive counts: each facet is counted under every filter except its own."""
+        base = self._combine(masks, "category")
+        categories = [
+            {"slug": c.slug, "name": c.name, "count": (base & self.category.get(c.slug, 0)).bit_count()}
+            for c in self._categories
+        ]
+        base = self._combine(masks, "kind")
+        kinds = {kind: (base & m).bit_count() for kind, m in self.kind.items()}
+        flags = {}
+        for flag in FLAGS:
+            base = self._combine(masks, flag)
+            yes = (base & self.flags[flag]).bit_count()
+            flags[flag] = {"true": yes, "false": base.bit_count() - yes}
+
+        base = self._combine(masks, "price")
+        price = None
+        if base:
+            price = {
+                "min": str(self.prices[(base & -base).bit_length() - 1]),
+                "max": str(self.prices[base.bit_length() - 1]),
+            }
+        return {"category": categories, "kind": kinds, **flags, "price": price}
+
+    def _page(self, mask: int, sort: str, offset: int, limit: int) -> list:
+        if mask == self.all:
+            order = self.orders[sort]
+            return [self.products[i] for i in order[offset:offset + limit]]
+        bits = mask.to_bytes((len(self.products) + 7) // 8, "little")
+        found = []
+        skip = offset
+        for i in self.orders[sort]:
+            if bits[i >> 3] >> (i & 7) & 1:
+                if skip:
+                    skip -= 1
+                    continue
+                found.append(self.products[i])
+                if len(found) == limit:
+                    break
+        return found
+
+    def listing(self, filters: dict) -> dict:
+        masks = self._masks(filters)
+        mask = self._combine(masks)
+        count = mask.bit_count()
+        per_page = filters["per_page"]
+        pages = max(1, -(-count // per_page))
+        page = min(filters["page"], pages)
+        products = self._page(mask, filters["sort"], (page - 1) * per_page, per_page) if count else []
+        return {
+            "count": count,
+            "page": page,
+            "pages": pages,
+            "per_page": per_page,
+            "sort": filters["sort"],
+            "results": [_product_json(p) for p in products],
+            "facets": self._counts(masks),
+        }
+
+
+def _product_json(p) -> dict:
+    return {
+        "id": p.id,
+        "name": p.name,
+        "url": p.url,
+        "category": p.category.slug,
+        "image": p.main_image_url,
+        "price": str(p.price),
+        "final_price": str(p.final_price),
+        "requires_prescription": p.requires_prescription,
+        "requires_consultation": p.requires_consultation,
+        "in_stock": p.quantity > 0,
+    }
+
+
+def _flag(value):
+    value = (value or "").strip().lower()
+    if value in _TRUE:
+        return True
+    if value in _FALSE:
+        return False
+    return None
+
+
+def _decimal(value):
+    try:
+        number = Decimal(value)
+    except (InvalidOperation, TypeError, ValueError):
+        return None
+    return number if number.is_finite() else None
+
+
+def _int(value, default: int) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def parse_filters(params) -> dict:
+    """Filters from a QueryDict; unknown or malformed values are ignored rather than rejected."""
+    sort = params.get("sort", "name")
+    return {
+        "category": [v for v in params.getlist("category") if v][:50],
+        "kind": [v for v in params.getlist("kind") if v][:5],
+        **{flag: _flag(params.get(flag)) for flag in FLAGS},
+        "price_min": _decimal(params.get("price_min")),
+        "price_max": _decimal(params.get("price_max")),
+        "sort": sort if sort in SORTS else "name",
+        "page": max(1, _int(params.get("page"), 1)),
+        "per_page": min(MAX_PER_PAGE, max(1, _int(params.get("per_page"), DEFAULT_PER_PAGE))),
+    }
+
+
+_index = None
+
+
+def get_facet_index() -> FacetIndex:
+    global _index
+    catalog = get_catalog()
+    index = _index
+    if index is None or index.version != catalog.version:
+        index = _index = FacetIndex(catalog)
+    return index
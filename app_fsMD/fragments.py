@@ -0,0 +1,99 @@
+"""
+Per-fragment caching for heavy template includes.
+
+Every cacheable include declares the content it depends on. A fragment's key is its
+template name plus the current version of each dependency, so a catalog change only
+re-renders the catalog fragments. Rendered HTML lives in the per-process `fragments`
+cache: it is small, and restarting workers on deploy drops fragments built from old
+templates or static URLs.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.exceptions import ImproperlyConfigured
+
+
+TTL_FRAGMENT = 60 * 60
+
+# dependency name -> version key in the shared cache (bumped by signals.py)
+CONTENT_VERSIONS = {
+    "catalog": "site_cache_v",
+    "feedback": "feedback_cache_v",
+    "blog": "blog_cache_v",
+}
+
+# template -> dependencies. Templates with per-request output ({% csrf_token %}, cart
+# state, request.*) must not be listed here: h_appointment renders a CSRF token.
+FRAGMENTS = {
+    "home/h_hero.html": (),
+    "home/h_intro.html": (),
+    "components/mrq1.html": ("catalog",),
+    "home/h_prgms_srvcs.html": ("catalog",),
+    "home/h_sldr.html": (),
+    "home/h_prdcts.html": ("catalog",),
+    "home/h_faq.html": (),
+    "components/mrq2.html": (),
+    "home/h_why_chs.html": (),
+    "home/h_fdbck.html": ("feedback", "catalog"),
+    "home/h_blg.html": ("blog",),
+}
+
+
+def _content_versions(request) -> dict:
+    versions = getattr(request, "_content_versions", None)
+    if versions is None:
+        found = cache.get_many(CONTENT_VERSIONS.values())
+        versions = {name: found.get(key, 1) for name, key in CONTENT_VERSIONS.items()}
+        if request is not None:
+            request._content_versions = versions
+    return versions
+
+
+def fragment_key(template_name: str, request=None) -> str:
+    try:
+        deps = FRAGMENTS[template_name]
+    except KeyError:
+        raise ImproperlyConfigured(f"{template_name!r} is not declared in fragments.FRAGMENTS.")
+    versions = _content_versions(request)
+    return "frag:" + template_name + "".join(f":{d}{versions[d]}" for d in deps)
+
+
+def render_fragment(template_name: str, context) -> str:
+    started = time.perf_counter()
+    request = context.get("request")
+    key = fragment_key(template_name, request)
+
+    store = caches["fragments"]
+    html = store.get(key)
+    hit = html is not None
+    if not hit:
+        html = context.template.engine.get_template(template_name).render(context)
+        store.set(key, html, TTL_FRAGMENT)
+
+    if request is not None:
+        stats = request.__dict__.setdefault("fragment_stats", [])
+        stats.append((template_name, hit, time.perf_counter() - started))
+    return html
+
+
+class FragmentTimingMiddleware:
+    """
+    Reports each fragment as `Server-Timing: frag-<name>;desc="hit|miss";dur=<ms>` when
+    settings.FRAGMENT_TIMING is on (defaults to DEBUG), visible in the browser devtools.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        stats = getattr(request, "fragment_stats", None)
+        if stats and getattr(settings, "FRAGMENT_TIMING", settings.DEBUG):
+            entries = [
+                f'frag-{name.rsplit("/", 1)[-1].split(".")[0]};desc="{"hit" if hit else "miss"}";dur={secs * 1000:.3f}'
+                for name, hit, secs in stats
+            ]
+            entries.append(f"fragments;dur={sum(s[2] for s in stats) * 1000:.3f}")
+            response.headers["Server-Timing"] = ", ".join(entries)
+        return response
@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from app_fsMD.cart_events import aggregate, prune_events
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream the cart events logged since the last run into ProductPair co-occurrence "
+        "counts (frequently bought together), then prune old counted events."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--prune-days",
+            type=int,
+            default=90,
+            help="Delete counted events older than this many days (0 keeps them all).",
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        stats = aggregate(options["batch_size"])
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"{stats['events']:,} events counted into {stats['pairs']:,} pair updates in {elapsed:.2f} s."
+        ))
+        if options["prune_days"]:
+            deleted = prune_events(options["prune_days"])
+            self.stdout.write(f"Pruned {deleted:,} events older than {options['prune_days']} days.")
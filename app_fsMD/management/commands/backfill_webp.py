@@ -1,21 +1,36 @@
+from django.core.exceptions import ValidationError
 from django.core.management.base import BaseCommand
 from django.db import transaction
 
 from app_fsMD.models import Category, Product, ProductImage, BlogPost, Feedback
-from app_fsMD.utils.images import convert_imagefield_to_webp
+from app_fsMD.utils.images import convert_imagefield_to_webp, rehash_imagefield
 
 
 class Command(BaseCommand):
     help = "Convert existing uploaded images to .webp and update ImageField paths."
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rehash",
+            action="store_true",
+            help="Also move already-converted files to content-addressed cas/ names (shared, cacheable forever).",
+        )
+
     def handle(self, *args, **options):
         updated = 0
+        rehash = options["rehash"]
 
         def save_instance(obj, field_name, quality, max_px):
             nonlocal updated
             before = getattr(obj, field_name).name if getattr(obj, field_name) else ""
             obj._skip_webp = True
-            convert_imagefield_to_webp(obj, field_name, quality=quality, max_px=max_px)
+            try:
+                convert_imagefield_to_webp(obj, field_name, quality=quality, max_px=max_px)
+            except ValidationError as exc:
+                self.stderr.write(f"{obj._meta.label} {obj.pk}: skipped, {exc.messages[0]}")
+                return
+            if rehash:
+                rehash_imagefield(obj, field_name)
             after = getattr(obj, field_name).name if getattr(obj, field_name) else ""
             if before and after and before != after:
                 obj.save(update_fields=[field_name])
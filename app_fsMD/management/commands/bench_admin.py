@@ -0,0 +1,217 @@
+import random
+import statistics
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from importlib import import_module
+
+from django.conf import settings
+from django.contrib import admin
+from django.contrib.admin import ModelAdmin
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.core.paginator import Paginator
+from django.db import connection, transaction
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from app_fsMD.models import BlogPost, Category, Feedback, NewsletterSubscription, Product, SearchDocument
+
+WORDS = [c + v + e for c in "bdfgklmnprstvz" for v in "aeiou" for e in ("", "n", "x", "ra", "lin")]
+
+# The admin configuration before changelists were tuned, applied over the current one.
+BASELINE = {
+    Product: {"list_select_related": False, "paginator": Paginator, "show_full_result_count": True},
+    Feedback: {"paginator": Paginator, "show_full_result_count": True},
+    BlogPost: {
+        "paginator": Paginator,
+        "show_full_result_count": True,
+        "search_fields": ("title", "slug", "excerpt", "body"),
+    },
+    NewsletterSubscription: {"paginator": Paginator, "show_full_result_count": True},
+}
+BASELINE_INDEXES = [
+    (Feedback, "feedback_rating_idx"),
+    (BlogPost, "blogpost_order_idx"),
+    (BlogPost, "blogpost_published_idx"),
+    (NewsletterSubscription, "newsletter_created_idx"),
+]
+
+
+def _text(rng, n):
+    return " ".join(rng.choices(WORDS, k=n))
+
+
+def _seed(rows, rng):
+    categories = Category.objects.bulk_create(
+        [Category(name=f"Bench category {i}", slug=f"bench-category-{i}") for i in range(40)]
+    )
+    products = Product.objects.bulk_create(
+        [
+            Product(
+                category=categories[i % len(categories)],
+                name=f"Bench {_text(rng, 2)} {i}",
+                slug=f"bench-product-{i}",
+                price=Decimal(rng.randint(500, 90_000)) / 100,
+                quantity=rng.randint(0, 50),
+            )
+            for i in range(rows)
+        ],
+        batch_size=2000,
+    )
+    Feedback.objects.bulk_create(
+        [
+            Feedback(
+                first_name=rng.choice(WORDS).title(),
+                last_name=rng.choice(WORDS).title(),
+                email=f"bench{i}@example.com",
+                product=products[i % len(products)],
+                testimonial=_text(rng, 30),
+                image="feedback_images/bench.webp",
+                star_rating=rng.choice([1, 2, 3, 4, 4, 5, 5, 5]),
+            )
+            for i in range(rows)
+        ],
+        batch_size=2000,
+    )
+    posts = BlogPost.objects.bulk_create(
+        [
+            BlogPost(
+                title=f"Bench post {_text(rng, 4)} {i}",
+                slug=f"bench-post-{i}",
+                badge_label="Bench",
+                excerpt=_text(rng, 25),
+                body=_text(rng, 150),
+                main_image="blog/bench.webp",
+                published_at=date(2020, 1, 1) + timedelta(days=i % 2000),
+                sort_order=i % 10,
+            )
+            for i in range(rows)
+        ],
+        batch_size=2000,
+    )
+    SearchDocument.objects.bulk_create(
+        [
+            SearchDocument(
+                kind=SearchDocument.Kind.POST,
+                object_id=post.pk,
+                title=post.title,
+                subtitle=post.excerpt[:255],
+                url=f"/bench/{post.pk}/",
+                body=f"{post.excerpt} {post.body}",
+            )
+            for post in posts
+        ],
+        batch_size=2000,
+    )
+    NewsletterSubscription.objects.bulk_create(
+        [NewsletterSubscription(email=f"bench{i}@example.com") for i in range(rows)], batch_size=5000
+    )
+    return categories[0], posts[rows // 2]
+
+
+def _indexes(action):
+    # Statements only: SQLite's schema editor refuses to open inside the seeding transaction.
+    editor = connection.schema_editor()
+    editor.deferred_sql = []
+    with connection.cursor() as cursor:
+        for model, name in BASELINE_INDEXES:
+            index = next(i for i in model._meta.indexes if i.name == name)
+            cursor.execute(str(getattr(index, action)(model, editor)))
+
+
+class _Baseline:
+    """Swap the registered ModelAdmins (and the indexes added with them) back to the old setup."""
+
+    def __enter__(self):
+        self.saved = []
+        for model, attrs in BASELINE.items():
+            model_admin = admin.site._registry[model]
+            for name, value in attrs.items():
+                self.saved.append((model_admin, name, model_admin.__dict__.get(name)))
+                setattr(model_admin, name, value)
+        blog_admin = admin.site._registry[BlogPost]
+        self.saved.append((blog_admin, "get_search_results", None))
+        blog_admin.get_search_results = ModelAdmin.get_search_results.__get__(blog_admin)
+        _indexes("remove_sql")
+        return self
+
+    def __exit__(self, *exc):
+        for model_admin, name, value in reversed(self.saved):
+            if value is None:
+                model_admin.__dict__.pop(name, None)
+            else:
+                setattr(model_admin, name, value)
+        _indexes("create_sql")
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed N products, feedbacks, blog posts and newsletter sign-ups inside a rolled-back "
+        "transaction and time each admin changelist (median ms, queries), before and after "
+        "the changelist tuning."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=100_000)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        rng = random.Random(42)
+        factory = RequestFactory()
+        user = User(username="bench", is_staff=True, is_superuser=True, is_active=True)
+
+        with transaction.atomic():
+            started = time.perf_counter()
+            category, post = _seed(options["rows"], rng)
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE")
+            self.stdout.write(f"{options['rows']:,} rows per model seeded in {time.perf_counter() - started:.1f} s\n")
+
+            body_word = post.body.split()[7]
+            deep_page = max(1, options["rows"] // 200)  # half way through at 100 rows a page
+            cases = [
+                ("products", Product, {}),
+                ("products by category", Product, {"category__id__exact": category.pk}),
+                ("products search", Product, {"q": "bench 4242"}),
+                ("feedback", Feedback, {}),
+                ("feedback 5 stars", Feedback, {"star_rating": 5}),
+                ("feedback deep page", Feedback, {"p": deep_page}),
+                ("blog posts", BlogPost, {}),
+                ("blog search (body)", BlogPost, {"q": f"{body_word} {post.excerpt.split()[3]}"}),
+                ("newsletter", NewsletterSubscription, {}),
+                ("newsletter deep page", NewsletterSubscription, {"p": deep_page}),
+            ]
+
+            def measure(model, params):
+                model_admin = admin.site._registry[model]
+                opts = model._meta
+                samples = []
+                # The first run also loads templates and the site-wide caches the context
+                # processors read; it isn't counted.
+                for _ in range(options["repeat"] + 1):
+                    request = factory.get(f"/admin/{opts.app_label}/{opts.model_name}/", params)
+                    request.user = user
+                    request.session = import_module(settings.SESSION_ENGINE).SessionStore()
+                    with CaptureQueriesContext(connection) as queries:
+                        t = time.perf_counter()
+                        response = model_admin.changelist_view(request)
+                        if response.status_code != 200:
+                            raise CommandError(f"{request.get_full_path()} answered {response.status_code}")
+                        response.render()
+                        samples.append(time.perf_counter() - t)
+                return statistics.median(samples[1:]) * 1000, len(queries)
+
+            results = {}
+            with _Baseline():
+                for label, model, params in cases:
+                    results[label] = measure(model, params)
+
+            self.stdout.write(f"{'changelist':<22} {'before ms':>10} {'queries':>8} {'after ms':>10} {'queries':>8}")
+            for label, model, params in cases:
+                after = measure(model, params)
+                before = results[label]
+                self.stdout.write(
+                    f"{label:<22} {before[0]:>10.1f} {before[1]:>8} {after[0]:>10.1f} {after[1]:>8}"
+                )
+            transaction.set_rollback(True)
@@ -0,0 +1,66 @@
+import pickle
+import time
+import tracemalloc
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from app_fsMD.catalog import CatalogSnapshot
+from app_fsMD.models import Category, Product
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed N products inside a rolled-back transaction and report CatalogSnapshot build "
+        "time, per-worker memory and pickled size."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--products", type=int, default=10_000)
+
+    def handle(self, *args, **options):
+        n = options["products"]
+
+        with transaction.atomic():
+            category = Category(name="Bench Category", slug="bench-category")
+            category._skip_webp = True
+            category.save()
+            Product.objects.bulk_create(
+                [
+                    Product(
+                        category=category,
+                        name=f"Bench Product {i:06d}",
+                        slug=f"bench-product-{i:06d}",
+                        short_details="Clinician-guided bench product " * 4,
+                        price=Decimal("99.00") + i % 50,
+                        discount_type=Product.DiscountType.PERCENT if i % 3 == 0 else Product.DiscountType.NONE,
+                        discount_value=Decimal("10.00"),
+                        quantity=i % 20,
+                    )
+                    for i in range(n)
+                ],
+                batch_size=2000,
+            )
+
+            started = time.perf_counter()
+            CatalogSnapshot.build()
+            elapsed = time.perf_counter() - started
+
+            # Second build under tracemalloc, which slows it down too much to time it.
+            tracemalloc.start()
+            snapshot = CatalogSnapshot.build()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            blob = pickle.dumps(snapshot, pickle.HIGHEST_PROTOCOL)
+            started = time.perf_counter()
+            pickle.loads(blob)
+            load = time.perf_counter() - started
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(f"products          {len(snapshot.products)}")
+        self.stdout.write(f"build             {elapsed * 1000:.0f} ms")
+        self.stdout.write(f"retained memory   {current / 1024 / 1024:.1f} MiB (peak {peak / 1024 / 1024:.1f} MiB)")
+        self.stdout.write(f"pickled size      {len(blob) / 1024 / 1024:.1f} MiB, unpickle {load * 1000:.0f} ms")
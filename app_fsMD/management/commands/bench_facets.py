@@ -0,0 +1,114 @@
+import random
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+
+from django.core.management.base import BaseCommand
+from django.http import QueryDict
+
+from app_fsMD.facets import FLAGS, FacetIndex, parse_filters
+
+
+def _catalog(n_products, n_categories, rng):
+    categories = [
+        SimpleNamespace(id=i, slug=f"cat-{i}", name=f"Category {i}", kind=rng.choice(["program", "service"]))
+        for i in range(n_categories)
+    ]
+    start = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    products = []
+    for i in range(n_products):
+        price = Decimal(rng.randint(500, 90_000)) / 100
+        products.append(SimpleNamespace(
+            id=i,
+            name=f"Product {rng.random():.12f}",
+            slug=f"product-{i}",
+            url=f"/product-details/product-{i}/",
+            category=rng.choice(categories),
+            main_image_url="",
+            price=price,
+            final_price=price,
+            quantity=rng.choice([0, 0, 5, 20, 100]),
+            requires_prescription=rng.random() < 0.4,
+            requires_consultation=rng.random() < 0.3,
+            created_at=start + timedelta(minutes=i),
+        ))
+    return SimpleNamespace(version=1, categories=categories, products=products)
+
+
+def _query(rng, catalog):
+    params = QueryDict(mutable=True)
+    for slug in rng.sample([c.slug for c in catalog.categories], rng.choice([0, 1, 1, 2])):
+        params.appendlist("category", slug)
+    for flag in FLAGS:
+        if rng.random() < 0.3:
+            params[flag] = rng.choice(["1", "0"])
+    if rng.random() < 0.4:
+        low = rng.randint(5, 400)
+        params["price_min"], params["price_max"] = str(low), str(low + rng.randint(20, 300))
+    params["sort"] = rng.choice(["name", "price", "-price", "newest"])
+    params["page"] = str(rng.choice([1, 1, 1, 2, 5, 40]))
+    return params
+
+
+def _naive(catalog, filters):
+    """The same listing done by filtering and sorting the product list per request."""
+    wanted = set(filters["category"])
+    rows = [
+        p for p in catalog.products
+        if (not wanted or p.category.slug in wanted)
+        and (filters["requires_prescription"] is None or p.requires_prescription == filters["requires_prescription"])
+        and (filters["requires_consultation"] is None or p.requires_consultation == filters["requires_consultation"])
+        and (filters["in_stock"] is None or (p.quantity > 0) == filters["in_stock"])
+        and (filters["price_min"] is None or p.final_price >= filters["price_min"])
+        and (filters["price_max"] is None or p.final_price <= filters["price_max"])
+    ]
+    key = {"name": lambda p: p.name.lower(), "price": lambda p: p.final_price, "-price": lambda p: p.final_price,
+           "newest": lambda p: p.created_at}[filters["sort"]]
+    rows.sort(key=key, reverse=filters["sort"] in ("-price", "newest"))
+    counts = {}
+    for p in rows:
+        counts[p.category.slug] = counts.get(p.category.slug, 0) + 1
+    offset = (filters["page"] - 1) * filters["per_page"]
+    return rows[offset:offset + filters["per_page"]], counts
+
+
+def _pct(samples, p):
+    return samples[min(len(samples) - 1, int(len(samples) * p))] * 1000
+
+
+class Command(BaseCommand):
+    help = (
+        "Build the facet bitmaps over a synthetic in-memory catalog and compare listing "
+        "latency (p50/p99) with filtering and sorting the product list per request."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--products", type=int, default=20_000)
+        parser.add_argument("--categories", type=int, default=40)
+        parser.add_argument("--queries", type=int, default=300)
+
+    def handle(self, *args, **options):
+        rng = random.Random(42)
+        catalog = _catalog(options["products"], options["categories"], rng)
+
+        started = time.perf_counter()
+        index = FacetIndex(catalog)
+        self.stdout.write(f"{len(catalog.products):,} products: index built in {time.perf_counter() - started:.2f} s")
+
+        queries = [parse_filters(_query(rng, catalog)) for _ in range(options["queries"])]
+        for label, run in (
+            ("per-request filter+sort", lambda f: _naive(catalog, f)),
+            ("facet bitmaps", index.listing),
+        ):
+            samples = []
+            for filters in queries:
+                t = time.perf_counter()
+                run(filters)
+                samples.append(time.perf_counter() - t)
+            samples.sort()
+            self.stdout.write(
+                f"  {label:<24} p50 {_pct(samples, 0.5):6.2f} ms  p99 {_pct(samples, 0.99):6.2f} ms  "
+                f"mean {statistics.fmean(samples) * 1000:6.2f} ms"
+            )
@@ -0,0 +1,87 @@
+import multiprocessing
+import os
+import resource
+import tempfile
+import time
+from io import BytesIO
+
+from django.core.files.base import ContentFile, File
+from django.core.files.storage import FileSystemStorage
+from django.core.management.base import BaseCommand
+from PIL import Image, ImageOps
+
+from app_fsMD.utils.images import save_webp
+
+SIZES = {"24MP": (6000, 4000), "48MP": (8000, 6000)}
+
+
+def _legacy(path, storage, quality, max_px):
+    """The pipeline before streaming decode: full-size decode, rotate, then two output copies."""
+    with open(path, "rb") as fh, Image.open(fh) as im:
+        im = ImageOps.exif_transpose(im)
+        im.thumbnail((max_px, max_px), Image.Resampling.LANCZOS)
+        im = im.convert("RGB")
+        out = BytesIO()
+        im.save(out, format="WEBP", quality=quality, method=6)
+        out.seek(0)
+        storage.save("legacy.webp", ContentFile(out.read()))
+
+
+def _streaming(path, storage, quality, max_px):
+    with open(path, "rb") as fh:
+        save_webp(File(fh), storage, "streaming.webp", size=os.path.getsize(path), quality=quality, max_px=max_px)
+
+
+def _measure(fn, path, out_dir, quality, max_px, results):
+    storage = FileSystemStorage(location=out_dir)
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.perf_counter()
+    fn(path, storage, quality, max_px)
+    elapsed = time.perf_counter() - started
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    results.put(((peak - before) * 1024, elapsed))
+
+
+def make_photo(path, size):
+    """A camera-like JPEG: noise over a gradient (flat colour would be unrealistically cheap)."""
+    noise = Image.effect_noise(size, 48).convert("RGB")
+    gradient = Image.linear_gradient("L").resize(size).convert("RGB")
+    Image.blend(noise, gradient, 0.6).save(path, "JPEG", quality=92)
+
+
+class Command(BaseCommand):
+    help = (
+        "Peak RSS of converting large JPEG uploads to WebP: the old full-resolution pipeline vs "
+        "draft() decoding with spooled output. Each run is a fresh forked process."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--quality", type=int, default=82)
+        parser.add_argument("--max-px", type=int, default=2400)
+        parser.add_argument("--repeat", type=int, default=3)
+
+    def handle(self, *args, **options):
+        ctx = multiprocessing.get_context("fork")
+        self.stdout.write("Input            file   variant     peak RSS +      time")
+        with tempfile.TemporaryDirectory() as tmp:
+            for label, size in SIZES.items():
+                path = os.path.join(tmp, f"{label}.jpg")
+                make_photo(path, size)
+                file_mb = os.path.getsize(path) / 1024 / 1024
+                for variant, fn in (("legacy", _legacy), ("streaming", _streaming)):
+                    runs = []
+                    for _ in range(options["repeat"]):
+                        results = ctx.Queue()
+                        proc = ctx.Process(
+                            target=_measure,
+                            args=(fn, path, os.path.join(tmp, "out"), options["quality"], options["max_px"], results),
+                        )
+                        proc.start()
+                        runs.append(results.get())
+                        proc.join()
+                    rss = min(r[0] for r in runs)
+                    elapsed = min(r[1] for r in runs)
+                    self.stdout.write(
+                        f"{label} {size[0]}x{size[1]} {file_mb:>5.1f} MB  {variant:<10} "
+                        f"{rss / 1024 / 1024:>8.0f} MB {elapsed * 1000:>7.0f} ms"
+                    )
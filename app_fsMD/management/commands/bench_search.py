@@ -0,0 +1,99 @@
+import itertools
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from app_fsMD.models import SearchDocument
+from app_fsMD.search import search
+from app_fsMD.signals import bump_cache_version
+
+# ~30k pronounceable words from 2-4 syllables, drawn with a Zipf-like skew: roughly the
+# shape of real catalog text, where a 4-letter prefix narrows to a handful of words.
+SYLLABLES = [c + v for c in "bcdfghklmnprstvz" for v in "aeiou"] + ["ine", "ide", "ex", "ol", "um"]
+
+
+def _vocabulary(size=30_000):
+    rng = random.Random(7)
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choices(SYLLABLES, k=rng.randint(2, 4))))
+    words = sorted(words)
+    rng.shuffle(words)
+    return words
+
+
+VOCABULARY = _vocabulary()
+CUM_WEIGHTS = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(VOCABULARY))))
+
+
+def _words(rng, n):
+    return rng.choices(VOCABULARY, cum_weights=CUM_WEIGHTS, k=n)
+
+
+def _typo(word, rng):
+    i = rng.randrange(1, len(word) - 1)
+    return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+
+
+def _pct(samples, p):
+    return samples[min(len(samples) - 1, int(len(samples) * p))] * 1000
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed N search documents inside a rolled-back transaction and report search latency "
+        "(p50/p95/p99) for prefix, multi-word and misspelled queries."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--docs", type=int, default=50_000)
+        parser.add_argument("--queries", type=int, default=500)
+
+    def handle(self, *args, **options):
+        rng = random.Random(42)
+        with transaction.atomic():
+            SearchDocument.objects.bulk_create(
+                [
+                    SearchDocument(
+                        kind=SearchDocument.Kind.PRODUCT if i % 5 else SearchDocument.Kind.POST,
+                        object_id=10_000_000 + i,
+                        title=" ".join(_words(rng, 3)).title(),
+                        subtitle=" ".join(_words(rng, 2)).title(),
+                        url=f"/bench/{i}/",
+                        body=" ".join(_words(rng, 80)),
+                    )
+                    for i in range(options["docs"])
+                ],
+                batch_size=2000,
+            )
+            bump_cache_version("search_v")
+            search("warmup")
+
+            titles = list(
+                SearchDocument.objects.filter(url__startswith="/bench/").values_list("title", flat=True)[:2000]
+            )
+            shapes = {
+                "prefix": lambda: rng.choice(titles).split()[0][:4],
+                "two words": lambda: " ".join(rng.choice(titles).split()[:2]),
+                "typo": lambda: _typo(rng.choice(titles).split()[1].lower(), rng),
+            }
+            self.stdout.write(f"{options['docs']} documents\n")
+            self.stdout.write("query        p50 ms   p95 ms   p99 ms   hit rate")
+            for label, make in shapes.items():
+                samples, hits = [], 0
+                for _ in range(options["queries"]):
+                    q = make()
+                    started = time.perf_counter()
+                    result = search(q)
+                    samples.append(time.perf_counter() - started)
+                    hits += bool(result["results"])
+                samples.sort()
+                self.stdout.write(
+                    f"{label:<11} {statistics.median(samples) * 1000:>7.2f} {_pct(samples, .95):>8.2f} "
+                    f"{_pct(samples, .99):>8.2f} {hits / options['queries']:>9.0%}"
+                )
+            transaction.set_rollback(True)
+        bump_cache_version("search_v")
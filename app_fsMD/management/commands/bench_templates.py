@@ -0,0 +1,47 @@
+import time
+
+from django.core.cache import caches
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.template import engines
+from django.test import Client
+
+PAGES = ["/", "/programs-and-services/", "/about-us/", "/privacy-policy/", "/cart/"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Time the first request to key pages with a cold template cache versus after "
+        "precompile_templates has warmed it."
+    )
+
+    def handle(self, *args, **options):
+        engine = engines["django"].engine
+        client = Client(HTTP_HOST="localhost")
+
+        def first_request(url):
+            caches["fragments"].clear()
+            started = time.perf_counter()
+            client.get(url)
+            return (time.perf_counter() - started) * 1000
+
+        client.get("/")  # settle the catalog snapshot, sessions and URL resolver
+
+        self.stdout.write(f"{'page':<28}{'cold':>10}{'precompiled':>14}")
+        for url in PAGES:
+            for loader in engine.template_loaders:
+                loader.reset()
+            cold = first_request(url)
+
+            for loader in engine.template_loaders:
+                loader.reset()
+            call_command("precompile_templates", verbosity=0)
+            warm = first_request(url)
+
+            self.stdout.write(f"{url:<28}{cold:>8.1f}ms{warm:>12.1f}ms")
+
+        for loader in engine.template_loaders:
+            loader.reset()
+        started = time.perf_counter()
+        call_command("precompile_templates", verbosity=0)
+        self.stdout.write(f"precompile_templates: {(time.perf_counter() - started) * 1000:.0f} ms at startup")
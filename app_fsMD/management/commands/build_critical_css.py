@@ -0,0 +1,118 @@
+import gzip
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from app_fsMD.assets import CSS_BUNDLES, PAGE_CSS, critical_path, minify_css
+from app_fsMD.catalog import get_catalog
+from app_fsMD.critical import css_uses, extract_critical, page_tokens
+
+LEGAL_PAGES = (
+    "terms_conditions",
+    "privacy_policy",
+    "refund_policy",
+    "telehealth_consent",
+    "hipaa_notice",
+    "medical_disclaimer",
+    "accessibility_statement",
+)
+
+
+def sample_urls() -> dict:
+    """Representative URLs per page type; the critical CSS covers the union of their folds."""
+    catalog = get_catalog()
+    return {
+        "home": [reverse("home")],
+        "category": [reverse("prgrms_srvcs")] + [c.url for c in catalog.categories[:2]],
+        "product": [p.url for p in catalog.products[:2]],
+        "blog": [reverse("blgs_updts")],
+        "legal": [reverse(name) for name in LEGAL_PAGES],
+        "cart": [reverse("cart_page")],
+        "page": [reverse("about"), reverse("contact"), reverse("faqs")],
+    }
+
+
+def _gz(text: str) -> int:
+    return len(gzip.compress(text.encode(), 9))
+
+
+class Command(BaseCommand):
+    help = (
+        "Render sample pages of each page type, write the CSS their above-the-fold markup "
+        "needs to STATIC_BUILD_DIR/critical/<type>.css, and estimate the first-render gain."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rtt-ms", type=float, default=150.0, help="Round trip for the estimate.")
+        parser.add_argument("--kbps", type=float, default=1638.4, help="Downlink for the estimate.")
+
+    def handle(self, *args, **options):
+        sources = {}
+        for name, files in CSS_BUNDLES.items():
+            parts = []
+            for source in files:
+                path = finders.find(source)
+                if not path:
+                    raise CommandError(f"Bundle {name!r}: static file {source!r} not found.")
+                parts.append(Path(path).read_text(encoding="utf-8"))
+            sources[name] = "\n".join(parts)
+
+        # What used to block every page: all of the CSS, as one minified bundle.
+        blocking_before = _gz(minify_css("\n".join(sources.values())))
+        rtt, bytes_per_ms = options["rtt_ms"], options["kbps"] * 1000 / 8 / 1000
+        out_root = Path(settings.STATIC_BUILD_DIR)
+        client = Client()
+
+        self.stdout.write(
+            f"Render-blocking local CSS before: 1 request, {blocking_before / 1024:.1f} KiB gzipped, "
+            f"~{rtt + blocking_before / bytes_per_ms:.0f} ms at {rtt:.0f} ms RTT / {options['kbps']:.0f} kbps\n"
+        )
+        self.stdout.write("Type       pages  bundles                       critical  inline gz   est. saved")
+
+        with override_settings(ALLOWED_HOSTS=["testserver"]):
+            for page_type, urls in sample_urls().items():
+                if not urls:
+                    self.stderr.write(f"{page_type}: no sample pages (empty catalog?), skipped.")
+                    continue
+
+                fold, unused = set(), set(PAGE_CSS[page_type])
+                for url in urls:
+                    response = client.get(url)
+                    if response.status_code != 200:
+                        raise CommandError(f"{url} returned {response.status_code}.")
+                    page, page_fold = page_tokens(response.content.decode())
+                    fold |= page_fold
+                    for name, css in sources.items():
+                        if not css_uses(css, page):
+                            continue
+                        unused.discard(name)
+                        if name not in PAGE_CSS[page_type]:
+                            self.stderr.write(self.style.WARNING(
+                                f"{url} uses bundle {name!r}, which PAGE_CSS[{page_type!r}] doesn't load."
+                            ))
+                for name in sorted(unused):
+                    self.stderr.write(self.style.WARNING(
+                        f"PAGE_CSS[{page_type!r}] loads {name!r}, but no {page_type} sample page uses it."
+                    ))
+
+                critical = extract_critical("\n".join(sources[name] for name in PAGE_CSS[page_type]), fold)
+                target = out_root / critical_path(page_type)
+                target.parent.mkdir(parents=True, exist_ok=True)
+                target.write_text(critical, encoding="utf-8")
+
+                inline = _gz(critical)
+                saved = rtt + (blocking_before - inline) / bytes_per_ms
+                self.stdout.write(
+                    f"{page_type:<10} {len(urls):>5}  {'+'.join(PAGE_CSS[page_type]):<28} "
+                    f"{len(critical) / 1024:>6.1f} KiB {inline / 1024:>6.1f} KiB {saved:>9.0f} ms"
+                )
+
+        self.stdout.write(
+            "\nEstimates cover our CSS only; the CDN stylesheets (Bootstrap, Font Awesome, Owl) "
+            "block render the same way before and after."
+        )
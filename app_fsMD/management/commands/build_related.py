@@ -0,0 +1,28 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from app_fsMD.catalog import get_catalog
+from app_fsMD.related import neighbour_table, rebuild_related
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the related-products table for every active product from categories, "
+        "product text and cart pair counts. Run nightly after aggregate_cart_events; "
+        "product saves queue the rows they change in between."
+    )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        count = rebuild_related()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f"{count} products, neighbours written in {elapsed:.2f} s."))
+
+        if options["verbosity"] > 1:
+            catalog = get_catalog()
+            products = catalog.products_by_id
+            for pid, ids in sorted(neighbour_table().items()):
+                if pid in products:
+                    names = ", ".join(products[i].name for i in ids[:4] if i in products)
+                    self.stdout.write(f"  {products[pid].name}: {names}")
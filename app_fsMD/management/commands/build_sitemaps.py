@@ -0,0 +1,26 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from app_fsMD.sitemaps import SITEMAP_SECTIONS, build_sitemaps, sitemap_path
+
+
+class Command(BaseCommand):
+    help = "Rebuild the gzipped sitemap shards and index in SITEMAP_DIR (all sections by default)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("sections", nargs="*", help=f"Any of: {', '.join(SITEMAP_SECTIONS)}.")
+
+    def handle(self, *args, **options):
+        unknown = set(options["sections"]) - set(SITEMAP_SECTIONS)
+        if unknown:
+            raise CommandError(f"Unknown section(s): {', '.join(sorted(unknown))}.")
+
+        started = time.perf_counter()
+        manifest = build_sitemaps(options["sections"] or None)
+        elapsed = (time.perf_counter() - started) * 1000
+
+        for section, shards in manifest.items():
+            size = sum(sitemap_path(section, page).stat().st_size for page, _ in shards)
+            self.stdout.write(f"{section:<12} {len(shards)} shard(s), {size:,} B gzipped")
+        self.stdout.write(self.style.SUCCESS(f"Sitemaps written in {elapsed:.0f} ms."))
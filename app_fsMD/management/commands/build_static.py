@@ -0,0 +1,45 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+
+from app_fsMD.assets import CSS_BUNDLES, JS_MODULES, bundle_path, minify_css, minify_js, module_path
+
+
+class Command(BaseCommand):
+    help = (
+        "Concatenate and minify the CSS bundles and minify the JS modules into STATIC_BUILD_DIR, then (with "
+        "--collect) run collectstatic to fingerprint and gzip/brotli-compress them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--collect", action="store_true", help="Run collectstatic afterwards.")
+
+    def handle(self, *args, **options):
+        out_root = Path(settings.STATIC_BUILD_DIR)
+
+        outputs = [(bundle_path(name, "css"), sources, minify_css) for name, sources in CSS_BUNDLES.items()]
+        outputs += [(module_path(name), [source], minify_js) for name, source in JS_MODULES.items()]
+
+        for output, sources, minify in outputs:
+            parts = []
+            for source in sources:
+                path = finders.find(source)
+                if not path:
+                    raise CommandError(f"{output}: static file {source!r} not found.")
+                parts.append(Path(path).read_text(encoding="utf-8"))
+
+            raw = "\n".join(parts)
+            minified = minify(raw)
+            target = out_root / output
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_text(minified, encoding="utf-8")
+            self.stdout.write(
+                f"{output}: {len(sources)} files, "
+                f"{len(raw.encode()) / 1024:.1f} KiB -> {len(minified.encode()) / 1024:.1f} KiB"
+            )
+
+        if options["collect"]:
+            call_command("collectstatic", interactive=False, verbosity=options["verbosity"])
@@ -0,0 +1,78 @@
+import os
+from urllib.error import HTTPError
+from urllib.parse import urljoin
+from urllib.request import Request, urlopen
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+
+from app_fsMD.utils.images import content_hash
+
+
+def _fetch(url, headers=None):
+    try:
+        with urlopen(Request(url, headers=headers or {}), timeout=10) as res:
+            return res.status, res.headers, res.read()
+    except HTTPError as exc:
+        return exc.code, exc.headers, exc.read()
+
+
+class Command(BaseCommand):
+    help = (
+        "Upload a content-hashed probe file through the default storage and check how its "
+        "URL is served: immutable Cache-Control, Range (206) and If-None-Match (304)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--base-url",
+            default="",
+            help="Site origin for relative media URLs, e.g. http://localhost:8000 (not needed for S3).",
+        )
+        parser.add_argument("--keep", action="store_true", help="Leave the probe file in storage.")
+
+    def handle(self, *args, **options):
+        data = os.urandom(4096)
+        name = default_storage.save(f"_probe/probe.{content_hash(data)}.bin", ContentFile(data))
+        url = default_storage.url(name)
+        if not url.startswith(("http://", "https://")):
+            if not options["base_url"]:
+                default_storage.delete(name)
+                raise CommandError(f"{url} is relative; pass --base-url.")
+            url = urljoin(options["base_url"], url)
+
+        self.stdout.write(f"{default_storage.__class__.__name__}: {url}")
+        failures = []
+
+        def check(label, ok, detail=""):
+            self.stdout.write(f"  {'ok  ' if ok else 'FAIL'} {label}{f' ({detail})' if detail else ''}")
+            if not ok:
+                failures.append(label)
+
+        try:
+            status, headers, body = _fetch(url)
+            cache_control = headers.get("Cache-Control", "")
+            check("GET 200 with the uploaded bytes", status == 200 and body == data, f"status {status}")
+            check("immutable Cache-Control", "immutable" in cache_control, cache_control or "missing")
+
+            status, headers, body = _fetch(url, {"Range": "bytes=100-199"})
+            check(
+                "Range request -> 206",
+                status == 206 and body == data[100:200],
+                f"status {status}, {headers.get('Content-Range', 'no Content-Range')}",
+            )
+
+            etag = headers.get("ETag")
+            if etag:
+                status, _, _ = _fetch(url, {"If-None-Match": etag})
+                check("If-None-Match -> 304", status == 304, f"status {status}")
+            else:
+                check("ETag present", False)
+        finally:
+            if not options["keep"]:
+                default_storage.delete(name)
+
+        if failures:
+            raise CommandError(f"{len(failures)} check(s) failed.")
+        self.stdout.write(self.style.SUCCESS("Media serving looks right."))
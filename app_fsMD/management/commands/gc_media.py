@@ -0,0 +1,154 @@
+from collections import Counter
+from datetime import timedelta
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from app_fsMD.models import StoredFile
+from app_fsMD.signals import FILE_MODELS, file_fields
+
+
+# Where gc may delete: content-addressed files and the upload_to directories of older
+# uploads. Anything else in storage (check_media probes, files put there by hand) stays.
+MANAGED_PREFIXES = ("cas/", "products/", "categories/", "blog/", "feedback_images/")
+
+
+def _mib(n: int) -> str:
+    return f"{n / 1024 / 1024:,.2f} MiB"
+
+
+def iter_storage(storage, path=""):
+    try:
+        directories, files = storage.listdir(path)
+    except FileNotFoundError:
+        return
+    for name in files:
+        yield f"{path}/{name}" if path else name
+    for directory in directories:
+        yield from iter_storage(storage, f"{path}/{directory}" if path else directory)
+
+
+def iter_managed(storage):
+    for prefix in MANAGED_PREFIXES:
+        yield from iter_storage(storage, prefix.rstrip("/"))
+
+
+def references_to(name: str) -> int:
+    """Rows pointing at this name as of now."""
+    return sum(
+        model._base_manager.filter(**{field: name}).count() for model in FILE_MODELS for field in file_fields(model)
+    )
+
+
+def delete_if_orphan(storage, name: str, cutoff) -> bool:
+    """
+    Delete the file unless, re-checked under its StoredFile row lock, something points
+    at it or it was used or written since the cutoff: the scan's snapshot is stale by
+    now, and a concurrent upload may have just reused the name.
+    """
+    with transaction.atomic():
+        row = StoredFile.objects.select_for_update().filter(name=name).first()
+        if row is not None and row.updated_at >= cutoff:
+            return False
+        if references_to(name) or storage.get_modified_time(name) >= cutoff:
+            return False
+        storage.delete(name)
+        if row is not None and row.refcount <= 0:
+            row.delete()
+    return True
+
+
+def count_references() -> Counter:
+    """Every file name stored in an ImageField, with the number of values pointing at it."""
+    refs = Counter()
+    for model in FILE_MODELS:
+        fields = file_fields(model)
+        for row in model._base_manager.values_list(*fields).iterator():
+            refs.update(name.replace("\\", "/") for name in row if name)
+    return refs
+
+
+def default_files() -> set:
+    """Files named as ImageField defaults (the "no image" placeholder), kept even when unused."""
+    return {
+        field.default
+        for model in FILE_MODELS
+        for field in model._meta.concrete_fields
+        if field.attname in file_fields(model) and isinstance(field.default, str) and field.default
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Recount StoredFile references from the ImageField columns, then delete media files "
+        "no row points at (old slug paths, replaced uploads, pre-dedup copies). Only cas/ "
+        "and the upload directories are scanned; each file is re-checked just before it goes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Only report what would be deleted.")
+        parser.add_argument(
+            "--grace-hours",
+            type=float,
+            default=24.0,
+            help="Keep unreferenced files modified or referenced more recently than this.",
+        )
+
+    def handle(self, *args, **options):
+        storage = default_storage
+        cutoff = timezone.now() - timedelta(hours=options["grace_hours"])
+        # Counted with the StoredFile rows locked and written as absolute values, so an
+        # upload's increment can't land between the count and the correction and be undone.
+        with transaction.atomic():
+            if not options["dry_run"]:
+                list(StoredFile.objects.select_for_update().values_list("pk", flat=True))
+            refs = count_references()
+            stored = dict(StoredFile.objects.values_list("name", "refcount"))
+            drifted = {name for name in stored.keys() | refs.keys() if stored.get(name, 0) != refs.get(name, 0)}
+            if drifted and not options["dry_run"]:
+                StoredFile.objects.set_counts({name: refs.get(name, 0) for name in drifted})
+
+        pinned = default_files()
+        recent = set(StoredFile.objects.filter(updated_at__gte=cutoff).values_list("name", flat=True))
+        total = shared_saved = freed = kept_recent = 0
+        orphans, on_disk, sizes = [], set(), {}
+        for name in iter_managed(storage):
+            on_disk.add(name)
+            size = storage.size(name)
+            total += size
+            if refs[name]:
+                shared_saved += size * (refs[name] - 1)
+                continue
+            if name in pinned:
+                continue
+            if name in recent or storage.get_modified_time(name) >= cutoff:
+                kept_recent += 1
+                continue
+            orphans.append(name)
+            sizes[name] = size
+            freed += size
+            if options["verbosity"] > 1:
+                self.stdout.write(f"orphan: {name} ({size:,} B)")
+
+        if not options["dry_run"]:
+            deleted = [name for name in orphans if delete_if_orphan(storage, name, cutoff)]
+            kept_recent += len(orphans) - len(deleted)
+            freed -= sum(sizes[name] for name in set(orphans) - set(deleted))
+            orphans = deleted
+
+        managed = {name for name in refs if name.startswith(MANAGED_PREFIXES)}
+        for name in sorted(managed - on_disk):
+            self.stderr.write(self.style.WARNING(f"Referenced but missing from storage: {name}"))
+
+        shared = sum(1 for n in refs.values() if n > 1)
+        self.stdout.write(
+            f"{len(on_disk)} files ({_mib(total)}), {len(refs)} referenced, {shared} shared "
+            f"({_mib(shared_saved)} not stored twice), {len(drifted)} refcounts "
+            f"{'out of sync' if options['dry_run'] else 'corrected'}."
+        )
+        verb = "Would delete" if options["dry_run"] else "Deleted"
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {len(orphans)} orphaned files ({_mib(freed)}); {kept_recent} recent ones kept."
+        ))
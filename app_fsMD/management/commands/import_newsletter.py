@@ -0,0 +1,75 @@
+import csv
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from app_fsMD.newsletter import normalize_email, upsert_subscriptions
+
+
+class Command(BaseCommand):
+    help = (
+        "Import newsletter subscribers from a CSV file (or - for stdin) in bulk batches. "
+        "Existing subscriptions, including unsubscribed ones, are left alone unless "
+        "--reactivate is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV file, or - for stdin.")
+        parser.add_argument("--column", default="email", help="Header of the email column (default: email).")
+        parser.add_argument("--no-header", action="store_true", help="The file has no header; use the first column.")
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--reactivate", action="store_true", help="Set existing inactive subscriptions active again.")
+        parser.add_argument("--dry-run", action="store_true", help="Validate and count without writing.")
+
+    def handle(self, *args, **options):
+        handle = sys.stdin if options["path"] == "-" else open(options["path"], newline="", encoding="utf-8-sig")
+        try:
+            self._import(handle, options)
+        finally:
+            if handle is not sys.stdin:
+                handle.close()
+
+    def _rows(self, handle, options):
+        reader = csv.reader(handle)
+        index = 0
+        if not options["no_header"]:
+            header = [h.strip().lower() for h in next(reader, [])]
+            if options["column"].lower() not in header:
+                raise CommandError(f"No {options['column']!r} column in the header: {', '.join(header)}.")
+            index = header.index(options["column"].lower())
+        for row in reader:
+            yield row[index] if index < len(row) else ""
+
+    def _import(self, handle, options):
+        started = time.perf_counter()
+        seen = set()
+        batch = []
+        read = invalid = duplicates = written = 0
+
+        for value in self._rows(handle, options):
+            read += 1
+            email = normalize_email(value)
+            if not email:
+                invalid += 1
+                continue
+            if email in seen:
+                duplicates += 1
+                continue
+            seen.add(email)
+            batch.append(email)
+            if len(batch) >= options["batch_size"]:
+                written += self._flush(batch, options)
+                batch = []
+        written += self._flush(batch, options)
+
+        action = "would be upserted" if options["dry_run"] else "upserted"
+        self.stdout.write(self.style.SUCCESS(
+            f"{read:,} rows: {written:,} addresses {action}, {invalid:,} invalid, {duplicates:,} duplicates "
+            f"in {time.perf_counter() - started:.1f} s."
+        ))
+
+    def _flush(self, batch, options) -> int:
+        if not batch or options["dry_run"]:
+            return len(batch)
+        return upsert_subscriptions(batch, reactivate=options["reactivate"], batch_size=options["batch_size"])
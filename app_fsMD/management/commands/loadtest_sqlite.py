@@ -0,0 +1,111 @@
+import multiprocessing
+import os
+import sqlite3
+import statistics
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection
+
+from project_fsMD.database import sqlite_options
+
+
+def _worker(role, db_path, options, seconds, product_ids, results):
+    from django.contrib.sessions.backends.db import SessionStore
+
+    from app_fsMD.models import Category, Product
+
+    connection.close()
+    connection.settings_dict["NAME"] = db_path
+    connection.settings_dict["OPTIONS"] = options
+
+    ops, locked, latencies = 0, 0, []
+    deadline = time.perf_counter() + seconds
+    i = 0
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            if role == "cart":
+                session = SessionStore()
+                pid = product_ids[i % len(product_ids)] if product_ids else i
+                session["cart"] = {str(pid): 1 + i % 3}
+                session.save()
+            else:
+                list(
+                    Product.objects.filter(is_active=True, category__is_active=True)
+                    .select_related("category")
+                    .order_by("name")[:50]
+                )
+                list(Category.objects.filter(is_active=True).order_by("sort_order", "name"))
+            ops += 1
+            latencies.append(time.perf_counter() - started)
+        except OperationalError as exc:
+            if "locked" not in str(exc):
+                raise
+            locked += 1
+        i += 1
+
+    connection.close()
+    results.put((role, ops, locked, latencies))
+
+
+class Command(BaseCommand):
+    help = (
+        "Multi-process load test: concurrent cart (session) writes vs catalog reads "
+        "against a copy of the SQLite database, with and without the connection pragmas."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--writers", type=int, default=4)
+        parser.add_argument("--readers", type=int, default=4)
+        parser.add_argument("--seconds", type=float, default=5.0)
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            raise CommandError("loadtest_sqlite only applies to the sqlite3 backend.")
+
+        from app_fsMD.models import Product
+
+        product_ids = list(Product.objects.values_list("id", flat=True)[:100])
+        source = str(connection.settings_dict["NAME"])
+        connection.close()
+
+        profiles = {
+            "defaults": {"init_command": "PRAGMA journal_mode=DELETE"},
+            "tuned": sqlite_options(),
+        }
+
+        ctx = multiprocessing.get_context("fork")
+        with tempfile.TemporaryDirectory() as tmp:
+            for label, db_options in profiles.items():
+                db_path = os.path.join(tmp, f"{label}.sqlite3")
+                with sqlite3.connect(source) as src, sqlite3.connect(db_path) as dst:
+                    src.backup(dst)
+
+                results = ctx.Queue()
+                procs = [
+                    ctx.Process(
+                        target=_worker,
+                        args=(role, db_path, db_options, options["seconds"], product_ids, results),
+                    )
+                    for role, count in (("cart", options["writers"]), ("catalog", options["readers"]))
+                    for _ in range(count)
+                ]
+                for p in procs:
+                    p.start()
+                rows = [results.get() for _ in procs]
+                for p in procs:
+                    p.join()
+
+                self.stdout.write(self.style.MIGRATE_HEADING(f"[{label}] {db_options.get('init_command')}"))
+                for role in ("cart", "catalog"):
+                    ops = sum(r[1] for r in rows if r[0] == role)
+                    locked = sum(r[2] for r in rows if r[0] == role)
+                    lat = sorted(x for r in rows if r[0] == role for x in r[3])
+                    p50 = statistics.median(lat) * 1000 if lat else 0
+                    p95 = lat[int(len(lat) * 0.95) - 1] * 1000 if lat else 0
+                    self.stdout.write(
+                        f"  {role:<8} {ops / options['seconds']:>9.0f} ops/s  "
+                        f"p50 {p50:7.2f} ms  p95 {p95:7.2f} ms  locked {locked}"
+                    )
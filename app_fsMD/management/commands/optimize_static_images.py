@@ -0,0 +1,168 @@
+import json
+import re
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.management.base import BaseCommand
+from django.template import engines
+from django.template.backends.django import DjangoTemplates
+from PIL import Image
+
+from app_fsMD.assets import (
+    RESPONSIVE_FORMATS,
+    RESPONSIVE_MANIFEST,
+    RESPONSIVE_SOURCE_EXTS,
+    RESPONSIVE_WIDTHS,
+    variant_path,
+)
+from app_fsMD.management.commands.precompile_templates import iter_template_names
+from app_fsMD.utils.images import avif_supported, encode_image, prepare_image, resize_to_width
+
+STATIC_REF = re.compile(r"""{%\s*(static|static_img)\s+['"](images/[^'"]+)['"]""")
+TEMPLATE_REF = re.compile(r"""{%\s*(?:extends|include|cached_include)\s+['"]([^'"]+)['"]""")
+EXTENDS = re.compile(r"""{%\s*extends\s""")
+
+
+def _kib(n: int) -> str:
+    return f"{n / 1024:,.0f} KiB"
+
+
+class Command(BaseCommand):
+    help = (
+        "Write resized WebP/AVIF variants of the static JPEG/PNG images into "
+        "STATIC_BUILD_DIR with a manifest for {% static_img %}, then report the bytes "
+        "saved per page template."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--quality", type=int, default=80)
+        parser.add_argument("--min-kb", type=int, default=30, help="Skip sources smaller than this.")
+        parser.add_argument("--no-avif", action="store_true", help="Only write WebP variants.")
+        parser.add_argument("--force", action="store_true", help="Rebuild variants that are up to date.")
+        parser.add_argument("--report-only", action="store_true", help="Skip encoding; report from the manifest.")
+
+    def handle(self, *args, **options):
+        self.verbosity = options["verbosity"]
+        out_root = Path(settings.STATIC_BUILD_DIR)
+        manifest_path = out_root / RESPONSIVE_MANIFEST
+
+        if options["report_only"]:
+            manifest = json.loads(manifest_path.read_text(encoding="utf-8")) if manifest_path.exists() else {}
+        else:
+            formats = [
+                ext for ext in RESPONSIVE_FORMATS
+                if ext == "webp" or (ext == "avif" and not options["no_avif"] and avif_supported())
+            ]
+            manifest = self._build(out_root, formats, options)
+            manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            manifest_path.write_text(json.dumps(manifest, indent=1, sort_keys=True), encoding="utf-8")
+
+            before = sum(entry["bytes"] for entry in manifest.values())
+            after = sum(self._best_bytes(entry) for entry in manifest.values())
+            self.stdout.write(self.style.SUCCESS(
+                f"{len(manifest)} images ({', '.join(formats)}): {_kib(before)} -> {_kib(after)} "
+                f"at the largest width"
+            ))
+
+        self._report(manifest)
+
+    def _sources(self, out_root: Path, min_bytes: int):
+        seen = set()
+        for finder in finders.get_finders():
+            for path, storage in finder.list([]):
+                path = path.replace("\\", "/")
+                if path in seen or not path.startswith("images/"):
+                    continue
+                if not path.lower().endswith(RESPONSIVE_SOURCE_EXTS):
+                    continue
+                full = Path(storage.path(path))
+                if out_root in full.parents or full.stat().st_size < min_bytes:
+                    continue
+                seen.add(path)
+                yield path, full
+
+    def _build(self, out_root: Path, formats: list, options) -> dict:
+        manifest = {}
+        for source, full in sorted(self._sources(out_root, options["min_kb"] * 1024)):
+            with Image.open(full) as im:
+                im = prepare_image(im)
+                widths = sorted({w for w in RESPONSIVE_WIDTHS if w < im.width} | {min(im.width, RESPONSIVE_WIDTHS[-1])})
+                entry = {"width": im.width, "height": im.height, "bytes": full.stat().st_size, "variants": {}}
+
+                for ext in formats:
+                    rows = []
+                    for width in widths:
+                        name = variant_path(source, width, ext)
+                        target = out_root / name
+                        fresh = target.exists() and target.stat().st_mtime >= full.stat().st_mtime
+                        if options["force"] or not fresh:
+                            target.parent.mkdir(parents=True, exist_ok=True)
+                            target.write_bytes(encode_image(
+                                resize_to_width(im, width), ext.upper(), quality=options["quality"]
+                            ))
+                        rows.append([width, name, target.stat().st_size])
+                    entry["variants"][ext] = rows
+
+            manifest[source] = entry
+            if options["verbosity"] > 1:
+                self.stdout.write(f"{source}: {_kib(entry['bytes'])} -> {_kib(self._best_bytes(entry))}")
+        return manifest
+
+    @staticmethod
+    def _best_bytes(entry: dict) -> int:
+        """Smallest largest-width variant: what a desktop browser with the best codec downloads."""
+        sizes = [rows[-1][2] for rows in entry["variants"].values() if rows]
+        return min(sizes) if sizes else entry["bytes"]
+
+    def _report(self, manifest: dict):
+        sources, refs = {}, {}
+        for backend in engines.all():
+            if not isinstance(backend, DjangoTemplates):
+                continue
+            engine = backend.engine
+            for name in iter_template_names(engine):
+                if name in sources:
+                    continue
+                text = engine.find_template(name)[0].source
+                sources[name] = text
+                refs[name] = (set(STATIC_REF.findall(text)), set(TEMPLATE_REF.findall(text)))
+
+        def closure(name, seen):
+            if name in seen or name not in refs:
+                return set()
+            seen.add(name)
+            images, children = refs[name]
+            images = set(images)
+            for child in children:
+                images |= closure(child, seen)
+            return images
+
+        pages = sorted(name for name, text in sources.items() if EXTENDS.search(text))
+        self.stdout.write("\nPage                               images     original    optimized      saved  pending")
+        total_saved = 0
+        for page in pages:
+            images = closure(page, set())
+            original = optimized = 0
+            pending = []
+            for tag, path in images:
+                entry = manifest.get(path)
+                if not entry:
+                    continue
+                original += entry["bytes"]
+                if tag == "static_img":
+                    optimized += self._best_bytes(entry)
+                else:
+                    optimized += entry["bytes"]
+                    pending.append(path)
+            if not original:
+                continue
+            total_saved += original - optimized
+            self.stdout.write(
+                f"{page:<34} {len(images):>6} {_kib(original):>12} {_kib(optimized):>12} "
+                f"{_kib(original - optimized):>10}  {len(pending)}"
+            )
+            if self.verbosity > 1:
+                for path in sorted(pending):
+                    self.stdout.write(f"    still {{% static %}}: {path}")
+        self.stdout.write(f"\nSaved across pages: {_kib(total_saved)}")
@@ -0,0 +1,53 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.template import TemplateSyntaxError, engines
+from django.template.backends.django import DjangoTemplates
+from django.template.utils import get_app_template_dirs
+
+TEMPLATE_SUFFIXES = (".html", ".txt", ".xml")
+
+
+def iter_template_names(engine):
+    dirs = list(engine.dirs)
+    if engine.app_dirs or any("app_directories" in str(loader) for loader in engine.loaders):
+        dirs += list(get_app_template_dirs("templates"))
+
+    seen = set()
+    for directory in dirs:
+        root = Path(directory)
+        if not root.is_dir():
+            continue
+        for path in sorted(root.rglob("*")):
+            if path.suffix in TEMPLATE_SUFFIXES and path.is_file():
+                name = path.relative_to(root).as_posix()
+                if name not in seen:
+                    seen.add(name)
+                    yield name
+
+
+class Command(BaseCommand):
+    help = (
+        "Parse every template through the configured loaders so the cached loader is warm "
+        "before the first request. Lists every syntax error and exits non-zero if any."
+    )
+
+    def handle(self, *args, **options):
+        compiled, errors = 0, []
+
+        for backend in engines.all():
+            if not isinstance(backend, DjangoTemplates):
+                continue
+            engine = backend.engine
+            for name in iter_template_names(engine):
+                try:
+                    engine.get_template(name)
+                    compiled += 1
+                except TemplateSyntaxError as exc:
+                    errors.append(f"{name}: {exc}")
+
+        if errors:
+            raise CommandError("Template errors:\n  " + "\n  ".join(errors))
+
+        if options["verbosity"]:
+            self.stdout.write(self.style.SUCCESS(f"Done. Compiled {compiled} templates."))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from app_fsMD.signals import bump_cache_version
+from app_fsMD.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild SearchDocument (and its FTS index) from the active products and blog posts."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            count = rebuild_index()
+        bump_cache_version("search_v")
+        self.stdout.write(self.style.SUCCESS(f"Done. {count} documents indexed."))
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Q
+
+from app_fsMD.models import Category
+from app_fsMD.signals import bump_site_cache_version
+
+
+class Command(BaseCommand):
+    help = "Recompute Category.active_product_count from the product table and report drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Only report mismatches.")
+
+    def handle(self, *args, **options):
+        actual = dict(
+            Category.objects.annotate(
+                n=Count("products", filter=Q(products__is_active=True))
+            ).values_list("id", "n")
+        )
+        drifted = [
+            (c.name, c.active_product_count, actual[c.id])
+            for c in Category.objects.only("id", "name", "active_product_count")
+            if c.active_product_count != actual[c.id]
+        ]
+        for name, stored, real in drifted:
+            self.stdout.write(f"{name}: stored {stored}, actual {real}")
+
+        if drifted and not options["dry_run"]:
+            with transaction.atomic():
+                Category.objects.all().refresh_active_product_counts()
+            bump_site_cache_version()
+
+        self.stdout.write(self.style.SUCCESS(f"Done. {len(drifted)} categories out of sync."))
@@ -0,0 +1,43 @@
+import sqlite3
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from app_fsMD.routers import PRIMARY_ALIAS, REPLICA_ALIAS
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy the primary SQLite database onto the replica alias. With --lag N --loop it "
+        "keeps re-copying every N seconds, simulating a replica that trails the primary."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--lag", type=float, default=0.0, help="Seconds to wait before (each) copy.")
+        parser.add_argument("--loop", action="store_true", help="Keep syncing until interrupted.")
+
+    def handle(self, *args, **options):
+        if REPLICA_ALIAS not in connections.settings:
+            raise CommandError("No 'replica' database configured (set DATABASE_REPLICA_URL).")
+
+        primary = connections[PRIMARY_ALIAS].settings_dict
+        replica = connections[REPLICA_ALIAS].settings_dict
+        if not (primary["ENGINE"].endswith("sqlite3") and replica["ENGINE"].endswith("sqlite3")):
+            raise CommandError(
+                "sync_replica only copies SQLite files. For Postgres use a streaming standby; "
+                "recovery_min_apply_delay on the standby simulates replication lag."
+            )
+
+        while True:
+            if options["lag"]:
+                time.sleep(options["lag"])
+            started = time.perf_counter()
+            with sqlite3.connect(str(primary["NAME"])) as src, sqlite3.connect(str(replica["NAME"])) as dst:
+                src.backup(dst)
+            self.stdout.write(
+                f"Replica synced in {(time.perf_counter() - started) * 1000:.1f} ms "
+                f"(lag {options['lag']:.1f}s)."
+            )
+            if not options["loop"]:
+                break
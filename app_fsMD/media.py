@@ -0,0 +1,154 @@
+"""
+Serving uploaded media.
+
+Uploaded images are stored under content-addressed names by the image pipeline
+(utils/images.py): `cas/<2 hex>/<32 hex>.webp`, keyed by the source bytes. The same image
+uploaded to several products is stored once, and a URL's bytes never change, so it can
+be cached for a year. StoredFile counts the references to each file; `manage.py gc_media`
+deletes the ones nothing points at any more.
+
+In production media never reaches an application process:
+
+- MEDIA_S3_BUCKET set: files live in an S3-compatible bucket (django-storages) and are
+  uploaded with the Cache-Control below; the bucket/CDN handles Range and conditional
+  requests. Point MEDIA_S3_ENDPOINT_URL at MinIO or similar to run against a local stand-in.
+- Otherwise the reverse proxy serves MEDIA_ROOT itself, e.g. for nginx:
+
+      location /media/cas/ { alias <MEDIA_ROOT>/cas/; add_header Cache-Control "public, max-age=31536000, immutable"; }
+      location /media/     { alias <MEDIA_ROOT>/;     add_header Cache-Control "public, max-age=3600"; }
+
+With SERVE_MEDIA (on by default under DEBUG without a bucket, off in production)
+MediaFiles wraps the WSGI application and MediaFilesASGI the ASGI one, serving MEDIA_ROOT
+through WhiteNoise ahead of Django, with Range and conditional requests answered. That is
+for development, or a deployment with no proxy in front.
+
+`manage.py check_media` uploads a probe file and verifies the headers end to end.
+"""
+import asyncio
+import os
+import tempfile
+
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from whitenoise import WhiteNoise
+
+from .utils.images import is_cas_name, is_hashed_name
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Names without a content hash (uploads from before hashing, non-image files).
+MUTABLE_MAX_AGE = 3600
+
+
+def media_cache_control(name: str) -> str:
+    if is_hashed_name(name):
+        return IMMUTABLE_CACHE_CONTROL
+    return f"public, max-age={MUTABLE_MAX_AGE}"
+
+
+class MediaFiles(WhiteNoise):
+    """
+    WSGI middleware serving MEDIA_ROOT at MEDIA_URL (SERVE_MEDIA only, see above).
+
+    Runs in autorefresh mode, so files uploaded after startup are found (one stat per
+    media request); everything outside MEDIA_URL falls straight through to Django.
+    """
+
+    def __init__(self, application):
+        super().__init__(
+            application,
+            autorefresh=True,
+            max_age=MUTABLE_MAX_AGE,
+            immutable_file_test=lambda path, url: is_hashed_name(url),
+        )
+        self.add_files(settings.MEDIA_ROOT, prefix=settings.MEDIA_URL)
+
+
+class MediaFilesASGI:
+    """MediaFiles for asgi.py: the same lookup and responses, the file sent in chunks off the event loop."""
+
+    chunk_size = 64 * 1024
+
+    def __init__(self, application):
+        self.application = application
+        self.files = MediaFiles(None)
+        self.prefix = self.files.directories[0][1] if self.files.directories else settings.MEDIA_URL
+
+    async def __call__(self, scope, receive, send):
+        path = scope.get("path", "")
+        if scope["type"] != "http" or not path.startswith(self.prefix):
+            return await self.application(scope, receive, send)
+        static_file = await asyncio.to_thread(self.files.find_file, path)
+        if static_file is None:
+            return await self.application(scope, receive, send)
+
+        headers = {"HTTP_" + name.decode("latin-1").upper().replace("-", "_"): value.decode("latin-1") for name, value in scope["headers"]}
+        response = static_file.get_response(scope["method"], headers)
+        await send({
+            "type": "http.response.start",
+            "status": int(response.status),
+            "headers": [(name.lower().encode("latin-1"), str(value).encode("latin-1")) for name, value in response.headers],
+        })
+        if response.file is None:
+            await send({"type": "http.response.body", "body": b""})
+            return
+        try:
+            while chunk := await asyncio.to_thread(response.file.read, self.chunk_size):
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+            await send({"type": "http.response.body", "body": b""})
+        finally:
+            response.file.close()
+
+
+class ContentAddressedMixin:
+    """
+    A cas/ name is derived from the content, so if it exists it already holds these
+    bytes: saving it again is a no-op rather than a `_x7k2f9a`-suffixed copy. The file is
+    touched instead, so `gc_media` sees it as recently used and won't delete an orphan
+    that a row is about to point at again.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        if is_cas_name(name):
+            return name
+        return super().get_available_name(name, max_length=max_length)
+
+    def touch(self, name) -> None:
+        """Set the file's modified time to now."""
+        raise NotImplementedError
+
+    def save(self, name, content, max_length=None):
+        if is_cas_name(name) and self.exists(name):
+            self.touch(name)
+            return name
+        return super().save(name, content, max_length=max_length)
+
+
+class MediaStorage(ContentAddressedMixin, FileSystemStorage):
+    def touch(self, name) -> None:
+        try:
+            os.utime(self.path(name))
+        except FileNotFoundError:
+            pass
+
+    def _save(self, name, content):
+        if not is_cas_name(name):
+            return super()._save(name, content)
+
+        # Two uploads of the same image can get here at once. Both write the same bytes,
+        # so each writes a temp file and renames it over whichever landed first.
+        full_path = self.path(name)
+        directory = os.path.dirname(full_path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                for chunk in content.chunks():
+                    fh.write(chunk)
+            os.chmod(tmp_path, self.file_permissions_mode or 0o644)
+            os.replace(tmp_path, full_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return name
@@ -0,0 +1,26 @@
+from storages.backends.s3 import S3Storage
+from storages.utils import clean_name
+
+from .media import ContentAddressedMixin, media_cache_control
+
+
+class MediaS3Storage(ContentAddressedMixin, S3Storage):
+    """
+    S3-compatible media storage (AWS, MinIO, R2, ...) that uploads each object with the
+    Cache-Control its name allows: immutable for content-hashed and cas/ names.
+    """
+
+    def get_object_parameters(self, name):
+        params = super().get_object_parameters(name)
+        params.setdefault("CacheControl", media_cache_control(name))
+        return params
+
+    def touch(self, name) -> None:
+        # S3 has no utime: copying the object onto itself resets LastModified.
+        obj = self.bucket.Object(self._normalize_name(clean_name(name)))
+        obj.copy_from(
+            CopySource={"Bucket": self.bucket_name, "Key": obj.key},
+            MetadataDirective="REPLACE",
+            CacheControl=obj.cache_control or media_cache_control(name),
+            ContentType=obj.content_type or "application/octet-stream",
+        )
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.1 on 2026-10-19 13:15
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def populate_active_product_count(apps, schema_editor):
+    Category = apps.get_model("app_fsMD", "Category")
+    Product = apps.get_model("app_fsMD", "Product")
+    active = (
+        Product.objects.filter(category=OuterRef("pk"), is_active=True)
+        .order_by()
+        .values("category")
+        .annotate(c=Count("pk"))
+        .values("c")
+    )
+    Category.objects.update(active_product_count=Coalesce(Subquery(active), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_fsMD', '0012_alter_blogpost_main_image_alter_category_image_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='active_product_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(populate_active_product_count, migrations.RunPython.noop),
+    ]
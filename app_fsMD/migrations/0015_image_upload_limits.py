@@ -0,0 +1,40 @@
+# Generated by Django 5.2.1 on 2026-10-19 13:43
+
+import app_fsMD.models
+import app_fsMD.utils.images
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_fsMD', '0014_storedfile'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='blogpost',
+            name='main_image',
+            field=models.ImageField(help_text='Main hero image for this blog.', max_length=255, upload_to=app_fsMD.models.blog_image_upload_to, validators=[app_fsMD.utils.images.validate_image_upload]),
+        ),
+        migrations.AlterField(
+            model_name='category',
+            name='image',
+            field=models.ImageField(blank=True, max_length=255, null=True, upload_to=app_fsMD.models.category_image_upload_to, validators=[app_fsMD.utils.images.validate_image_upload]),
+        ),
+        migrations.AlterField(
+            model_name='feedback',
+            name='image',
+            field=models.ImageField(max_length=255, upload_to='feedback_images/', validators=[app_fsMD.utils.images.validate_image_upload]),
+        ),
+        migrations.AlterField(
+            model_name='product',
+            name='main_image',
+            field=models.ImageField(blank=True, default='products/no_image_available.png', max_length=255, upload_to=app_fsMD.models.product_main_image_upload_to, validators=[app_fsMD.utils.images.validate_image_upload]),
+        ),
+        migrations.AlterField(
+            model_name='productimage',
+            name='image',
+            field=models.ImageField(max_length=255, upload_to=app_fsMD.models.product_sub_image_upload_to, validators=[app_fsMD.utils.images.validate_image_upload]),
+        ),
+    ]
@@ -0,0 +1,113 @@
+# Generated by Django 5.2.1 on 2026-10-19 13:47
+
+from django.db import migrations, models
+from django.urls import reverse
+from django.utils.html import strip_tags
+
+FTS_TABLE = "app_fsMD_searchdocument_fts"
+
+SQLITE_CREATE = [
+    f"""CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+        title, body, kind,
+        content='app_fsMD_searchdocument', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3 4'
+    )""",
+    f"""CREATE TRIGGER app_fsMD_searchdocument_ai AFTER INSERT ON app_fsMD_searchdocument BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, body, kind) VALUES (new.id, new.title, new.body, new.kind);
+    END""",
+    f"""CREATE TRIGGER app_fsMD_searchdocument_ad AFTER DELETE ON app_fsMD_searchdocument BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, body, kind) VALUES ('delete', old.id, old.title, old.body, old.kind);
+    END""",
+    f"""CREATE TRIGGER app_fsMD_searchdocument_au AFTER UPDATE ON app_fsMD_searchdocument BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, body, kind) VALUES ('delete', old.id, old.title, old.body, old.kind);
+        INSERT INTO {FTS_TABLE}(rowid, title, body, kind) VALUES (new.id, new.title, new.body, new.kind);
+    END""",
+]
+SQLITE_DROP = [
+    "DROP TRIGGER IF EXISTS app_fsMD_searchdocument_ai",
+    "DROP TRIGGER IF EXISTS app_fsMD_searchdocument_ad",
+    "DROP TRIGGER IF EXISTS app_fsMD_searchdocument_au",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+# Must match search.PG_VECTOR for the planner to use the index.
+POSTGRES_CREATE = [
+    """CREATE INDEX app_fsmd_searchdocument_tsv ON "app_fsMD_searchdocument" USING GIN (
+        (setweight(to_tsvector('simple', title), 'A') || setweight(to_tsvector('simple', body), 'B'))
+    )""",
+]
+POSTGRES_DROP = ["DROP INDEX IF EXISTS app_fsmd_searchdocument_tsv"]
+
+
+def _run(schema_editor, statements):
+    for sql in statements.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(sql)
+
+
+def create_text_index(apps, schema_editor):
+    _run(schema_editor, {"sqlite": SQLITE_CREATE, "postgresql": POSTGRES_CREATE})
+
+
+def drop_text_index(apps, schema_editor):
+    _run(schema_editor, {"sqlite": SQLITE_DROP, "postgresql": POSTGRES_DROP})
+
+
+def _text(*parts):
+    return " ".join(" ".join(strip_tags(p).split()) for p in parts if p)
+
+
+def populate(apps, schema_editor):
+    """Initial fill; afterwards signals keep it (see search.index_products / index_posts)."""
+    SearchDocument = apps.get_model("app_fsMD", "SearchDocument")
+    Product = apps.get_model("app_fsMD", "Product")
+    BlogPost = apps.get_model("app_fsMD", "BlogPost")
+    docs = [
+        SearchDocument(
+            kind="product",
+            object_id=p.pk,
+            title=p.name,
+            subtitle=p.category.name,
+            url=reverse("prdct_dtls", kwargs={"slug": p.slug}),
+            body=_text(p.short_details, p.long_details, p.category.name),
+        )
+        for p in Product.objects.filter(is_active=True, category__is_active=True).select_related("category")
+    ]
+    docs += [
+        SearchDocument(
+            kind="post",
+            object_id=b.pk,
+            title=b.title,
+            subtitle=_text(b.excerpt)[:255],
+            url=f"{reverse('blgs_updts')}?slug={b.slug}",
+            body=_text(b.excerpt, b.body),
+        )
+        for b in BlogPost.objects.filter(is_active=True)
+    ]
+    SearchDocument.objects.bulk_create(docs, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_fsMD', '0015_image_upload_limits'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('product', 'Product'), ('post', 'Blog post')], max_length=10)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('title', models.CharField(max_length=255)),
+                ('subtitle', models.CharField(blank=True, max_length=255)),
+                ('url', models.CharField(max_length=255)),
+                ('body', models.TextField(blank=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('kind', 'object_id'), name='uniq_search_document')],
+            },
+        ),
+        migrations.RunPython(create_text_index, drop_text_index),
+        migrations.RunPython(populate, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.1 on 2026-10-19 14:13
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_fsMD', '0016_searchdocument'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RelatedProducts',
+            fields=[
+                ('product', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='related', serialize=False, to='app_fsMD.product')),
+                ('neighbours', models.BinaryField(default=bytes)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'related products',
+            },
+        ),
+    ]
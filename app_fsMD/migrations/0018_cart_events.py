@@ -0,0 +1,48 @@
+# Generated by Django 5.2.1 on 2026-10-19 14:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_fsMD', '0017_relatedproducts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AggregationCursor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=60, unique=True)),
+                ('last_id', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='CartEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('basket', models.BigIntegerField()),
+                ('product_id', models.PositiveBigIntegerField()),
+                ('action', models.PositiveSmallIntegerField(choices=[(1, 'Add'), (2, 'Set quantity'), (3, 'Remove')])),
+                ('qty', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField()),
+            ],
+            options={
+                'indexes': [models.Index(fields=['basket', 'product_id'], name='cartevent_basket_product')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ProductPair',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('product_a', models.PositiveBigIntegerField()),
+                ('product_b', models.PositiveBigIntegerField()),
+                ('carts', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('product_a', 'product_b'), name='uniq_product_pair')],
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.1 on 2026-10-19 14:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_fsMD', '0018_cart_events'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='newslettersubscription',
+            index=models.Index(fields=['-created_at', '-id'], name='newsletter_created_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.1 on 2026-10-19 14:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_fsMD', '0019_newsletter_created_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='blogpost',
+            index=models.Index(fields=['sort_order', '-published_at', '-id'], name='blogpost_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='blogpost',
+            index=models.Index(fields=['published_at'], name='blogpost_published_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='feedback',
+            index=models.Index(fields=['-star_rating', '-id'], name='feedback_rating_idx'),
+        ),
+    ]
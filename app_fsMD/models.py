@@ -1,9 +1,11 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from decimal import Decimal
 from django.core.validators import MinValueValidator
 from django.utils.text import slugify
 from django.utils import timezone
-from .utils.images import convert_imagefield_to_webp
+from .utils.images import convert_imagefield_to_webp, validate_image_upload
 
 
 def category_image_upload_to(instance, filename: str) -> str:
@@ -21,6 +23,22 @@ def product_sub_image_upload_to(instance, filename: str) -> str:
     return f"products/{safe_slug}/{filename}"
 
 
+class CategoryQuerySet(models.QuerySet):
+    def refresh_active_product_counts(self) -> int:
+        """
+        Recompute `active_product_count` for the categories in this queryset with a single
+        UPDATE ... SET = (SELECT COUNT(*) ...) using the product.category_id index.
+        """
+        active = (
+            Product.objects.filter(category=OuterRef("pk"), is_active=True)
+            .order_by()
+            .values("category")
+            .annotate(c=Count("pk"))
+            .values("c")
+        )
+        return self.update(active_product_count=Coalesce(Subquery(active), 0))
+
+
 class Category(models.Model):
     class Kind(models.TextChoices):
         PROGRAM = "program", "Program"
@@ -40,10 +58,22 @@ class Category(models.Model):
     short_description = models.TextField(blank=True)
     long_description = models.TextField(blank=True)
 
-    image = models.ImageField(upload_to=category_image_upload_to, blank=True, null=True, max_length=255)
+    image = models.ImageField(
+        upload_to=category_image_upload_to,
+        blank=True,
+        null=True,
+        max_length=255,
+        validators=[validate_image_upload],
+    )
     sort_order = models.PositiveIntegerField(default=0)
     is_active = models.BooleanField(default=True)
 
+    # Denormalised count of active products, kept in sync by signals and ProductQuerySet.
+    # `manage.py reconcile_category_counts` repairs any drift.
+    active_product_count = models.PositiveIntegerField(default=0, editable=False)
+
+    objects = CategoryQuerySet.as_manager()
+
     class Meta:
         ordering = ["sort_order", "name"]
 
@@ -77,6 +107,36 @@ class CategoryBullet(models.Model):
         return f"{self.category.name} • {self.text[:40]}"
 
 
+class ProductQuerySet(models.QuerySet):
+    """
+    Bulk writes skip post_save/post_delete, so the ones that can move products between
+    categories or (de)activate them refresh the affected category counts themselves.
+    """
+
+    COUNT_FIELDS = {"is_active", "category", "category_id"}
+
+    def update(self, **kwargs):
+        if not self.COUNT_FIELDS & kwargs.keys():
+            return super().update(**kwargs)
+
+        with transaction.atomic(using=self.db):
+            category_ids = set(self.order_by().values_list("category_id", flat=True).distinct())
+            rows = super().update(**kwargs)
+            new_category = kwargs.get("category", kwargs.get("category_id"))
+            if new_category is not None:
+                category_ids.add(getattr(new_category, "pk", new_category))
+            Category.objects.filter(pk__in=category_ids).refresh_active_product_counts()
+        return rows
+
+    def bulk_create(self, objs, *args, **kwargs):
+        with transaction.atomic(using=self.db):
+            created = super().bulk_create(objs, *args, **kwargs)
+            Category.objects.filter(
+                pk__in={o.category_id for o in created}
+            ).refresh_active_product_counts()
+        return created
+
+
 class Product(models.Model):
     class DiscountType(models.TextChoices):
         NONE = "none", "None"
@@ -100,6 +160,7 @@ class Product(models.Model):
         default="products/no_image_available.png",
         blank=True,
         max_length=255,
+        validators=[validate_image_upload],
     )
 
     price = models.DecimalField(
@@ -129,6 +190,8 @@ class Product(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ProductQuerySet.as_manager()
+
     class Meta:
         ordering = ["name"]
 
@@ -170,7 +233,9 @@ class ProductImage(models.Model):
         on_delete=models.CASCADE,
         related_name="images",
     )
-    image = models.ImageField(upload_to=product_sub_image_upload_to, max_length=255)
+    image = models.ImageField(
+        upload_to=product_sub_image_upload_to, max_length=255, validators=[validate_image_upload]
+    )
     alt_text = models.CharField(max_length=200, blank=True)
     sort_order = models.PositiveIntegerField(default=0)
     is_active = models.BooleanField(default=True)
@@ -200,7 +265,9 @@ class Feedback(models.Model):
         related_name="feedbacks",
     )
     testimonial = models.TextField()
-    image = models.ImageField(upload_to="feedback_images/", max_length=255)
+    image = models.ImageField(
+        upload_to="feedback_images/", max_length=255, validators=[validate_image_upload]
+    )
     star_rating = models.PositiveIntegerField(default=5)
     is_active = models.BooleanField(default=True)
 
@@ -210,6 +277,10 @@ class Feedback(models.Model):
     class Meta:
         verbose_name = "Feedback"
         verbose_name_plural = "Feedbacks"
+        indexes = [
+            # The admin changelist's ordering (and its star_rating filter).
+            models.Index(fields=["-star_rating", "-id"], name="feedback_rating_idx"),
+        ]
 
     def save(self, *args, **kwargs):
         if not getattr(self, "_skip_webp", False):
@@ -257,6 +328,7 @@ class BlogPost(models.Model):
         upload_to=blog_image_upload_to,
         help_text="Main hero image for this blog.",
         max_length=255,
+        validators=[validate_image_upload],
     )
 
     read_time_label = models.CharField(
@@ -295,6 +367,12 @@ class BlogPost(models.Model):
 
     class Meta:
         ordering = ["sort_order", "-published_at", "-id"]
+        indexes = [
+            models.Index(fields=["sort_order", "-published_at", "-id"], name="blogpost_order_idx"),
+            # The admin's date_hierarchy reads the date range and distinct years from here
+            # rather than from the table rows, which carry the full post bodies.
+            models.Index(fields=["published_at"], name="blogpost_published_idx"),
+        ]
 
     def save(self, *args, **kwargs):
         if not self.slug:
@@ -317,5 +395,163 @@ class NewsletterSubscription(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     unsubscribed_at = models.DateTimeField(null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            # The admin changelist's ordering, so a page is an index range scan.
+            models.Index(fields=["-created_at", "-id"], name="newsletter_created_idx"),
+        ]
+
     def __str__(self):
         return self.email
+
+
+class StoredFileQuerySet(models.QuerySet):
+    def adjust(self, deltas: dict) -> None:
+        """Apply {name: +n / -n} reference changes, one UPDATE per name."""
+        now = timezone.now()
+        for name, delta in deltas.items():
+            if not name or not delta:
+                continue
+            if self.filter(name=name).update(refcount=F("refcount") + delta, updated_at=now):
+                continue
+            # First time we see this name. A negative delta means the file predates the
+            # counts; gc_media recounts it.
+            _, created = self.get_or_create(name=name, defaults={"refcount": max(delta, 0)})
+            if not created:
+                self.filter(name=name).update(refcount=F("refcount") + delta, updated_at=now)
+
+    def set_counts(self, counts: dict) -> None:
+        """
+        Overwrite {name: refcount} with recounted values; call with the rows locked. A
+        correction isn't a use, so updated_at (what gc_media's grace period reads) stays.
+        """
+        for name, count in counts.items():
+            if not self.filter(name=name).update(refcount=count):
+                self.get_or_create(name=name, defaults={"refcount": count})
+
+
+class StoredFile(models.Model):
+    """
+    Number of ImageField values pointing at each media file. Content-addressed files
+    are shared between rows, so a file is only freed when its count reaches zero; the
+    counts are kept by signals and `manage.py gc_media` reconciles them and deletes the
+    orphans.
+    """
+
+    name = models.CharField(max_length=255, unique=True)
+    refcount = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = StoredFileQuerySet.as_manager()
+
+    def __str__(self):
+        return f"{self.name} ({self.refcount})"
+
+
+class SearchDocument(models.Model):
+    """
+    Searchable text of one active product or blog post, kept in step with its source
+    row by signals (signals.py). Indexed by SQLite FTS5 or a Postgres GIN expression
+    index, both created in migration 0016; queries live in search.py.
+    """
+
+    class Kind(models.TextChoices):
+        PRODUCT = "product", "Product"
+        POST = "post", "Blog post"
+
+    kind = models.CharField(max_length=10, choices=Kind.choices)
+    object_id = models.PositiveBigIntegerField()
+    title = models.CharField(max_length=255)
+    subtitle = models.CharField(max_length=255, blank=True)
+    url = models.CharField(max_length=255)
+    body = models.TextField(blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["kind", "object_id"], name="uniq_search_document"),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()}: {self.title}"
+
+
+class RelatedProducts(models.Model):
+    """
+    Precomputed "related products" of one product: its best neighbours by category, text
+    similarity and cart co-occurrence, as packed little-endian uint32 ids in rank order.
+    Written by related.py (`manage.py build_related`, and after product saves).
+    """
+
+    product = models.OneToOneField(
+        Product,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="related",
+    )
+    neighbours = models.BinaryField(default=bytes)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = "related products"
+
+    def __str__(self):
+        return f"Related to {self.product_id}"
+
+
+class CartEvent(models.Model):
+    """
+    Append-only log of cart changes, buffered in memory and written in batches by
+    cart_events.py, never inside the request. `basket` is a random id kept in the
+    session; product_id is deliberately not a foreign key, so inserts stay cheap and the
+    log outlives deleted products.
+    """
+
+    class Action(models.IntegerChoices):
+        ADD = 1, "Add"
+        SET = 2, "Set quantity"
+        REMOVE = 3, "Remove"
+
+    basket = models.BigIntegerField()
+    product_id = models.PositiveBigIntegerField()
+    action = models.PositiveSmallIntegerField(choices=Action.choices)
+    qty = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["basket", "product_id"], name="cartevent_basket_product"),
+        ]
+
+    def __str__(self):
+        return f"{self.get_action_display()} {self.product_id} ({self.basket})"
+
+
+class ProductPair(models.Model):
+    """
+    Carts in which both products were added (product_a < product_b), counted by
+    `manage.py aggregate_cart_events`. A row with product_a == product_b counts the carts
+    that held that product at all.
+    """
+
+    product_a = models.PositiveBigIntegerField()
+    product_b = models.PositiveBigIntegerField()
+    carts = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["product_a", "product_b"], name="uniq_product_pair"),
+        ]
+
+    def __str__(self):
+        return f"{self.product_a} + {self.product_b}: {self.carts}"
+
+
+class AggregationCursor(models.Model):
+    """How far a batch job has read an append-only table (last processed id)."""
+
+    name = models.CharField(max_length=60, unique=True)
+    last_id = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} @ {self.last_id}"
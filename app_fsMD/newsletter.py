@@ -0,0 +1,141 @@
+"""
+Newsletter sign-ups without a write per request.
+
+`subscribe()` normalises and validates the address, rate-limits by client IP and drops
+addresses already stored recently (a cache marker per address). The rate counters live
+in the "ratelimit" cache alias, whose incr is atomic: per worker process by default, so
+the effective limit is RATE_LIMIT per worker, or shared through Redis when configured. Anything left is
+handed to a BufferedWriter, whose thread upserts the batch with one
+bulk_create(update_conflicts=True), reactivating unsubscribed addresses. `asubscribe()`
+is the same for async views; `manage.py import_newsletter` loads large lists in bulk.
+`unsubscribe()` deactivates addresses and clears their markers, so signing up again
+right after reaches the database.
+"""
+import hashlib
+
+from django.core.cache import cache, caches
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.utils import timezone
+
+from .models import NewsletterSubscription
+from .utils.buffers import BufferedWriter
+
+MAX_EMAIL_LENGTH = 254
+
+RATE_LIMIT = 5
+RATE_WINDOW = 10 * 60
+# How long a stored address is answered from the cache marker alone.
+SEEN_TTL = 24 * 60 * 60
+
+FLUSH_SIZE = 100
+FLUSH_SECONDS = 2.0
+
+# subscribe() results
+OK = "ok"
+INVALID = "invalid"
+LIMITED = "limited"
+
+
+def normalize_email(value) -> str:
+    """'  Jane.Doe@Example.COM ' -> 'jane.doe@example.com', or '' if it isn't a valid address."""
+    email = (value or "").strip().strip("<>").strip().lower()
+    if not email or len(email) > MAX_EMAIL_LENGTH:
+        return ""
+    try:
+        validate_email(email)
+    except ValidationError:
+        return ""
+    return email
+
+
+def _seen_key(email: str) -> str:
+    return "newsletter:seen:" + hashlib.sha1(email.encode()).hexdigest()
+
+
+def _rate_key(ip: str) -> str:
+    window = int(timezone.now().timestamp()) // RATE_WINDOW
+    return f"newsletter:rate:{ip}:{window}"
+
+
+def upsert_subscriptions(emails, *, reactivate: bool = True, batch_size: int = 1000) -> int:
+    """
+    Insert these (normalised, distinct) addresses. With reactivate, existing rows are set
+    active again; without, existing rows are left exactly as they are.
+    """
+    rows = [NewsletterSubscription(email=email, is_active=True, unsubscribed_at=None) for email in emails]
+    if reactivate:
+        NewsletterSubscription.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=["email"],
+            update_fields=["is_active", "unsubscribed_at"],
+            batch_size=batch_size,
+        )
+    else:
+        NewsletterSubscription.objects.bulk_create(rows, ignore_conflicts=True, batch_size=batch_size)
+    return len(rows)
+
+
+def _write(emails) -> None:
+    emails = list(dict.fromkeys(emails))
+    upsert_subscriptions(emails)
+    cache.set_many({_seen_key(email): 1 for email in emails}, SEEN_TTL)
+
+
+_buffer = BufferedWriter("newsletter", _write, flush_size=FLUSH_SIZE, flush_seconds=FLUSH_SECONDS)
+
+
+def subscribe(raw_email, ip: str) -> str:
+    email = normalize_email(raw_email)
+    if not email:
+        return INVALID
+
+    key, counters = _rate_key(ip), caches["ratelimit"]
+    counters.add(key, 0, RATE_WINDOW)
+    try:
+        if counters.incr(key) > RATE_LIMIT:
+            return LIMITED
+    except ValueError:  # evicted between add and incr
+        pass
+
+    if cache.get(_seen_key(email)) is None:
+        _buffer.append(email)
+    return OK
+
+
+async def asubscribe(raw_email, ip: str) -> str:
+    email = normalize_email(raw_email)
+    if not email:
+        return INVALID
+
+    key, counters = _rate_key(ip), caches["ratelimit"]
+    await counters.aadd(key, 0, RATE_WINDOW)
+    try:
+        if await counters.aincr(key) > RATE_LIMIT:
+            return LIMITED
+    except ValueError:
+        pass
+
+    if await cache.aget(_seen_key(email)) is None:
+        _buffer.append(email)  # a lock and a list append; nothing to await
+    return OK
+
+
+def forget(emails) -> None:
+    """Drop the stored-recently markers: the next sign-up of these addresses is written."""
+    cache.delete_many([_seen_key(email) for email in emails])
+
+
+def unsubscribe(emails) -> int:
+    """Deactivate these (normalised) addresses; returns the number of rows changed."""
+    emails = list(emails)
+    rows = NewsletterSubscription.objects.filter(email__in=emails, is_active=True).update(
+        is_active=False, unsubscribed_at=timezone.now()
+    )
+    forget(emails)
+    return rows
+
+
+def flush_subscriptions() -> int:
+    return _buffer.flush()
@@ -0,0 +1,42 @@
+"""
+Changelist paginator for tables too big to COUNT(*) on every page view.
+
+Without filters the count comes from table statistics: Postgres's row estimate from
+pg_class (kept by ANALYZE / autovacuum), or MAX(rowid) on SQLite, which overcounts
+only by deleted rows. With filters or a search, the count stops at COUNT_CAP rows.
+Small tables are always counted exactly.
+"""
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+EXACT_BELOW = 10_000
+COUNT_CAP = 100_000
+
+
+def estimate_rows(model, using: str = "default"):
+    """Approximate row count of the model's table, or None if the backend can't tell."""
+    connection = connections[using]
+    table = connection.ops.quote_name(model._meta.db_table)
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass", [table])
+            row = cursor.fetchone()
+            # -1 until the table has been vacuumed or analyzed once.
+            return row[0] if row and row[0] >= 0 else None
+        if connection.vendor == "sqlite" and model._meta.pk.get_internal_type() in ("AutoField", "BigAutoField"):
+            cursor.execute(f"SELECT MAX(rowid) FROM {table}")
+            return cursor.fetchone()[0] or 0
+    return None
+
+
+class EstimatedCountPaginator(Paginator):
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        estimate = estimate_rows(queryset.model, queryset.db)
+        if estimate is None or estimate < EXACT_BELOW:
+            return super().count
+        if not queryset.query.where:
+            return estimate
+        return queryset.order_by()[:COUNT_CAP].count()
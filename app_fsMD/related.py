@@ -0,0 +1,287 @@
+"""
+Precomputed related products.
+
+For every active product, the TOP_K best neighbours by a weighted score: same category,
+text similarity (TF-IDF cosine over name and short details) and how often the two were
+in the same cart (ProductPair counts, see cart_events.py). `rebuild_related()` computes
+the whole table (manage.py build_related). A product save queues the products and
+categories it touched after commit; a BufferedWriter thread recomputes only the rows
+they can change, a batch of saves at a time, outside the request. Rows are packed
+uint32 ids, and product pages read them from a dict loaded once per `related_v` in each
+process, so serving is one dict lookup.
+"""
+import heapq
+import math
+import re
+import struct
+import threading
+from collections import Counter, defaultdict
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.html import strip_tags
+
+from .cart_events import pair_scores
+from .catalog import get_catalog
+from .models import RelatedProducts
+from .utils.buffers import BufferedWriter
+
+TOP_K = 12
+
+# Queued saves are recomputed together: one engine build per batch, not per save.
+FLUSH_SIZE = 200
+FLUSH_SECONDS = 5.0
+
+WEIGHT_CATEGORY = 1.0
+WEIGHT_TEXT = 2.0
+WEIGHT_CART = 3.0
+
+# Terms in more products than this link nearly everything to everything; they are
+# left out of the postings (they would dominate the cost, not the ranking).
+MAX_POSTINGS = 300
+_WORD = re.compile(r"[a-z0-9]{3,}")
+STOP_WORDS = frozenset(
+    "and are but can for from has have into its may not our that the their this was were "
+    "will with you your per all any more most other some such than then these those"
+    .split()
+)
+
+
+def related_version() -> int:
+    return cache.get_or_set("related_v", 1, None)
+
+
+def _bump_version() -> int:
+    try:
+        return cache.incr("related_v")
+    except ValueError:
+        cache.set("related_v", 2, None)
+        return 2
+
+
+def pack(ids) -> bytes:
+    return struct.pack(f"<{len(ids)}I", *ids)
+
+
+def unpack(data) -> tuple:
+    data = bytes(data)
+    return struct.unpack(f"<{len(data) // 4}I", data)
+
+
+# Inputs -------------------------------------------------------------------------------
+
+def _terms(product) -> Counter:
+    text = f"{product.name} {product.name} {strip_tags(product.short_details)}".lower()
+    return Counter(w for w in _WORD.findall(text) if w not in STOP_WORDS)
+
+
+# Scoring ------------------------------------------------------------------------------
+
+class RelatedEngine:
+    """Scores neighbours for any product of one catalog; build once, query many."""
+
+    def __init__(self, products, cart_scores=None):
+        self.products = {p.id: p for p in products}
+        self.cart_scores = cart_scores or {}
+
+        self.by_category = defaultdict(list)
+        for p in products:
+            self.by_category[p.category_id].append(p.id)
+
+        terms = {p.id: _terms(p) for p in products}
+        df = Counter()
+        for counts in terms.values():
+            df.update(counts.keys())
+        n = max(1, len(products))
+
+        self.vectors = {}
+        self.postings = defaultdict(list)
+        for pid, counts in terms.items():
+            vector = {t: (1 + math.log(c)) * math.log(n / df[t]) for t, c in counts.items()}
+            norm = math.sqrt(sum(w * w for w in vector.values())) or 1.0
+            vector = {t: w / norm for t, w in vector.items() if w > 0 and df[t] <= MAX_POSTINGS}
+            self.vectors[pid] = vector
+            for t, w in vector.items():
+                self.postings[t].append((pid, w))
+
+    def neighbours(self, product_id: int, k: int = TOP_K) -> list:
+        product = self.products[product_id]
+        scores = defaultdict(float)
+        for term, weight in self.vectors.get(product_id, {}).items():
+            for other, other_weight in self.postings[term]:
+                scores[other] += WEIGHT_TEXT * weight * other_weight
+        for other, score in self.cart_scores.get(product_id, {}).items():
+            if other in self.products:
+                scores[other] += WEIGHT_CART * score
+        scores.pop(product_id, None)
+
+        for other in scores:
+            if self.products[other].category_id == product.category_id:
+                scores[other] += WEIGHT_CATEGORY
+        ranked = heapq.nlargest(k, scores.items(), key=lambda item: (item[1], -item[0]))
+
+        # Same-category products with no other signal all score WEIGHT_CATEGORY; take them
+        # in catalog order for whatever is left, ahead of weaker cross-category matches.
+        fill = []
+        for other in self.by_category[product.category_id]:
+            if len(fill) == k:
+                break
+            if other != product_id and other not in scores:
+                fill.append((other, WEIGHT_CATEGORY))
+        ranked = heapq.nlargest(k, ranked + fill, key=lambda item: item[1])
+        return [other for other, _ in ranked]
+
+
+def _engine(catalog) -> RelatedEngine:
+    return RelatedEngine(catalog.products, pair_scores())
+
+
+def _store(engine, product_ids) -> dict:
+    rows = {pid: tuple(engine.neighbours(pid)) for pid in product_ids}
+    RelatedProducts.objects.bulk_create(
+        [RelatedProducts(product_id=pid, neighbours=pack(ids)) for pid, ids in rows.items()],
+        update_conflicts=True,
+        unique_fields=["product"],
+        update_fields=["neighbours", "updated_at"],
+        batch_size=500,
+    )
+    return rows
+
+
+def rebuild_related() -> int:
+    """Recompute every row from the active catalog and the cart pair counts; returns rows written."""
+    engine = _engine(get_catalog())
+    with transaction.atomic():
+        written = len(_store(engine, list(engine.products)))
+        RelatedProducts.objects.exclude(product__is_active=True, product__category__is_active=True).delete()
+    _bump_version()
+    return written
+
+
+def update_related(product_ids, category_ids=()) -> int:
+    """
+    Recompute the rows a change to these products can affect: their own, those of every
+    product in the given categories, and those that list one of them (found through
+    listed_by(), not a scan of the table). Text and cart scores for unrelated pairs only
+    shift through IDF and are left to the next rebuild.
+    """
+    catalog = get_catalog()
+    engine = _engine(catalog)
+    changed = set(product_ids)
+
+    affected = set(changed)
+    for category_id in category_ids:
+        affected.update(engine.by_category.get(category_id, ()))
+    affected.update(listed_by(changed))
+    affected.intersection_update(engine.products)
+
+    removed = changed - set(engine.products)
+    with transaction.atomic():
+        rows = _store(engine, sorted(affected))
+        RelatedProducts.objects.filter(product_id__in=removed).delete()
+    _carry_over(rows, removed, _bump_version())
+    return len(rows)
+
+
+def _write_updates(batches) -> None:
+    product_ids, category_ids = set(), set()
+    for products, categories in batches:
+        product_ids.update(products)
+        category_ids.update(categories)
+    update_related(product_ids, category_ids)
+
+
+_updates = BufferedWriter("related", _write_updates, flush_size=FLUSH_SIZE, flush_seconds=FLUSH_SECONDS)
+_dirty = threading.local()
+
+
+def mark_related_dirty(product_ids=(), category_ids=()) -> None:
+    """Queue the affected rows for update once the current transaction commits."""
+    pending = getattr(_dirty, "pending", None)
+    if pending is None:
+        pending = _dirty.pending = (set(), set())
+    pending[0].update(product_ids)
+    pending[1].update(category_ids)
+    transaction.on_commit(_queue_dirty, robust=True)
+
+
+def _queue_dirty():
+    pending, _dirty.pending = getattr(_dirty, "pending", None), None
+    if pending and (pending[0] or pending[1]):
+        _updates.append(pending)
+
+
+def flush_related() -> int:
+    """Recompute the queued rows now (tests, management commands); returns batches written."""
+    return _updates.flush()
+
+
+# Serving ------------------------------------------------------------------------------
+
+_table = None
+_listing = None
+
+
+def neighbour_table() -> dict:
+    """{product_id: neighbour ids}, loaded once per `related_v` in each process."""
+    global _table
+    v = related_version()
+    table = _table
+    if table is None or table[0] != v:
+        table = _table = (v, {pid: unpack(data) for pid, data in RelatedProducts.objects.values_list("product_id", "neighbours")})
+    return table[1]
+
+
+def listed_by(product_ids) -> set:
+    """The products whose rows list any of these: the reverse of neighbour_table(), built once per table."""
+    global _listing
+    table = neighbour_table()
+    listing = _listing
+    if listing is None or listing[0] is not table:
+        index = defaultdict(set)
+        for pid, ids in table.items():
+            for other in ids:
+                index[other].add(pid)
+        listing = _listing = (table, index)
+    found = set()
+    for pid in product_ids:
+        found.update(listing[1].get(pid, ()))
+    return found
+
+
+def _carry_over(rows, removed, version) -> None:
+    """
+    Move this process's table, and its reverse index, to the version update_related() just
+    wrote by patching in the rows it changed, instead of reloading and re-indexing the
+    whole table. If another process wrote in between, the next read reloads as usual.
+    """
+    global _table, _listing
+    loaded = _table
+    if loaded is None or loaded[0] != version - 1:
+        return
+    old = loaded[1]
+    table = dict(old)
+    for pid in removed:
+        table.pop(pid, None)
+    table.update(rows)
+
+    listing = _listing
+    if listing is not None and listing[0] is old:
+        index = listing[1]
+        for pid in removed | rows.keys():
+            for other in old.get(pid, ()):
+                index[other].discard(pid)
+        for pid, ids in rows.items():
+            for other in ids:
+                index[other].add(pid)
+        _listing = (table, index)
+    _table = (version, table)
+
+
+def related_for(product, catalog, limit: int = TOP_K) -> list:
+    """Related ProductRecords for a product page; same category in name order until the table has a row."""
+    ids = neighbour_table().get(product.id)
+    if ids is None:
+        return [p for p in catalog.products_for(product.category_id) if p.id != product.id][:limit]
+    products = catalog.products_by_id
+    return [products[i] for i in ids if i in products][:limit]
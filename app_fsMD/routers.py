@@ -0,0 +1,87 @@
+from contextvars import ContextVar
+
+from django.conf import settings
+
+
+REPLICA_ALIAS = "replica"
+PRIMARY_ALIAS = "default"
+
+# Read-only catalog/blog tables that are safe to serve from a lagging replica.
+REPLICA_MODELS = {
+    "category",
+    "categorybullet",
+    "product",
+    "productimage",
+    "feedback",
+    "blogpost",
+}
+
+STICKY_COOKIE = "db_primary"
+
+_pinned = ContextVar("db_pinned_primary", default=False)
+_wrote = ContextVar("db_wrote", default=False)
+
+
+def pin_primary():
+    """Send every read for the rest of this request/context to the primary."""
+    _pinned.set(True)
+
+
+class CatalogReplicaRouter:
+    """
+    Catalog reads go to the `replica` alias, everything else (and every write) goes to
+    the primary. Once a request writes, or carries the sticky cookie set after a recent
+    write, its reads are pinned to the primary so users always see their own changes.
+    """
+
+    def db_for_read(self, model, **hints):
+        if (
+            model._meta.app_label == "app_fsMD"
+            and model._meta.model_name in REPLICA_MODELS
+            and not _pinned.get()
+            and REPLICA_ALIAS in settings.DATABASES
+        ):
+            return REPLICA_ALIAS
+        return PRIMARY_ALIAS
+
+    def db_for_write(self, model, **hints):
+        _pinned.set(True)
+        if model._meta.model_name in REPLICA_MODELS:
+            _wrote.set(True)
+        return PRIMARY_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica is a copy of the primary, so both carry the full schema.
+        return True
+
+
+class ReplicaStickinessMiddleware:
+    """
+    Scopes the router's pinning to one request and carries it over to the next few
+    requests with a short-lived cookie after a POST (admin saves, cart mutations) or
+    any write to a replicated table.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        pinned = _pinned.set(STICKY_COOKIE in request.COOKIES)
+        wrote = _wrote.set(request.method not in ("GET", "HEAD", "OPTIONS"))
+        try:
+            response = self.get_response(request)
+            if _wrote.get():
+                response.set_cookie(
+                    STICKY_COOKIE,
+                    "1",
+                    max_age=getattr(settings, "REPLICA_STICKY_SECONDS", 10),
+                    httponly=True,
+                    samesite="Lax",
+                )
+            return response
+        finally:
+            _pinned.reset(pinned)
+            _wrote.reset(wrote)
@@ -0,0 +1,251 @@
+"""
+Product and blog search over SearchDocument.
+
+Documents are one row per active product / blog post (signals.py keeps them in step).
+Matching runs in the database: an FTS5 table on SQLite, a GIN tsvector expression index
+on Postgres (migration 0016), with the last query term matched as a prefix and titles
+ranked above body text. When nothing matches and RapidFuzz is installed, each unknown
+term is replaced by the closest word from the document titles and the query is retried,
+so "semaglutid" or "tirzepatyde" still find their product.
+"""
+import re
+
+from django.core.cache import cache
+from django.db import connections, router
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.urls import reverse
+from django.utils.html import strip_tags
+
+try:
+    from rapidfuzz import fuzz, process
+except ImportError:  # typo tolerance is optional
+    process = None
+
+from .models import BlogPost, Product, SearchDocument
+
+TOKEN = re.compile(r"\w+")
+MAX_TERMS = 8
+MAX_RESULTS = 50
+FUZZY_CUTOFF = 80
+
+# Matches ranked per query (newest first). A short prefix of a common word can match most
+# of the corpus; ranking all of it is what pushes latency past a keystroke budget, and a
+# query that vague has no meaningful "best 20" anyway.
+RANK_CANDIDATES = 1000
+
+FTS_TABLE = "app_fsMD_searchdocument_fts"
+# Same expression as the index in migration 0016.
+PG_VECTOR = "(setweight(to_tsvector('simple', title), 'A') || setweight(to_tsvector('simple', body), 'B'))"
+
+
+def search_version() -> int:
+    return cache.get_or_set("search_v", 1, None)
+
+
+def _text(*parts) -> str:
+    return " ".join(" ".join(strip_tags(p).split()) for p in parts if p)
+
+
+# Indexing ---------------------------------------------------------------------------
+
+def _sync(kind: str, rows: dict, stale_ids) -> None:
+    """Upsert {object_id: fields} and drop documents for stale_ids."""
+    if rows:
+        # ON CONFLICT DO UPDATE fires the FTS table's update trigger like a plain UPDATE.
+        SearchDocument.objects.bulk_create(
+            [SearchDocument(kind=kind, object_id=object_id, **fields) for object_id, fields in rows.items()],
+            update_conflicts=True,
+            unique_fields=["kind", "object_id"],
+            update_fields=["title", "subtitle", "url", "body"],
+            batch_size=500,
+        )
+    if stale_ids:
+        SearchDocument.objects.filter(kind=kind, object_id__in=stale_ids).delete()
+
+
+def index_products(queryset) -> None:
+    """(Re)index these products; inactive ones, or ones in an inactive category, are removed."""
+    rows, stale = {}, []
+    for product in queryset.select_related("category"):
+        if not (product.is_active and product.category.is_active):
+            stale.append(product.pk)
+            continue
+        rows[product.pk] = {
+            "title": product.name,
+            "subtitle": product.category.name,
+            "url": reverse("prdct_dtls", kwargs={"slug": product.slug}),
+            "body": _text(product.short_details, product.long_details, product.category.name),
+        }
+    _sync(SearchDocument.Kind.PRODUCT, rows, stale)
+
+
+def index_posts(queryset) -> None:
+    rows, stale = {}, []
+    for post in queryset:
+        if not post.is_active:
+            stale.append(post.pk)
+            continue
+        rows[post.pk] = {
+            "title": post.title,
+            "subtitle": _text(post.excerpt)[:255],
+            "url": f"{reverse('blgs_updts')}?slug={post.slug}",
+            "body": _text(post.excerpt, post.body),
+        }
+    _sync(SearchDocument.Kind.POST, rows, stale)
+
+
+def remove_documents(kind: str, object_ids) -> None:
+    SearchDocument.objects.filter(kind=kind, object_id__in=object_ids).delete()
+
+
+def rebuild_index() -> int:
+    SearchDocument.objects.all().delete()
+    index_products(Product.objects.all())
+    index_posts(BlogPost.objects.all())
+    return SearchDocument.objects.count()
+
+
+# Querying ---------------------------------------------------------------------------
+
+def _fts_terms(terms: list) -> str:
+    """Last term as a prefix (it's what the visitor is still typing), the others exact."""
+    *done, typing = terms
+    parts = [f'"{term}"' for term in done] + [f'"{typing}"*' if len(typing) > 1 else f'"{typing}"']
+    return " ".join(parts)
+
+
+def _match(terms: list, kind: str, limit: int) -> list:
+    """
+    Titles first: a title hit ranks above any body hit and is far cheaper to rank, since
+    a short prefix can match most of the corpus' body text. Body matches only top up a
+    short result list.
+    """
+    alias = router.db_for_read(SearchDocument)
+    connection = connections[alias]
+    table = connection.ops.quote_name(SearchDocument._meta.db_table)
+    kind_sql, kind_params = ("AND d.kind = %s", [kind]) if kind else ("", [])
+
+    if connection.vendor == "sqlite":
+        ranked = (
+            f"SELECT d.id, d.kind, d.title, d.subtitle, d.url FROM ("
+            f"SELECT rowid AS id, bm25({FTS_TABLE}, 10.0, 1.0, 0.0) AS score FROM {FTS_TABLE} "
+            f"WHERE {FTS_TABLE} MATCH %s ORDER BY rowid DESC LIMIT {RANK_CANDIDATES}"
+            f") m JOIN {table} d ON d.id = m.id ORDER BY m.score LIMIT %s"
+        )
+        # bm25 first counts every document holding each term, which for common body words
+        # costs more than the rest of the query; body-only hits are listed newest first.
+        newest = (
+            f"SELECT d.id, d.kind, d.title, d.subtitle, d.url FROM {FTS_TABLE} "
+            f"JOIN {table} d ON d.id = {FTS_TABLE}.rowid "
+            f"WHERE {FTS_TABLE} MATCH %s ORDER BY {FTS_TABLE}.rowid DESC LIMIT %s"
+        )
+        expr = _fts_terms(terms)
+        kind_expr = f' AND kind : "{kind}"' if kind else ""
+        phases = [
+            (ranked, [f"{{title}} : ({expr}){kind_expr}", limit]),
+            (newest, [f"{{title body}} : ({expr}){kind_expr}", limit * 2]),
+        ]
+    elif connection.vendor == "postgresql":
+        *done, typing = terms
+        tsquery = " & ".join([*done, f"{typing}:*"])
+        sql = (
+            f"SELECT d.id, d.kind, d.title, d.subtitle, d.url FROM {table} d, to_tsquery('simple', %s) q "
+            f"WHERE {PG_VECTOR} @@ q {kind_sql} ORDER BY ts_rank({PG_VECTOR}, q) DESC LIMIT %s"
+        )
+        phases = [(sql, [tsquery, *kind_params, limit])]
+    else:
+        queryset = SearchDocument.objects.using(alias)
+        for term in terms:
+            queryset = queryset.filter(Q(title__icontains=term) | Q(body__icontains=term))
+        if kind:
+            queryset = queryset.filter(kind=kind)
+        return list(queryset.only("kind", "title", "subtitle", "url")[:limit])
+
+    docs, seen = [], set()
+    for sql, params in phases:
+        for doc in SearchDocument.objects.raw(sql, params, using=alias):
+            if doc.pk not in seen:
+                seen.add(doc.pk)
+                docs.append(doc)
+        if len(docs) >= limit:
+            break
+    return docs[:limit]
+
+
+def matching_documents(query: str, kind: str):
+    """
+    object_ids of the `kind` documents holding every term of the query (the last as a
+    prefix), as a subquery for `pk__in`, so the admin can search body text through the
+    same index instead of an icontains scan. None if the query has no terms.
+    """
+    terms = TOKEN.findall(query.lower())[:MAX_TERMS]
+    if not terms:
+        return None
+    connection = connections[router.db_for_read(SearchDocument)]
+    table = connection.ops.quote_name(SearchDocument._meta.db_table)
+    if connection.vendor == "sqlite":
+        return RawSQL(
+            f"SELECT d.object_id FROM {FTS_TABLE} JOIN {table} d ON d.id = {FTS_TABLE}.rowid "
+            f"WHERE {FTS_TABLE} MATCH %s",
+            [f'{{title body}} : ({_fts_terms(terms)}) AND kind : "{kind}"'],
+        )
+    if connection.vendor == "postgresql":
+        *done, typing = terms
+        return RawSQL(
+            f"SELECT object_id FROM {table} WHERE kind = %s AND {PG_VECTOR} @@ to_tsquery('simple', %s)",
+            [kind, " & ".join([*done, f"{typing}:*"])],
+        )
+    queryset = SearchDocument.objects.filter(kind=kind)
+    for term in terms:
+        queryset = queryset.filter(Q(title__icontains=term) | Q(body__icontains=term))
+    return queryset.values("object_id")
+
+
+_vocabulary = (None, (), frozenset())
+
+
+def vocabulary():
+    """Distinct title words (3+ letters), rebuilt once per `search_v` in each process."""
+    global _vocabulary
+    v = search_version()
+    if _vocabulary[0] != v:
+        words = set()
+        for title, subtitle in SearchDocument.objects.values_list("title", "subtitle").iterator():
+            words.update(w for w in TOKEN.findall(f"{title} {subtitle}".lower()) if len(w) > 2)
+        _vocabulary = (v, tuple(sorted(words)), frozenset(words))
+    return _vocabulary[1], _vocabulary[2]
+
+
+def correct_terms(terms: list) -> list:
+    if process is None:
+        return terms
+    words, known = vocabulary()
+    corrected = []
+    for term in terms:
+        if len(term) > 2 and term not in known:
+            match = process.extractOne(term, words, scorer=fuzz.ratio, score_cutoff=FUZZY_CUTOFF)
+            if match:
+                term = match[0]
+        corrected.append(term)
+    return corrected
+
+
+def search(query: str, kind: str = "", limit: int = 20) -> dict:
+    terms = TOKEN.findall(query.lower())[:MAX_TERMS]
+    limit = max(1, min(limit, MAX_RESULTS))
+    if not terms:
+        return {"results": [], "corrected": None}
+
+    docs, corrected = _match(terms, kind, limit), None
+    if not docs:
+        fixed = correct_terms(terms)
+        if fixed != terms:
+            docs, corrected = _match(fixed, kind, limit), " ".join(fixed)
+
+    return {
+        "results": [
+            {"kind": d.kind, "title": d.title, "subtitle": d.subtitle, "url": d.url} for d in docs
+        ],
+        "corrected": corrected,
+    }
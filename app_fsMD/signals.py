@@ -1,17 +1,219 @@
+from collections import Counter
+
 from django.core.cache import cache
-from django.db.models.signals import post_save, post_delete
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_save
+from django.db.models import FileField
 from django.dispatch import receiver
-from .models import Category, Product, ProductImage
+from .models import (
+    BlogPost, Category, Feedback, NewsletterSubscription, Product, ProductImage, SearchDocument, StoredFile,
+)
+from .newsletter import forget
+from .related import mark_related_dirty
+from .search import index_posts, index_products, remove_documents
+from .sitemaps import mark_sitemaps_dirty
 
-def bump_site_cache_version():
-    key = "site_cache_v"
+# Version bumps made by this process, by key: what tests assert on ("one site_cache_v
+# bump per admin save"); reset it with bump_counts.clear().
+bump_counts = Counter()
+
+def bump_cache_version(key: str):
+    bump_counts[key] += 1
     try:
         cache.incr(key)
     except Exception:
         cache.set(key, 2, None)
 
+def bump_site_cache_version():
+    bump_cache_version("site_cache_v")
+
+
+class _PendingBumps:
+    def __init__(self):
+        self.keys = set()
+        self.fired = False
+
+    def __call__(self):
+        self.fired = True
+        for key in sorted(self.keys):
+            bump_cache_version(key)
+
+
+def bump_on_commit(*keys, using=None):
+    """
+    Bump these cache versions when the current transaction commits, each once however
+    many writes in it ask; a rollback discards them. Outside a transaction, bump now.
+    """
+    connection = transaction.get_connection(using)
+    if not connection.in_atomic_block:
+        for key in keys:
+            bump_cache_version(key)
+        return
+    pending = getattr(connection, "_pending_bumps", None)
+    # A rolled-back transaction (or savepoint) took the callback with it, or it already ran
+    # (TestCase.captureOnCommitCallbacks runs callbacks without clearing them): start over.
+    if pending is None or pending.fired or not any(func is pending for _, func, _ in connection.run_on_commit):
+        pending = connection._pending_bumps = _PendingBumps()
+        transaction.on_commit(pending, using=using, robust=True)
+    pending.keys.update(keys)
+
+
+# Cache versions are bumped once per transaction, after it commits (bump_on_commit): an
+# admin save of a product and its image inlines, or a category delete cascading through
+# its products, is one bump rather than one per row, and a rollback is none.
+
 @receiver([post_save, post_delete], sender=Category)
 @receiver([post_save, post_delete], sender=Product)
 @receiver([post_save, post_delete], sender=ProductImage)
-def _bust_cache(sender, **kwargs):
-    bump_site_cache_version()
+def _bust_cache(sender, using=None, **kwargs):
+    bump_on_commit("site_cache_v", using=using)
+
+@receiver([post_save, post_delete], sender=Feedback)
+def _bust_feedback_cache(sender, using=None, **kwargs):
+    bump_on_commit("feedback_cache_v", using=using)
+
+@receiver([post_save, post_delete], sender=BlogPost)
+def _bust_blog_cache(sender, using=None, **kwargs):
+    bump_on_commit("blog_cache_v", using=using)
+
+
+# Sitemap shards (sitemaps.py); a category's is_active also hides its products.
+
+@receiver([post_save, post_delete], sender=Category)
+def _sitemap_categories(sender, instance, using=None, **kwargs):
+    mark_sitemaps_dirty("categories", [instance.pk], using=using)
+    mark_sitemaps_dirty("products", Product.objects.filter(category=instance).values_list("pk", flat=True), using=using)
+
+@receiver([post_save, post_delete], sender=Product)
+def _sitemap_products(sender, instance, using=None, **kwargs):
+    mark_sitemaps_dirty("products", [instance.pk], using=using)
+
+@receiver([post_save, post_delete], sender=BlogPost)
+def _sitemap_blog(sender, instance, using=None, **kwargs):
+    mark_sitemaps_dirty("blog", [instance.pk], using=using)
+
+
+# SearchDocument maintenance (search.py). Runs on the write's connection, so the index
+# commits or rolls back with it.
+
+@receiver(post_save, sender=Product)
+def _index_product(sender, instance, using=None, **kwargs):
+    index_products(Product.objects.filter(pk=instance.pk))
+    bump_on_commit("search_v", using=using)
+
+@receiver(post_save, sender=Category)
+def _index_category_products(sender, instance, using=None, **kwargs):
+    index_products(Product.objects.filter(category=instance))
+    bump_on_commit("search_v", using=using)
+
+@receiver(post_save, sender=BlogPost)
+def _index_post(sender, instance, using=None, **kwargs):
+    index_posts(BlogPost.objects.filter(pk=instance.pk))
+    bump_on_commit("search_v", using=using)
+
+@receiver(post_delete, sender=Product)
+@receiver(post_delete, sender=BlogPost)
+def _unindex(sender, instance, using=None, **kwargs):
+    kind = SearchDocument.Kind.PRODUCT if sender is Product else SearchDocument.Kind.POST
+    remove_documents(kind, [instance.pk])
+    bump_on_commit("search_v", using=using)
+
+
+# Related-product rows (related.py), recomputed after commit for what the change touches.
+# Runs after _remember_count_state, so a product's previous category is known.
+
+@receiver([post_save, post_delete], sender=Product)
+def _related_product(sender, instance, **kwargs):
+    category_ids = {instance.category_id}
+    previous = getattr(instance, "_count_state", None)
+    if previous:
+        category_ids.add(previous[0])
+    mark_related_dirty([instance.pk], category_ids)
+
+@receiver(post_save, sender=Category)
+def _related_category(sender, instance, **kwargs):
+    mark_related_dirty(Product.objects.filter(category=instance).values_list("pk", flat=True), [instance.pk])
+
+
+# An address deactivated or deleted (in the admin) loses its newsletter "seen" marker, so
+# signing up again isn't dropped as a duplicate for the rest of the marker's TTL.
+
+@receiver([post_save, post_delete], sender=NewsletterSubscription)
+def _forget_subscriber(sender, instance, signal, using=None, **kwargs):
+    if signal is post_delete or not instance.is_active:
+        transaction.on_commit(lambda: forget([instance.email]), using=using)
+
+
+# Category.active_product_count maintenance. The refresh runs on the same connection as
+# the product write, so inside the admin's atomic block it commits or rolls back with it.
+
+@receiver(pre_save, sender=Product)
+def _remember_count_state(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not {"is_active", "category"} & set(update_fields):
+        instance._count_state = None
+        return
+    row = None
+    if instance.pk:
+        row = Product.objects.filter(pk=instance.pk).values_list("category_id", "is_active").first()
+    instance._count_state = row or ()
+
+@receiver(post_save, sender=Product)
+def _refresh_count_on_save(sender, instance, created, **kwargs):
+    previous = getattr(instance, "_count_state", None)
+    if previous is None or previous == (instance.category_id, instance.is_active):
+        return
+    category_ids = {instance.category_id}
+    if previous:
+        category_ids.add(previous[0])
+    Category.objects.filter(pk__in=category_ids).refresh_active_product_counts()
+
+@receiver(post_delete, sender=Product)
+def _refresh_count_on_delete(sender, instance, **kwargs):
+    if instance.is_active:
+        Category.objects.filter(pk=instance.category_id).refresh_active_product_counts()
+
+
+# StoredFile.refcount maintenance. Bulk queryset updates/deletes bypass these; gc_media
+# recounts from the tables before it deletes anything.
+
+FILE_MODELS = (Category, Product, ProductImage, Feedback, BlogPost)
+
+
+def file_fields(model) -> list:
+    return [f.attname for f in model._meta.concrete_fields if isinstance(f, FileField)]
+
+
+def _file_names(instance) -> list:
+    return [getattr(instance, name).name or "" for name in file_fields(type(instance))]
+
+
+def _remember_files(sender, instance, update_fields=None, **kwargs):
+    fields = file_fields(sender)
+    if update_fields is not None and not set(fields) & set(update_fields):
+        instance._stored_files = None
+        return
+    row = None
+    if instance.pk:
+        row = sender._base_manager.filter(pk=instance.pk).values_list(*fields).first()
+    instance._stored_files = row or ()
+
+
+def _count_files_on_save(sender, instance, **kwargs):
+    previous = getattr(instance, "_stored_files", None)
+    if previous is None:
+        return
+    deltas = Counter(_file_names(instance))
+    deltas.subtract(Counter(name or "" for name in previous))
+    StoredFile.objects.adjust(deltas)
+
+
+def _count_files_on_delete(sender, instance, **kwargs):
+    deltas = Counter()
+    deltas.subtract(Counter(_file_names(instance)))
+    StoredFile.objects.adjust(deltas)
+
+
+for _model in FILE_MODELS:
+    pre_save.connect(_remember_files, sender=_model)
+    post_save.connect(_count_files_on_save, sender=_model)
+    post_delete.connect(_count_files_on_delete, sender=_model)
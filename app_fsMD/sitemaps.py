@@ -1,6 +1,47 @@
+"""
+Sitemaps, written ahead of time instead of rendered per crawler hit.
+
+Each section below is rendered into gzipped shards (`sitemap-<section>-<page>.xml.gz`)
+plus a sitemap index, all under SITEMAP_DIR. A shard holds a fixed pk range of
+SHARD_MAX_URLS ids, so a row only ever appears in one shard and a change to it touches
+that shard alone. Saving or deleting a category, product or blog post marks its shard
+dirty (signals.py); once the transaction commits the shards are queued to a
+BufferedWriter, whose thread re-renders them and the index outside the request. Builds
+take a file lock in SITEMAP_DIR, so workers updating different sections don't lose each
+other's manifest entries. The views in views.py only stat and read these files,
+answering conditional requests from the file's mtime.
+
+`manage.py build_sitemaps` rebuilds everything (deploys, bulk imports).
+"""
+import fcntl
+import gzip
+import json
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
 from django.contrib.sitemaps import Sitemap
+from django.contrib.sitemaps.views import SitemapIndexItem
+from django.contrib.sites.models import Site
+from django.db import transaction
+from django.db.models import Max
+from django.template.loader import render_to_string
 from django.urls import reverse
+from django.utils.dateparse import parse_datetime
+
 from .models import Category, Product, BlogPost
+from .utils.buffers import BufferedWriter
+
+SHARD_MAX_URLS = 50_000
+INDEX_NAME = "sitemap.xml.gz"
+MANIFEST_NAME = "sitemaps.json"
+LOCK_NAME = ".build.lock"
+
+FLUSH_SIZE = 500
+FLUSH_SECONDS = 2.0
+
 
 class StaticViewSitemap(Sitemap):
     priority = 0.7
@@ -31,7 +72,7 @@ class CategorySitemap(Sitemap):
     changefreq = "weekly"
 
     def items(self):
-        return Category.objects.filter(is_active=True)
+        return Category.objects.filter(is_active=True).only("slug").order_by("pk")
 
     def location(self, obj):
         return reverse("prgrm_dtls", kwargs={"slug": obj.slug})
@@ -41,7 +82,11 @@ class ProductSitemap(Sitemap):
     changefreq = "weekly"
 
     def items(self):
-        return Product.objects.filter(is_active=True, category__is_active=True)
+        return (
+            Product.objects.filter(is_active=True, category__is_active=True)
+            .only("slug", "updated_at")
+            .order_by("pk")
+        )
 
     def lastmod(self, obj):
         return obj.updated_at
@@ -54,10 +99,199 @@ class BlogSitemap(Sitemap):
     changefreq = "monthly"
 
     def items(self):
-        return BlogPost.objects.filter(is_active=True)
+        return BlogPost.objects.filter(is_active=True).only("slug", "updated_at").order_by("pk")
 
     def lastmod(self, obj):
         return obj.updated_at
 
     def location(self, obj):
-        return reverse("blgs_updts")
+        # Posts have no page of their own; the listing features the one named by ?slug=.
+        return f"{reverse('blgs_updts')}?slug={obj.slug}"
+
+
+SITEMAP_SECTIONS = {
+    "static": StaticViewSitemap,
+    "categories": CategorySitemap,
+    "products": ProductSitemap,
+    "blog": BlogSitemap,
+}
+
+
+def sitemap_path(section: str = None, page: int = None) -> Path:
+    name = f"sitemap-{section}-{page}.xml.gz" if section else INDEX_NAME
+    return Path(settings.SITEMAP_DIR) / name
+
+
+def _write(path: Path, data: bytes) -> bool:
+    """Atomic write, skipped when the bytes are unchanged so the ETag stays valid."""
+    if path.exists() and path.read_bytes() == data:
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+    return True
+
+
+def _gzip(text: str) -> bytes:
+    # mtime=0: identical XML gives identical bytes, see _write.
+    return gzip.compress(text.encode(), 9, mtime=0)
+
+
+def _manifest() -> dict:
+    path = Path(settings.SITEMAP_DIR) / MANIFEST_NAME
+    return json.loads(path.read_text()) if path.exists() else {}
+
+
+@contextmanager
+def _build_lock():
+    """One build at a time across threads and processes sharing SITEMAP_DIR."""
+    directory = Path(settings.SITEMAP_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    with open(directory / LOCK_NAME, "a") as fh:
+        fcntl.flock(fh, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fh, fcntl.LOCK_UN)
+
+
+def shard_of(pk: int) -> int:
+    return (pk - 1) // SHARD_MAX_URLS + 1
+
+
+def _last_shard(section: str) -> int:
+    if section == "static":
+        return 1
+    model = SITEMAP_SECTIONS[section]().items().model
+    top = model._default_manager.aggregate(top=Max("pk"))["top"]
+    return shard_of(top) if top else 0
+
+
+def _render_shard(section: str, page: int, site):
+    """
+    Write one shard; returns (True, lastmod ISO string or None), or (False, None) when
+    no listed row falls in its pk range any more and its file was removed.
+    """
+    sitemap = SITEMAP_SECTIONS[section]()
+    sitemap.limit = SHARD_MAX_URLS
+    if section != "static":
+        items, first = sitemap.items(), (page - 1) * SHARD_MAX_URLS + 1
+        sitemap.items = lambda: items.filter(pk__gte=first, pk__lt=first + SHARD_MAX_URLS)
+    urls = sitemap.get_urls(page=1, site=site, protocol=settings.SITEMAP_PROTOCOL)
+    if not urls:
+        sitemap_path(section, page).unlink(missing_ok=True)
+        return False, None
+    _write(sitemap_path(section, page), _gzip(render_to_string("sitemap.xml", {"urlset": urls})))
+    lastmod = max((url["lastmod"] for url in urls if url.get("lastmod")), default=None)
+    return True, lastmod.isoformat() if lastmod else None
+
+
+def build_section(section: str, pages=None, shards=None) -> list:
+    """
+    Render the given shard pages of one section (all of them by default) over the
+    section's current [[page, lastmod], ...] list; returns the updated list.
+    """
+    site = Site.objects.get_current()
+    if pages is None:
+        pages, shards = range(1, _last_shard(section) + 1), {}
+    else:
+        shards = {page: lastmod for page, lastmod in shards or []}
+
+    for page in sorted(pages):
+        present, lastmod = _render_shard(section, page, site)
+        if present:
+            shards[page] = lastmod
+        else:
+            shards.pop(page, None)
+
+    # Drop shard files the list no longer names (a full rebuild after deletes).
+    for stale in Path(settings.SITEMAP_DIR).glob(f"sitemap-{section}-*.xml.gz"):
+        if int(stale.name.rsplit("-", 1)[1].split(".")[0]) not in shards:
+            stale.unlink(missing_ok=True)
+    return sorted([page, lastmod] for page, lastmod in shards.items())
+
+
+def update_sitemaps(changes: dict) -> dict:
+    """
+    Apply {section: shard pages, or None for the whole section}, then rewrite the index
+    and the manifest; all under the build lock. Returns the manifest.
+    """
+    with _build_lock():
+        manifest = _manifest()
+        for section, pages in changes.items():
+            manifest[section] = build_section(section, pages, manifest.get(section))
+
+        site = Site.objects.get_current()
+        items = [
+            SitemapIndexItem(
+                f"{settings.SITEMAP_PROTOCOL}://{site.domain}{reverse('sitemap_shard', args=[section, page])}",
+                parse_datetime(lastmod) if lastmod else None,
+            )
+            for section in SITEMAP_SECTIONS
+            for page, lastmod in manifest.get(section, [])
+        ]
+        _write(sitemap_path(), _gzip(render_to_string("sitemap_index.xml", {"sitemaps": items})))
+        _write(Path(settings.SITEMAP_DIR) / MANIFEST_NAME, json.dumps(manifest, indent=1).encode())
+    return manifest
+
+
+def build_sitemaps(sections=None) -> dict:
+    """Rebuild the given sections (all by default) and the index."""
+    return update_sitemaps({section: None for section in sections or SITEMAP_SECTIONS})
+
+
+def _write_changes(rows) -> None:
+    changes = {}
+    for section, pages in rows:
+        if pages is None or changes.get(section, ()) is None:
+            changes[section] = None
+        else:
+            changes.setdefault(section, set()).update(pages)
+    update_sitemaps(changes)
+
+
+_queue = BufferedWriter("sitemaps", _write_changes, flush_size=FLUSH_SIZE, flush_seconds=FLUSH_SECONDS)
+
+
+class _PendingShards:
+    """The shards one transaction made dirty, queued once when it commits."""
+
+    def __init__(self):
+        self.changes = {}
+        self.fired = False
+
+    def add(self, section, object_ids) -> None:
+        if object_ids is None:
+            self.changes[section] = None
+        elif self.changes.get(section, ()) is not None:
+            self.changes.setdefault(section, set()).update(shard_of(pk) for pk in object_ids)
+
+    def __call__(self):
+        self.fired = True
+        for section, pages in self.changes.items():
+            if pages is None or pages:
+                _queue.append((section, pages))
+
+
+def mark_sitemaps_dirty(section: str, object_ids=None, using=None) -> None:
+    """
+    Queue the shards holding these rows (the whole section if None) for a rebuild when
+    the current transaction commits; one callback per transaction, like bump_on_commit.
+    """
+    connection = transaction.get_connection(using)
+    if not connection.in_atomic_block:
+        pending = _PendingShards()
+        pending.add(section, object_ids)
+        pending()
+        return
+    pending = getattr(connection, "_pending_shards", None)
+    if pending is None or pending.fired or not any(func is pending for _, func, _ in connection.run_on_commit):
+        pending = connection._pending_shards = _PendingShards()
+        transaction.on_commit(pending, using=using, robust=True)
+    pending.add(section, object_ids)
+
+
+def flush_sitemaps() -> int:
+    """Build the queued shards now (tests, management commands)."""
+    return _queue.flush()
@@ -0,0 +1,154 @@
+/* Lazy Images */
+document.addEventListener("DOMContentLoaded", () => {
+  document.querySelectorAll("img").forEach((img) => {
+    if (img.hasAttribute("loading")) return;
+    if (img.classList.contains("no-lazy")) {
+      img.loading = "eager";
+      return;
+    }
+    img.loading = "lazy";
+    img.decoding = "async";
+  });
+});
+
+/* Scroll To Top */
+document.addEventListener("DOMContentLoaded", () => {
+  const scrollTopBtn = document.getElementById("scrollTopBtn");
+  if (!scrollTopBtn) return;
+
+  const SHOW_OFFSET = 200;
+
+  const toggleScrollTopBtn = () => {
+    if (window.scrollY > SHOW_OFFSET) scrollTopBtn.classList.add("show");
+    else scrollTopBtn.classList.remove("show");
+  };
+
+  toggleScrollTopBtn();
+  window.addEventListener("scroll", toggleScrollTopBtn);
+
+  scrollTopBtn.addEventListener("click", () => {
+    window.scrollTo({ top: 0, behavior: "smooth" });
+  });
+});
+
+/* Navbar Transparency */
+document.addEventListener("scroll", () => {
+  const navbar = document.querySelector(".navbar-fsmd");
+  if (!navbar) return;
+
+  if (window.scrollY > 1) navbar.classList.remove("transparent");
+  else navbar.classList.add("transparent");
+});
+
+/* Hero Parallax */
+document.addEventListener("DOMContentLoaded", () => {
+  const img = document.querySelector(".hero-image");
+  if (!img) return;
+
+  let lastScrollY = window.scrollY || window.pageYOffset;
+  let ticking = false;
+  const SPEED = 0.05;
+
+  const updateParallax = () => {
+    const offset = lastScrollY * SPEED;
+    img.style.transform = `translateY(${offset}px)`;
+    ticking = false;
+  };
+
+  window.addEventListener("scroll", () => {
+    lastScrollY = window.scrollY || window.pageYOffset;
+    if (!ticking) {
+      window.requestAnimationFrame(updateParallax);
+      ticking = true;
+    }
+  });
+});
+
+/* Scroll Animations */
+function initScrollAnimations() {
+  const elements = document.querySelectorAll(".scroll-animate");
+
+  if (!("IntersectionObserver" in window)) {
+    elements.forEach((el) => el.classList.add("fade-play"));
+    return;
+  }
+
+  const observer = new IntersectionObserver(
+    (entries, obs) => {
+      entries.forEach((entry) => {
+        if (entry.isIntersecting) {
+          entry.target.classList.add("fade-play");
+          obs.unobserve(entry.target);
+        }
+      });
+    },
+    { threshold: 0.2 }
+  );
+
+  elements.forEach((el) => observer.observe(el));
+}
+
+/* Global Loader */
+window.addEventListener("load", () => {
+  const loader = document.getElementById("global-loader");
+
+  setTimeout(() => {
+    if (loader) loader.classList.add("hidden");
+
+    document.querySelectorAll(".fade-blocked").forEach((el) => {
+      el.classList.remove("fade-blocked");
+    });
+
+    initScrollAnimations();
+  }, 1500);
+});
+
+/* Sidebar Panel Animations */
+document.addEventListener("DOMContentLoaded", () => {
+  const panel = document.getElementById("fsmdSidebarPanel");
+  if (!panel) return;
+
+  panel.addEventListener("shown.bs.offcanvas", () => {
+    panel.querySelectorAll(".fade-blocked").forEach((el) => el.classList.remove("fade-blocked"));
+    panel.querySelectorAll(".fade-in").forEach((el) => el.classList.add("fade-play"));
+  });
+});
+
+/* Feature Modules */
+// Loaded only when the page has something for them; specifiers resolve through the
+// import map rendered by {% js_modules %}.
+const FEATURES = [
+  [".result-slider", "fsmd/result_slider"],
+  [".program-row, #feedbackCarousel, #blogPostsDragList", "fsmd/carousels"],
+  [".product-card-wrapper, [data-title-marquee], [data-desc-toggle], .js-desc-wrap", "fsmd/products"],
+  ["#blogFilters", "fsmd/blog"],
+  ["#qtyInput, .product-thumb-btn", "fsmd/product_detail"],
+];
+
+const loadFeature = (specifier, options) =>
+  import(specifier)
+    .then((module) => module.init(options))
+    .catch((err) => console.error(`Failed to load ${specifier}`, err));
+
+let searchLoaded = null;
+const loadSearch = () => (searchLoaded ??= loadFeature("fsmd/autocomplete"));
+
+let cartLoaded = null;
+const loadCart = (options) => (cartLoaded ??= loadFeature("fsmd/cart", options));
+
+document.addEventListener("DOMContentLoaded", () => {
+  FEATURES.forEach(([selector, specifier]) => {
+    if (document.querySelector(selector)) loadFeature(specifier);
+  });
+
+  /* Search: the first time a navbar search box gets focus */
+  document.querySelectorAll("form[data-autocomplete] input").forEach((input) => {
+    input.addEventListener("focus", loadSearch, { once: true });
+  });
+
+  /* Cart: only with an add-to-cart button on the page, or once the side cart opens */
+  if (document.querySelector(".js-add-to-cart")) loadCart();
+
+  const off = document.getElementById("cartOffcanvas");
+  if (off) off.addEventListener("show.bs.offcanvas", () => loadCart({ refresh: true }), { once: true });
+});
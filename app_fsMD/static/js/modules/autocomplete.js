@@ -0,0 +1,159 @@
+/* Navbar Search Autocomplete */
+const d = document;
+
+const DEBOUNCE_MS = 60;
+const MIN_CHARS = 2;
+
+const KIND_ICONS = {
+  product: "fa-box",
+  program: "fa-layer-group",
+  post: "fa-newspaper",
+};
+
+// Normalised query -> items; suggestions only change when the catalog does, so a
+// page view never asks the server twice for the same prefix.
+const cache = new Map();
+
+const normalize = (value) => value.trim().toLowerCase().replace(/\s+/g, " ");
+
+async function fetchItems(endpoint, query) {
+  const key = normalize(query);
+  if (cache.has(key)) return cache.get(key);
+
+  const url = new URL(endpoint, window.location.origin);
+  url.searchParams.set("q", key);
+  const res = await fetch(url, { headers: { Accept: "application/json" } });
+  if (!res.ok) throw new Error(`autocomplete ${res.status}`);
+
+  const items = (await res.json()).items || [];
+  cache.set(key, items);
+  return items;
+}
+
+function setup(form) {
+  const input = form.querySelector("input[name='q']");
+  const list = form.querySelector("[role='listbox']");
+  if (!input || !list || form.dataset.autocompleteReady) return;
+  form.dataset.autocompleteReady = "1";
+
+  const endpoint = form.dataset.autocomplete;
+  let items = [];
+  let active = -1;
+  let timer = null;
+  let seq = 0;
+
+  const close = () => {
+    list.hidden = true;
+    active = -1;
+    input.setAttribute("aria-expanded", "false");
+    input.removeAttribute("aria-activedescendant");
+  };
+
+  const highlight = (index) => {
+    const options = list.querySelectorAll("[role='option']");
+    options.forEach((el, i) => el.setAttribute("aria-selected", i === index ? "true" : "false"));
+    active = index;
+    if (index >= 0 && options[index]) input.setAttribute("aria-activedescendant", options[index].id);
+    else input.removeAttribute("aria-activedescendant");
+  };
+
+  const render = () => {
+    list.replaceChildren();
+    if (!items.length) {
+      close();
+      return;
+    }
+
+    items.forEach(([label, url, kind], i) => {
+      const li = d.createElement("li");
+      li.id = `${list.id}-${i}`;
+      li.setAttribute("role", "option");
+      li.className = "navbar-search__option";
+
+      const link = d.createElement("a");
+      link.href = url;
+      link.tabIndex = -1;
+
+      const icon = d.createElement("i");
+      icon.className = `fa-solid ${KIND_ICONS[kind] || "fa-magnifying-glass"}`;
+      icon.setAttribute("aria-hidden", "true");
+
+      const text = d.createElement("span");
+      text.textContent = label;
+
+      link.append(icon, text);
+      li.append(link);
+      li.addEventListener("mousedown", (e) => e.preventDefault());
+      li.addEventListener("mouseenter", () => highlight(i));
+      list.append(li);
+    });
+
+    list.hidden = false;
+    input.setAttribute("aria-expanded", "true");
+    highlight(-1);
+  };
+
+  const update = async () => {
+    const query = input.value;
+    const current = ++seq;
+    if (normalize(query).length < MIN_CHARS) {
+      items = [];
+      render();
+      return;
+    }
+
+    try {
+      const result = await fetchItems(endpoint, query);
+      if (current !== seq) return; // a newer keystroke already answered
+      items = result;
+      render();
+    } catch (err) {
+      if (current === seq) close();
+    }
+  };
+
+  input.addEventListener("input", () => {
+    clearTimeout(timer);
+    timer = setTimeout(update, DEBOUNCE_MS);
+  });
+
+  input.addEventListener("focus", () => {
+    if (items.length) render();
+  });
+
+  input.addEventListener("keydown", (e) => {
+    if (list.hidden) {
+      if (e.key === "ArrowDown" && items.length) {
+        render();
+        e.preventDefault();
+      }
+      return;
+    }
+
+    if (e.key === "ArrowDown") {
+      highlight((active + 1) % items.length);
+      e.preventDefault();
+    } else if (e.key === "ArrowUp") {
+      highlight(active <= 0 ? items.length - 1 : active - 1);
+      e.preventDefault();
+    } else if (e.key === "Escape") {
+      close();
+      e.preventDefault();
+    }
+  });
+
+  input.addEventListener("blur", close);
+
+  form.addEventListener("submit", (e) => {
+    const chosen = items[active >= 0 ? active : 0];
+    if (!chosen || list.hidden) return;
+    e.preventDefault();
+    window.location.assign(chosen[1]);
+  });
+
+  if (input.value) update();
+}
+
+export function init() {
+  d.querySelectorAll("form[data-autocomplete]").forEach(setup);
+}
@@ -0,0 +1,155 @@
+/* Blog Filters + Featured */
+export function init() {
+  const filtersEl = document.getElementById("blogFilters");
+  const postBtns = Array.from(document.querySelectorAll(".blog-post-btn"));
+
+  const featuredImg = document.getElementById("featuredImg");
+  const featuredBadge = document.getElementById("featuredBadge");
+  const featuredDate = document.getElementById("featuredDate");
+  const featuredRead = document.getElementById("featuredRead");
+  const featuredTitle = document.getElementById("featuredTitle");
+  const featuredDesc = document.getElementById("featuredDesc");
+  const featuredBullets = document.getElementById("featuredBullets");
+
+  if (
+    !filtersEl ||
+    !postBtns.length ||
+    !featuredImg ||
+    !featuredBadge ||
+    !featuredDate ||
+    !featuredRead ||
+    !featuredTitle ||
+    !featuredDesc ||
+    !featuredBullets
+  ) {
+    return;
+  }
+
+  const filterBtns = Array.from(filtersEl.querySelectorAll("button[data-filter]"));
+
+  const setActiveCard = (btn) => {
+    postBtns.forEach((b) => {
+      b.classList.remove("is-active");
+      const card = b.querySelector(".blog-post-card");
+      if (card) {
+        card.classList.remove("border-primary", "border-2");
+        if (!card.classList.contains("border")) card.classList.add("border");
+      }
+    });
+
+    if (btn) {
+      btn.classList.add("is-active");
+      const card = btn.querySelector(".blog-post-card");
+      if (card) card.classList.add("border-primary", "border-2");
+    }
+  };
+
+  const setFeaturedFrom = (btn) => {
+    if (!btn) return;
+
+    setActiveCard(btn);
+
+    featuredImg.src = btn.dataset.img || featuredImg.src;
+    featuredImg.alt = btn.dataset.title || "Featured blog";
+
+    featuredBadge.innerHTML = btn.dataset.badge || "";
+    featuredDate.textContent = btn.dataset.date || "";
+    featuredRead.textContent = btn.dataset.read || "";
+
+    featuredTitle.textContent = btn.dataset.title || "";
+    featuredDesc.textContent = btn.dataset.desc || "";
+
+    const bullets = [btn.dataset.b1, btn.dataset.b2, btn.dataset.b3].filter(Boolean);
+    featuredBullets.innerHTML = bullets
+      .map(
+        (t) => `
+      <li class="d-flex gap-2 align-items-start">
+        <i class="fa-solid fa-circle-check text-primary-accent mt-1"></i>
+        <span class="text-body-sm">${t}</span>
+      </li>
+    `
+      )
+      .join("");
+  };
+
+  const applyFilter = (topic) => {
+    let firstVisible = null;
+
+    postBtns.forEach((btn) => {
+      const match = topic === "all" || btn.dataset.topic === topic;
+      btn.classList.toggle("d-none", !match);
+      if (match && !firstVisible) firstVisible = btn;
+    });
+
+    const active = document.querySelector(".blog-post-btn.is-active");
+    if (!active || active.classList.contains("d-none")) {
+      setFeaturedFrom(firstVisible || postBtns[0]);
+    }
+  };
+
+  postBtns.forEach((btn) => {
+    btn.addEventListener("click", () => setFeaturedFrom(btn));
+    btn.addEventListener("keydown", (e) => {
+      if (e.key === "Enter" || e.key === " ") {
+        e.preventDefault();
+        setFeaturedFrom(btn);
+      }
+    });
+  });
+
+  filtersEl.addEventListener("click", (e) => {
+    if (filtersEl.dataset.dragged === "1") return;
+
+    const btn = e.target.closest("button[data-filter]");
+    if (!btn || !filtersEl.contains(btn)) return;
+
+    filterBtns.forEach((b) => {
+      b.classList.remove("active");
+      b.setAttribute("aria-pressed", "false");
+    });
+
+    btn.classList.add("active");
+    btn.setAttribute("aria-pressed", "true");
+
+    applyFilter(btn.dataset.filter || "all");
+  });
+
+  let isDown = false;
+  let startX = 0;
+  let startLeft = 0;
+  let dragged = false;
+
+  const onDown = (e) => {
+    isDown = true;
+    dragged = false;
+    filtersEl.dataset.dragged = "0";
+    filtersEl.classList.add("is-dragging");
+    startX = e.clientX;
+    startLeft = filtersEl.scrollLeft;
+  };
+
+  const onMove = (e) => {
+    if (!isDown) return;
+    const dx = e.clientX - startX;
+    if (Math.abs(dx) > 4) {
+      dragged = true;
+      filtersEl.dataset.dragged = "1";
+    }
+    filtersEl.scrollLeft = startLeft - dx;
+  };
+
+  const onUp = () => {
+    isDown = false;
+    filtersEl.classList.remove("is-dragging");
+    if (dragged) setTimeout(() => (filtersEl.dataset.dragged = "0"), 150);
+  };
+
+  filtersEl.addEventListener("pointerdown", onDown, { passive: true });
+  window.addEventListener("pointermove", onMove, { passive: true });
+  window.addEventListener("pointerup", onUp, { passive: true });
+  window.addEventListener("pointercancel", onUp, { passive: true });
+
+  const initial = document.querySelector(".blog-post-btn.is-active") || postBtns[0];
+  setFeaturedFrom(initial);
+  applyFilter("all");
+}
@@ -0,0 +1,364 @@
+/* Programs Accordion (mobile swipe native + desktop mouse drag + click open) */
+function initProgramsAccordion() {
+  const row = document.querySelector(".program-row");
+  const items = Array.from(document.querySelectorAll(".program-item"));
+  if (!row || !items.length) return;
+
+  row.dataset.dragged = "0";
+
+  const isMobile = () => window.matchMedia("(max-width: 992px)").matches;
+
+  const updateFit = () => {
+    if (isMobile()) {
+      row.classList.remove("is-fit");
+      return;
+    }
+    row.classList.toggle("is-fit", row.scrollWidth <= row.clientWidth + 1);
+  };
+
+  const centerActiveItem = (item) => {
+    const rowRect = row.getBoundingClientRect();
+    const itemRect = item.getBoundingClientRect();
+
+    const currentScroll = row.scrollLeft;
+    const itemCenter = itemRect.left + itemRect.width / 2;
+    const rowCenter = rowRect.left + rowRect.width / 2;
+    const delta = itemCenter - rowCenter;
+    const targetScroll = currentScroll + delta;
+
+    row.scrollTo({
+      left: targetScroll,
+      behavior: "smooth"
+    });
+  };
+
+  // Center the active item vertically (for mobile)
+  const centerVerticalItem = (item) => {
+    const rowRect = row.getBoundingClientRect();
+    const itemRect = item.getBoundingClientRect();
+
+    const rowHeight = rowRect.height;
+    const itemHeight = itemRect.height;
+
+    const currentScroll = row.scrollTop;
+    const itemCenter = itemRect.top + itemHeight / 2;
+    const rowCenter = rowRect.top + rowHeight / 2;
+    const delta = itemCenter - rowCenter;
+    const targetScroll = currentScroll + delta;
+
+    row.scrollTo({
+      top: targetScroll,
+      behavior: "smooth"
+    });
+  };
+
+  // Wait for transition (flex-basis change) to finish before scrolling
+  const waitForTransition = (el, property, callback) => {
+    let done = false;
+
+    const handler = (e) => {
+      if (e.target === el && (!property || e.propertyName === property)) {
+        done = true;
+        el.removeEventListener("transitionend", handler);
+        callback();
+      }
+    };
+
+    el.addEventListener("transitionend", handler);
+
+    setTimeout(() => {
+      if (!done) {
+        el.removeEventListener("transitionend", handler);
+        callback();
+      }
+    }, 450); // slightly > your .35s CSS transition
+  };
+
+  const openItem = (item, scroll = true) => {
+    items.forEach(i => i.classList.remove("active"));
+    item.classList.add("active");
+
+    requestAnimationFrame(() => {
+      updateFit();
+
+      if (!isMobile() && scroll) {
+        // Temporarily disable smooth scroll behavior during the expansion
+        row.style.scrollBehavior = "auto"; // Disable smooth scroll
+
+        // Wait for flex-basis transition to finish, THEN center the item
+        waitForTransition(item, "flex-basis", () => {
+          // For mobile, center the item vertically
+          if (isMobile()) {
+            centerVerticalItem(item); // Scroll vertically to the center
+          } else {
+            centerActiveItem(item); // Scroll horizontally to the center
+          }
+
+          // Re-enable smooth scrolling after the scroll action
+          setTimeout(() => {
+            row.style.scrollBehavior = "smooth"; // Re-enable smooth scroll
+          }, 400); // Match this time with your transition duration
+        });
+      }
+    });
+  };
+
+  row.addEventListener("click", (e) => {
+    if (row.dataset.dragged === "1") return;
+
+    const bar = e.target.closest(".program-bar");
+    if (!bar) return;
+
+    const item = bar.closest(".program-item");
+    if (!item) return;
+
+    if (item.classList.contains("active")) {
+      if (!isMobile()) {
+        centerActiveItem(item);
+      }
+      return;
+    }
+
+    openItem(item, true);
+  });
+
+  const DRAG_THRESHOLD = 6;
+  let down = false;
+  let startX = 0;
+  let startLeft = 0;
+  let dragged = false;
+
+  const canDragDesktop = () =>
+    window.matchMedia("(hover:hover) and (pointer:fine)").matches &&
+    row.scrollWidth > row.clientWidth + 1;
+
+  const onMove = (e) => {
+    if (!down) return;
+
+    const dx = e.clientX - startX;
+
+    if (!dragged && Math.abs(dx) > DRAG_THRESHOLD) {
+      dragged = true;
+      row.classList.add("is-dragging");
+      row.classList.add("no-snap"); // Disable snapping during drag
+      document.body.style.userSelect = "none";
+    }
+
+    if (dragged) {
+      e.preventDefault();
+      row.scrollLeft = startLeft - dx;
+    }
+  };
+
+  const onUp = () => {
+    if (!down) return;
+    down = false;
+
+    window.removeEventListener("mousemove", onMove);
+    window.removeEventListener("mouseup", onUp);
+
+    document.body.style.userSelect = "";
+    row.classList.remove("is-dragging");
+    row.classList.remove("no-snap"); // Re-enable snapping after drag
+
+    if (dragged) {
+      row.dataset.dragged = "1";
+      setTimeout(() => (row.dataset.dragged = "0"), 150);
+    }
+
+    dragged = false;
+  };
+
+  row.addEventListener("mousedown", (e) => {
+    if (!canDragDesktop()) return;
+    if (e.button !== 0) return; // left mouse only
+
+    if (e.target.closest(".program-panel")) return;
+
+    down = true;
+    dragged = false;
+    startX = e.clientX;
+    startLeft = row.scrollLeft;
+
+    window.addEventListener("mousemove", onMove, { passive: false });
+    window.addEventListener("mouseup", onUp, { passive: true });
+  });
+
+  row.addEventListener("dragstart", (e) => e.preventDefault());
+
+  openItem(document.querySelector(".program-item.active") || items[0], false);
+  updateFit();
+
+  const ro = new ResizeObserver(() => {
+    updateFit();
+  });
+  ro.observe(row);
+
+  window.addEventListener(
+    "resize",
+    () => {
+      updateFit();
+    },
+    { passive: true }
+  );
+}
+
+/* Feedback Carousel */
+function initFeedbackCarousel() {
+  const carouselEl = document.getElementById("feedbackCarousel");
+  if (!carouselEl || typeof bootstrap === "undefined") return;
+
+  const carousel = bootstrap.Carousel.getOrCreateInstance(carouselEl, {
+    ride: "carousel",
+    interval: 6000,
+    touch: true,
+    wrap: true
+  });
+
+  let isDown = false;
+  let startX = 0;
+  let startY = 0;
+  const threshold = 40;   // minimum horizontal movement
+  const restraint = 80;   // ignore if too diagonal
+
+  carouselEl.addEventListener("pointerdown", (e) => {
+    isDown = true;
+    startX = e.clientX;
+    startY = e.clientY;
+  });
+
+  carouselEl.addEventListener("pointerup", (e) => {
+    if (!isDown) return;
+    isDown = false;
+
+    const dx = e.clientX - startX;
+    const dy = e.clientY - startY;
+
+    if (Math.abs(dx) >= threshold && Math.abs(dy) <= restraint) {
+      if (dx < 0) {
+        carousel.next();
+      } else {
+        carousel.prev();
+      }
+    }
+  });
+
+  carouselEl.addEventListener("pointerleave", () => {
+    isDown = false;
+  });
+
+  carouselEl.addEventListener("pointercancel", () => {
+    isDown = false;
+  });
+}
+
+/* Blog Posts Drag List */
+function initBlogPostsDragList() {
+  const list = document.getElementById("blogPostsDragList");
+  const featuredImg = document.getElementById("blogFeaturedImg");
+  const featuredLink = document.getElementById("blogFeaturedLink");
+  const featuredWrap = featuredImg ? featuredImg.closest(".blog-feature-visual") : null;
+
+  if (!list || !featuredImg || !featuredLink || !featuredWrap) return;
+
+  const prefersReduced = window.matchMedia("(prefers-reduced-motion: reduce)").matches;
+  const items = Array.from(list.querySelectorAll(".blog-post-row"));
+
+  const swapFeatured = (src, href) => {
+    if (!src) return;
+    featuredWrap.classList.add("is-swapping");
+    setTimeout(
+      () => {
+        featuredImg.src = src;
+        if (href) featuredLink.href = href;
+        featuredWrap.classList.remove("is-swapping");
+      },
+      prefersReduced ? 0 : 140
+    );
+  };
+
+  const setActive = (el) => {
+    items.forEach((i) => i.classList.remove("is-active"));
+    if (el) el.classList.add("is-active");
+  };
+
+  const first = items[0];
+  if (first) {
+    setActive(first);
+    swapFeatured(first.getAttribute("data-img"), first.getAttribute("href"));
+  }
+
+  items.forEach((item) => {
+    const img = item.getAttribute("data-img");
+    const href = item.getAttribute("href");
+
+    item.addEventListener("mouseenter", () => {
+      setActive(item);
+      swapFeatured(img, href);
+    });
+
+    item.addEventListener("focusin", () => {
+      setActive(item);
+      swapFeatured(img, href);
+    });
+
+    item.addEventListener("dragstart", (e) => e.preventDefault());
+    item.querySelectorAll("img").forEach((imgEl) =>
+      imgEl.addEventListener("dragstart", (e) => e.preventDefault())
+    );
+  });
+
+  let activePointer = null;
+  let startY = 0;
+  let startTop = 0;
+  let dragged = false;
+
+  const onDown = (e) => {
+    if (e.button !== undefined && e.button !== 0) return;
+    activePointer = e.pointerId ?? "mouse";
+    dragged = false;
+    startY = e.clientY;
+    startTop = list.scrollTop;
+    list.classList.add("is-dragging");
+    if (list.setPointerCapture && e.pointerId !== undefined) list.setPointerCapture(e.pointerId);
+    e.preventDefault();
+  };
+
+  const onMove = (e) => {
+    if (activePointer === null) return;
+    if (e.pointerId !== undefined && activePointer !== e.pointerId) return;
+
+    const dy = e.clientY - startY;
+    if (Math.abs(dy) > 3) dragged = true;
+    list.scrollTop = startTop - dy;
+  };
+
+  const onUp = (e) => {
+    if (activePointer === null) return;
+    if (e && e.pointerId !== undefined && activePointer !== e.pointerId) return;
+
+    activePointer = null;
+    list.classList.remove("is-dragging");
+  };
+
+  list.addEventListener("pointerdown", onDown, { passive: false });
+  window.addEventListener("pointermove", onMove, { passive: true });
+  window.addEventListener("pointerup", onUp, { passive: true });
+  window.addEventListener("pointercancel", onUp, { passive: true });
+
+  list.addEventListener(
+    "click",
+    (e) => {
+      if (!dragged) return;
+      e.preventDefault();
+      e.stopPropagation();
+    },
+    true
+  );
+}
+
+export function init() {
+  initProgramsAccordion();
+  initFeedbackCarousel();
+  initBlogPostsDragList();
+}
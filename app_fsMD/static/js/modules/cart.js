@@ -0,0 +1,452 @@
+/* Cart */
+const d = document;
+
+function getCookie(name) {
+  const m = d.cookie.match("(^|;)\\s*" + name + "\\s*=\\s*([^;]+)");
+  return m ? m.pop() : "";
+}
+
+let currencyFormatter = null;
+
+function makeCurrencyFormatter() {
+  const routesEl = d.getElementById("cartRoutes");
+
+  const locale = (routesEl && routesEl.dataset.locale) || navigator.language || "en-US";
+  const currency = (routesEl && routesEl.dataset.currency) || "USD";
+
+  return new Intl.NumberFormat(locale, {
+    style: "currency",
+    currency: currency,
+    minimumFractionDigits: 2,
+    maximumFractionDigits: 2
+  });
+}
+
+function toNumber(v) {
+  const s = String(v ?? "0");
+  const cleaned = s.replace(/[^0-9.\-]/g, "");
+  const n = Number(cleaned);
+  return Number.isFinite(n) ? n : 0;
+}
+
+function money(v) {
+  if (!currencyFormatter) currencyFormatter = makeCurrencyFormatter();
+  return currencyFormatter.format(toNumber(v));
+}
+
+function emptyStateHTML() {
+  return `
+    <div class="cart-empty-state text-center">
+      <div class="icon-button icon-button--gradient-border mx-auto mb-2" style="width:54px;height:54px;">
+        <i class="fa-solid fa-cart-shopping"></i>
+      </div>
+      <div class="fw-semibold">Your cart is empty</div>
+      <div class="text-body-sm text-muted">Add an item to get started.</div>
+    </div>
+  `;
+}
+
+function updateCartBadges(totalQty) {
+  const qty = parseInt(totalQty, 10) || 0;
+  d.querySelectorAll(".cart-badge").forEach((b) => {
+    b.textContent = qty;
+    if (qty > 0) b.classList.remove("is-hidden");
+    else b.classList.add("is-hidden");
+    b.classList.remove("pop");
+    void b.offsetWidth;
+    b.classList.add("pop");
+  });
+}
+
+// ✅ Cart marquee: ONLY when overflowing, and moves LEFT -> RIGHT (reverse)
+function applyCartTitleMarquee(wrap) {
+  if (!wrap) return;
+
+  const prefersReduced = window.matchMedia("(prefers-reduced-motion: reduce)").matches;
+
+  wrap.querySelectorAll(".js-cart-title").forEach((el) => {
+    const track = el.querySelector(".title-marquee-track");
+    const first = el.querySelector(".title-marquee-item");
+    if (!track || !first) return;
+
+    // reset
+    el.classList.remove("is-marquee");
+    track.style.animationDuration = "";
+    track.style.animationDirection = "";
+
+    if (prefersReduced) return;
+
+    const needs = first.scrollWidth > el.clientWidth + 2;
+    if (!needs) return;
+
+    // enable duplicate + animation
+    el.classList.add("is-marquee");
+
+    // after dup becomes visible, compute duration (slow) and reverse direction
+    requestAnimationFrame(() => {
+      const halfDistance = track.scrollWidth / 2; // because your keyframes go 0 -> -50%
+      const pxPerSec = 26; // slower = smaller number
+      let dur = halfDistance / pxPerSec;
+      dur = Math.min(45, Math.max(18, dur));
+
+      track.style.animationDuration = `${dur}s`;
+      track.style.animationDirection = "alternate";
+      track.style.animationIterationCount = "infinite";
+      track.style.animationTimingFunction = "linear";
+    });
+  });
+}
+
+/* Frequently bought together, under the side cart's items */
+let recommendationsUrl = "";
+let recommendationsKey = "";
+
+function recommendationRow(p) {
+  const row = d.createElement("article");
+  row.className = "d-flex align-items-center gap-2 bg-white rounded-4 p-2";
+
+  const thumb = d.createElement("a");
+  thumb.href = p.url;
+  thumb.className = "ratio ratio-1x1 rounded-3 overflow-hidden bg-muted flex-shrink-0";
+  thumb.style.width = "44px";
+  if (p.image) {
+    const img = d.createElement("img");
+    img.src = p.image;
+    img.alt = "";
+    img.loading = "lazy";
+    img.className = "w-100 h-100 object-fit-cover";
+    thumb.append(img);
+  }
+
+  const text = d.createElement("div");
+  text.className = "flex-grow-1 min-w-0";
+  const name = d.createElement("a");
+  name.href = p.url;
+  name.className = "d-block text-truncate fw-semibold text-body-sm text-reset text-decoration-none";
+  name.textContent = p.name;
+  const price = d.createElement("div");
+  price.className = "text-caption-sm text-muted";
+  price.textContent = money(p.final_price);
+  text.append(name, price);
+
+  const qty = d.createElement("input");
+  qty.type = "hidden";
+  qty.className = "js-qty";
+  qty.value = "1";
+
+  const add = d.createElement("button");
+  add.type = "button";
+  add.className = "icon-button js-add-to-cart flex-shrink-0";
+  add.dataset.product = p.id;
+  add.setAttribute("aria-label", `Add ${p.name} to cart`);
+  add.innerHTML = '<i class="fa-solid fa-plus" aria-hidden="true"></i>';
+
+  row.append(thumb, text, qty, add);
+  return row;
+}
+
+async function renderRecommendations(items) {
+  const box = d.getElementById("cartRecommendations");
+  const list = box && box.querySelector("[data-recommendation-list]");
+  if (!list || !recommendationsUrl) return;
+
+  const ids = (items || []).map((it) => String(it.id)).sort();
+  const key = ids.join(",");
+  if (key === recommendationsKey) return;
+  recommendationsKey = key;
+
+  if (!ids.length) {
+    box.hidden = true;
+    list.replaceChildren();
+    return;
+  }
+
+  const url = new URL(recommendationsUrl, window.location.origin);
+  ids.forEach((id) => url.searchParams.append("product", id));
+  url.searchParams.set("limit", "3");
+
+  const data = await getJSON(url).catch(() => null);
+  if (key !== recommendationsKey) return; // the cart changed while this was in flight
+
+  const recs = (data && data.items) || [];
+  list.replaceChildren(...recs.map(recommendationRow));
+  box.hidden = !recs.length;
+}
+
+function renderCart(payload) {
+  const wrap = d.getElementById("cartContent");
+  const totalEl = d.getElementById("cartTotal");
+
+  if (totalEl) totalEl.textContent = money(payload.total_price);
+  updateCartBadges(payload.total_qty);
+  renderRecommendations(payload.items);
+
+  if (!wrap) return;
+
+  if (!payload.items || !payload.items.length) {
+    wrap.innerHTML = emptyStateHTML();
+    return;
+  }
+
+  // ✅ borders/dividers look better without grid gap when multiple
+  wrap.classList.remove("gap-0", "gap-1", "gap-2", "gap-3", "gap-4", "gap-5");
+  wrap.classList.add(payload.items.length > 1 ? "gap-0" : "gap-3");
+
+  wrap.innerHTML = payload.items
+    .map((it, idx, arr) => {
+      const rx =
+        it.requires_prescription
+          ? `<span class="badge rounded-pill bg-warning-subtle text-warning-emphasis">Prescription</span>`
+          : it.requires_consultation
+          ? `<span class="badge rounded-pill bg-info-subtle text-info-emphasis">Consultation</span>`
+          : ``;
+
+      const hasDivider = arr.length > 1 && idx < arr.length - 1;
+
+      const stock = typeof it.stock === "number" && it.stock > 0 ? it.stock : 999999;
+      const decDisabled = it.qty <= 1 ? "disabled" : "";
+      const incDisabled = it.qty >= stock ? "disabled" : "";
+
+      return `
+      <div class="${hasDivider ? "border-bottom pb-3 mb-3" : ""}">
+        <div class="bg-white rounded-4 p-3">
+          <div class="d-flex gap-3 align-items-start">
+            <div class="ratio ratio-1x1 rounded-3 overflow-hidden bg-muted flex-shrink-0" style="width:64px;">
+              ${it.image ? `<img src="${it.image}" class="w-100 h-100 object-fit-cover" alt="">` : ``}
+            </div>
+
+            <div class="flex-grow-1 min-w-0">
+              <div class="d-flex align-items-start justify-content-between gap-2">
+                <div class="min-w-0 flex-grow-1">
+                  <!-- ✅ Title line: marquee only if long, stays one line -->
+                  <div class="title-marquee js-cart-title min-w-0">
+                    <div class="title-marquee-track">
+                      <span class="title-marquee-item fw-semibold">${it.name}</span>
+                      <span class="title-marquee-item title-marquee-item-dup fw-semibold" aria-hidden="true">${it.name}</span>
+                    </div>
+                  </div>
+
+                  <!-- ✅ Prescription/Consultation UNDER the title (only if exists) -->
+                  ${rx ? `<div class="mt-1">${rx}</div>` : ``}
+
+                  <div class="text-caption-sm text-muted mt-1">${money(it.unit_price)} each</div>
+                </div>
+
+                <button class="icon-button text-danger opacity-75 flex-shrink-0"
+                        type="button"
+                        aria-label="Remove item"
+                        data-action="remove"
+                        data-product="${it.id}">
+                  <i class="fa-solid fa-trash-can"></i>
+                </button>
+              </div>
+
+              <div class="d-flex align-items-center justify-content-between gap-2 mt-3">
+                <div class="input-group input-group-sm flex-shrink-0" style="max-width:160px;">
+                  <button class="btn btn-outline-secondary"
+                          type="button"
+                          data-action="dec"
+                          data-product="${it.id}"
+                          ${decDisabled}
+                          aria-label="Decrease quantity">
+                    <i class="fa-solid fa-minus"></i>
+                  </button>
+
+                  <input class="form-control text-center"
+                         type="number"
+                         min="1"
+                         max="${stock}"
+                         value="${it.qty}"
+                         inputmode="numeric"
+                         autocomplete="off"
+                         data-action="qty"
+                         data-product="${it.id}">
+
+                  <button class="btn btn-outline-secondary"
+                          type="button"
+                          data-action="inc"
+                          data-product="${it.id}"
+                          ${incDisabled}
+                          aria-label="Increase quantity">
+                    <i class="fa-solid fa-plus"></i>
+                  </button>
+                </div>
+
+                <div class="fw-semibold flex-shrink-0">${money(it.line_total)}</div>
+              </div>
+            </div>
+          </div>
+        </div>
+      </div>
+    `;
+    })
+    .join("");
+
+  // ✅ activate marquee after DOM is injected
+  applyCartTitleMarquee(wrap);
+}
+
+async function getJSON(url) {
+  if (!url) return null;
+  const res = await fetch(url, { headers: { "X-Requested-With": "XMLHttpRequest" } });
+  return await res.json().catch(() => null);
+}
+
+async function postAction(url, body) {
+  if (!url) return null;
+  const res = await fetch(url, {
+    method: "POST",
+    headers: {
+      "Content-Type": "application/x-www-form-urlencoded",
+      "X-CSRFToken": getCookie("csrftoken"),
+      "X-Requested-With": "XMLHttpRequest"
+    },
+    body: new URLSearchParams(body)
+  });
+  return await res.json().catch(() => null);
+}
+
+// `refresh` forces the initial summary fetch, for when the side cart is opening.
+export async function init({ refresh = false } = {}) {
+  const routesEl = d.getElementById("cartRoutes");
+  if (!routesEl) return;
+
+  currencyFormatter = makeCurrencyFormatter();
+
+  const totalEl = d.getElementById("cartTotal");
+  if (totalEl && totalEl.parentElement) {
+    totalEl.parentElement.childNodes.forEach((n) => {
+      if (n.nodeType === Node.TEXT_NODE && n.textContent.trim() !== "") n.textContent = "";
+    });
+  }
+
+  recommendationsUrl = routesEl.dataset.cartRecommendationsUrl || "";
+
+  const routes = {
+    summary: routesEl.dataset.cartSummaryUrl,
+    add: routesEl.dataset.cartAddUrl,
+    update: routesEl.dataset.cartUpdateUrl,
+    remove: routesEl.dataset.cartRemoveUrl
+  };
+
+  // The badges are rendered server-side from cart_qty, and the side cart's markup starts
+  // out as the empty state, so an empty cart needs no summary request at all.
+  if (refresh || (parseInt(routesEl.dataset.cartQty, 10) || 0) > 0) {
+    const summary = await getJSON(routes.summary);
+    if (summary && summary.ok) renderCart(summary);
+  }
+
+  const off = d.getElementById("cartOffcanvas");
+  if (off && window.bootstrap) {
+    off.addEventListener("shown.bs.offcanvas", async () => {
+      const data = await getJSON(routes.summary);
+      if (data && data.ok) renderCart(data);
+    });
+  }
+
+  d.addEventListener("click", async (e) => {
+    const btn = e.target.closest(".js-add-to-cart");
+    if (!btn) return;
+    if (btn.disabled) return;
+
+    const productId = btn.dataset.product;
+    if (!productId) {
+      console.warn("Missing data-product on add-to-cart button", btn);
+      return;
+    }
+
+    let qty = 1;
+
+    const selector = btn.dataset.qtyInput;
+    if (selector) {
+      const el = d.querySelector(selector);
+      if (el) qty = parseInt(el.value, 10) || 1;
+    } else {
+      const card = btn.closest(".product-card, article, .product-card-wrapper") || d;
+      const el = card.querySelector(".js-qty") || d.getElementById("qtyInput");
+      if (el) qty = parseInt(el.value, 10) || 1;
+    }
+
+    qty = Math.max(1, qty);
+
+    const addUrl = btn.dataset.cartAddUrl || routes.add;
+    const summaryUrl = btn.dataset.cartSummaryUrl || routes.summary;
+
+    btn.disabled = true;
+
+    try {
+      const data = await postAction(addUrl, { product_id: productId, qty: qty });
+
+      if (!data || !data.ok) {
+        alert(data && data.error ? data.error : "Failed to add to cart");
+        return;
+      }
+
+      const sum = await getJSON(summaryUrl);
+      if (sum && sum.ok) renderCart(sum);
+    } finally {
+      btn.disabled = false;
+    }
+  });
+
+  const wrap = d.getElementById("cartContent");
+  if (!wrap) return;
+
+  wrap.addEventListener("click", async (e) => {
+    const btn = e.target.closest('button[data-action]');
+    if (!btn) return;
+
+    const action = btn.dataset.action;
+    const productId = btn.dataset.product;
+    if (!productId) return;
+
+    btn.disabled = true;
+
+    try {
+      if (action === "remove") {
+        const data = await postAction(routes.remove, { product_id: productId });
+        if (data && data.ok) renderCart(data);
+        return;
+      }
+
+      if (action === "inc" || action === "dec") {
+        const input = wrap.querySelector(`input[data-action="qty"][data-product="${productId}"]`);
+        if (!input) return;
+
+        let q = parseInt(input.value, 10) || 1;
+        q = action === "inc" ? q + 1 : q - 1;
+        q = Math.max(1, q);
+
+        const max = parseInt(input.getAttribute("max"), 10);
+        if (!Number.isNaN(max)) q = Math.min(q, max);
+
+        const data = await postAction(routes.update, { product_id: productId, qty: q });
+        if (data && data.ok) renderCart(data);
+      }
+    } finally {
+      btn.disabled = false;
+    }
+  });
+
+  wrap.addEventListener("change", async (e) => {
+    const input = e.target.closest('input[data-action="qty"]');
+    if (!input) return;
+
+    const productId = input.dataset.product;
+    let q = parseInt(input.value, 10) || 1;
+    q = Math.max(1, q);
+
+    const max = parseInt(input.getAttribute("max"), 10);
+    if (!Number.isNaN(max)) q = Math.min(q, max);
+
+    const data = await postAction(routes.update, { product_id: productId, qty: q });
+    if (data && data.ok) renderCart(data);
+  });
+
+  // ✅ keep marquee correct on resize
+  let t;
+  window.addEventListener("resize", () => {
+    clearTimeout(t);
+    t = setTimeout(() => applyCartTitleMarquee(d.getElementById("cartContent")), 120);
+  });
+}
@@ -0,0 +1,55 @@
+/* Product Detail Qty + Thumbs */
+export function init() {
+  const unitEl = document.getElementById("unitPrice");
+  const totalEl = document.getElementById("totalPrice");
+
+  const qtyInput = document.getElementById("qtyInput");
+  const qtyMinus = document.getElementById("qtyMinus");
+  const qtyPlus = document.getElementById("qtyPlus");
+
+  if (unitEl && totalEl && qtyInput && qtyMinus && qtyPlus) {
+    const unit = Number(unitEl.dataset.unit || "0");
+    const minQty = Number(qtyInput.min || "1");
+    const maxQty = Number(qtyInput.dataset.max || qtyInput.max || "999999");
+
+    const fmt = (n) => (Math.round(n * 100) / 100).toFixed(2);
+
+    const updateButtons = (q) => {
+      qtyMinus.disabled = q <= minQty;
+      qtyPlus.disabled = maxQty > 0 ? q >= maxQty : false;
+    };
+
+    const recalc = () => {
+      const q = Number(qtyInput.value || minQty);
+      totalEl.textContent = fmt(unit * q);
+    };
+
+    const clampAndSet = (value) => {
+      let q = parseInt(value, 10);
+      if (Number.isNaN(q)) q = minQty;
+
+      q = Math.max(minQty, q);
+      if (maxQty > 0) q = Math.min(maxQty, q);
+
+      qtyInput.value = q;
+      updateButtons(q);
+      recalc();
+    };
+
+    qtyMinus.addEventListener("click", () => clampAndSet(Number(qtyInput.value || minQty) - 1));
+    qtyPlus.addEventListener("click", () => clampAndSet(Number(qtyInput.value || minQty) + 1));
+
+    qtyInput.addEventListener("input", () => clampAndSet(qtyInput.value));
+    qtyInput.addEventListener("blur", () => clampAndSet(qtyInput.value));
+
+    clampAndSet(qtyInput.value);
+  }
+
+  document.querySelectorAll(".product-thumb-btn").forEach((btn) => {
+    btn.addEventListener("click", () => {
+      const full = btn.getAttribute("data-full");
+      const main = document.getElementById("mainProductImage");
+      if (full && main) main.src = full;
+    });
+  });
+}
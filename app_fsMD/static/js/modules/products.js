@@ -0,0 +1,208 @@
+/* Product Filters */
+function initProductFilters() {
+  const filterButtons = document.querySelectorAll(".product-filter-btn[data-filter]");
+  const productCards = Array.from(document.querySelectorAll(".product-card-wrapper[data-category]"));
+
+  const toggleBtn = document.querySelector(".products-toggle-btn");
+  const toggleLabel = toggleBtn ? toggleBtn.querySelector(".products-toggle-label") : null;
+
+  if (!filterButtons.length || !productCards.length) return;
+
+  const VISIBLE_LIMIT = 8;
+  let currentFilter = "all";
+  let showAllProducts = false;
+
+  const applyFilter = (filter) => {
+    currentFilter = filter;
+
+    let visibleIndex = 0;
+    let totalMatches = 0;
+
+    productCards.forEach((card) => {
+      const categories = card.dataset.category.split(/\s+/).filter(Boolean);
+      const matches = filter === "all" || categories.includes(filter);
+
+      card.classList.remove("product-card-animate");
+      card.style.animationDelay = "0s";
+
+      if (matches) {
+        totalMatches++;
+        const shouldShow = showAllProducts || visibleIndex < VISIBLE_LIMIT;
+
+        if (shouldShow) {
+          card.classList.remove("d-none");
+          void card.offsetWidth;
+          card.style.animationDelay = `${visibleIndex * 0.05}s`;
+          card.classList.add("product-card-animate");
+          visibleIndex += 1;
+        } else {
+          card.classList.add("d-none");
+        }
+      } else {
+        card.classList.add("d-none");
+      }
+    });
+
+    if (!toggleBtn || !toggleLabel) return;
+
+    if (totalMatches > VISIBLE_LIMIT) {
+      toggleBtn.classList.remove("d-none");
+      toggleLabel.textContent = showAllProducts ? "Hide products" : "See more products";
+    } else {
+      toggleBtn.classList.add("d-none");
+      showAllProducts = false;
+    }
+  };
+
+  filterButtons.forEach((btn) => {
+    btn.addEventListener("click", () => {
+      const filter = btn.getAttribute("data-filter");
+      if (btn.disabled || btn.classList.contains("disabled")) return;
+
+      showAllProducts = false;
+      filterButtons.forEach((b) => b.classList.remove("active"));
+      btn.classList.add("active");
+      applyFilter(filter);
+    });
+  });
+
+  if (toggleBtn && toggleLabel) {
+    toggleBtn.addEventListener("click", () => {
+      showAllProducts = !showAllProducts;
+      applyFilter(currentFilter);
+    });
+  }
+
+  applyFilter("all");
+}
+
+/* Card Description Expand */
+function initCardDescriptions() {
+  document.querySelectorAll("article").forEach((card) => {
+    const shortEl = card.querySelector(".js-desc-short");
+    const ellipsis = card.querySelector(".js-desc-ellipsis");
+    const moreBtn = card.querySelector(".js-desc-more");
+    const hideBtn = card.querySelector(".js-desc-hide");
+
+    const wrap = card.querySelector(".js-desc-wrap");
+    const inner = card.querySelector(".desc-expand-inner");
+
+    if (!shortEl || !wrap || !inner || !moreBtn || !hideBtn) return;
+
+    const shortLine = shortEl.closest("p");
+
+    const playIn = (el) => {
+      el.classList.remove("fade-out-down", "fade-blocked");
+      el.classList.add("fade-in", "fade-in-up", "fade-play");
+    };
+
+    const playOut = (el) => {
+      el.classList.remove("fade-in", "fade-in-up", "fade-play");
+      el.classList.add("fade-out-down");
+    };
+
+    const open = () => {
+      if (wrap.dataset.open === "1") return;
+      wrap.dataset.open = "1";
+      moreBtn.setAttribute("aria-expanded", "true");
+
+      if (shortLine) playOut(shortLine);
+
+      setTimeout(() => {
+        shortEl.classList.add("d-none");
+        if (ellipsis) ellipsis.classList.add("d-none");
+        moreBtn.classList.add("d-none");
+        hideBtn.classList.remove("d-none");
+
+        inner.classList.add("fade-blocked");
+        wrap.style.height = inner.scrollHeight + "px";
+
+        requestAnimationFrame(() => {
+          inner.classList.remove("fade-blocked");
+          playIn(inner);
+          wrap.style.height = inner.scrollHeight + "px";
+        });
+      }, 220);
+    };
+
+    const close = () => {
+      if (wrap.dataset.open !== "1") return;
+      wrap.dataset.open = "0";
+      moreBtn.setAttribute("aria-expanded", "false");
+
+      playOut(inner);
+
+      wrap.style.height = inner.scrollHeight + "px";
+      requestAnimationFrame(() => {
+        wrap.style.height = "0px";
+      });
+
+      setTimeout(() => {
+        hideBtn.classList.add("d-none");
+        shortEl.classList.remove("d-none");
+        if (ellipsis) ellipsis.classList.remove("d-none");
+        moreBtn.classList.remove("d-none");
+
+        if (shortLine) {
+          shortLine.classList.add("fade-blocked");
+          requestAnimationFrame(() => {
+            shortLine.classList.remove("fade-blocked");
+            playIn(shortLine);
+          });
+        }
+      }, 480);
+    };
+
+    moreBtn.addEventListener("click", open);
+    hideBtn.addEventListener("click", close);
+  });
+}
+
+/* Title Marquee + Description Toggles */
+function initTitleMarquee() {
+  const applyMarquee = () => {
+    document.querySelectorAll("[data-title-marquee]").forEach(el => {
+      const track = el.querySelector(".title-marquee-track");
+      const first = el.querySelector(".title-marquee-item");
+      if (!track || !first) return;
+      el.classList.remove("is-marquee");
+      const needs = first.scrollWidth > el.clientWidth + 2;
+      if (needs) el.classList.add("is-marquee");
+    });
+  };
+
+  const wireDescToggles = () => {
+    document.querySelectorAll("[data-desc-toggle]").forEach(btn => {
+      const targetSel = btn.getAttribute("data-bs-target");
+      const collapseEl = targetSel ? document.querySelector(targetSel) : null;
+      const label = btn.querySelector("[data-desc-toggle-label]");
+      const card = btn.closest(".product-card");
+      const clamp = card ? card.querySelector("[data-desc-clamp]") : null;
+      if (!collapseEl || !label) return;
+
+      const setState = (expanded) => {
+        label.textContent = expanded ? "Hide" : "See more…";
+        if (clamp) clamp.style.display = expanded ? "none" : "-webkit-box";
+      };
+
+      collapseEl.addEventListener("show.bs.collapse", () => setState(true));
+      collapseEl.addEventListener("hide.bs.collapse", () => setState(false));
+      setState(false);
+    });
+  };
+
+  applyMarquee();
+  wireDescToggles();
+
+  let t;
+  window.addEventListener("resize", () => {
+    clearTimeout(t);
+    t = setTimeout(applyMarquee, 120);
+  });
+}
+
+export function init() {
+  initProductFilters();
+  initCardDescriptions();
+  initTitleMarquee();
+}
@@ -0,0 +1,71 @@
+/* Result Slider */
+export function init() {
+  const sliders = document.querySelectorAll(".result-slider");
+  if (!sliders.length) return;
+
+  sliders.forEach((slider) => {
+    const handle = slider.querySelector(".result-slider-handle");
+    const divider = slider.querySelector(".result-slider-divider");
+    if (!handle || !divider) return;
+
+    const initial = parseInt(slider.getAttribute("data-initial") || "50", 10);
+    let isDragging = false;
+
+    const setPositionFromClientX = (clientX) => {
+      const rect = slider.getBoundingClientRect();
+      let percent = ((clientX - rect.left) / rect.width) * 100;
+      percent = Math.min(100, Math.max(0, percent));
+      const pos = percent + "%";
+
+      slider.style.setProperty("--reveal", pos);
+      handle.style.left = pos;
+      divider.style.left = pos;
+    };
+
+    const startDrag = (clientX) => {
+      isDragging = true;
+      slider.classList.add("is-dragging");
+      setPositionFromClientX(clientX);
+    };
+
+    const onPointerMove = (e) => {
+      if (!isDragging) return;
+      let clientX;
+      if (e.touches && e.touches.length) clientX = e.touches[0].clientX;
+      else clientX = e.clientX;
+      setPositionFromClientX(clientX);
+    };
+
+    const endDrag = () => {
+      if (!isDragging) return;
+      isDragging = false;
+      slider.classList.remove("is-dragging");
+    };
+
+    const rect = slider.getBoundingClientRect();
+    const initialX = rect.left + (initial / 100) * rect.width;
+    setPositionFromClientX(initialX);
+
+    handle.addEventListener("mousedown", (e) => {
+      e.preventDefault();
+      startDrag(e.clientX);
+    });
+
+    document.addEventListener("mousemove", onPointerMove);
+    document.addEventListener("mouseup", endDrag);
+
+    handle.addEventListener(
+      "touchstart",
+      (e) => {
+        e.preventDefault();
+        if (!e.touches || !e.touches.length) return;
+        startDrag(e.touches[0].clientX);
+      },
+      { passive: false }
+    );
+
+    document.addEventListener("touchmove", onPointerMove, { passive: false });
+    document.addEventListener("touchend", endDrag);
+    document.addEventListener("touchcancel", endDrag);
+  });
+}
@@ -1,1340 +0,0 @@
-/* Lazy Images */
-document.addEventListener("DOMContentLoaded", () => {
-  document.querySelectorAll("img").forEach((img) => {
-    if (img.hasAttribute("loading")) return;
-    if (img.classList.contains("no-lazy")) {
-      img.loading = "eager";
-      return;
-    }
-    img.loading = "lazy";
-    img.decoding = "async";
-  });
-});
-
-/* Scroll To Top */
-document.addEventListener("DOMContentLoaded", () => {
-  const scrollTopBtn = document.getElementById("scrollTopBtn");
-  if (!scrollTopBtn) return;
-
-  const SHOW_OFFSET = 200;
-
-  const toggleScrollTopBtn = () => {
-    if (window.scrollY > SHOW_OFFSET) scrollTopBtn.classList.add("show");
-    else scrollTopBtn.classList.remove("show");
-  };
-
-  toggleScrollTopBtn();
-  window.addEventListener("scroll", toggleScrollTopBtn);
-
-  scrollTopBtn.addEventListener("click", () => {
-    window.scrollTo({ top: 0, behavior: "smooth" });
-  });
-});
-
-/* Navbar Transparency */
-document.addEventListener("scroll", () => {
-  const navbar = document.querySelector(".navbar-fsmd");
-  if (!navbar) return;
-
-  if (window.scrollY > 1) navbar.classList.remove("transparent");
-  else navbar.classList.add("transparent");
-});
-
-/* Hero Parallax */
-document.addEventListener("DOMContentLoaded", () => {
-  const img = document.querySelector(".hero-image");
-  if (!img) return;
-
-  let lastScrollY = window.scrollY || window.pageYOffset;
-  let ticking = false;
-  const SPEED = 0.05;
-
-  const updateParallax = () => {
-    const offset = lastScrollY * SPEED;
-    img.style.transform = `translateY(${offset}px)`;
-    ticking = false;
-  };
-
-  window.addEventListener("scroll", () => {
-    lastScrollY = window.scrollY || window.pageYOffset;
-    if (!ticking) {
-      window.requestAnimationFrame(updateParallax);
-      ticking = true;
-    }
-  });
-});
-
-/* Scroll Animations */
-function initScrollAnimations() {
-  const elements = document.querySelectorAll(".scroll-animate");
-
-  if (!("IntersectionObserver" in window)) {
-    elements.forEach((el) => el.classList.add("fade-play"));
-    return;
-  }
-
-  const observer = new IntersectionObserver(
-    (entries, obs) => {
-      entries.forEach((entry) => {
-        if (entry.isIntersecting) {
-          entry.target.classList.add("fade-play");
-          obs.unobserve(entry.target);
-        }
-      });
-    },
-    { threshold: 0.2 }
-  );
-
-  elements.forEach((el) => observer.observe(el));
-}
-
-/* Global Loader */
-window.addEventListener("load", () => {
-  const loader = document.getElementById("global-loader");
-
-  setTimeout(() => {
-    if (loader) loader.classList.add("hidden");
-
-    document.querySelectorAll(".fade-blocked").forEach((el) => {
-      el.classList.remove("fade-blocked");
-    });
-
-    initScrollAnimations();
-  }, 1500);
-});
-
-
-/* Result Slider */
-document.addEventListener("DOMContentLoaded", () => {
-  const sliders = document.querySelectorAll(".result-slider");
-  if (!sliders.length) return;
-
-  sliders.forEach((slider) => {
-    const handle = slider.querySelector(".result-slider-handle");
-    const divider = slider.querySelector(".result-slider-divider");
-    if (!handle || !divider) return;
-
-    const initial = parseInt(slider.getAttribute("data-initial") || "50", 10);
-    let isDragging = false;
-
-    const setPositionFromClientX = (clientX) => {
-      const rect = slider.getBoundingClientRect();
-      let percent = ((clientX - rect.left) / rect.width) * 100;
-      percent = Math.min(100, Math.max(0, percent));
-      const pos = percent + "%";
-
-      slider.style.setProperty("--reveal", pos);
-      handle.style.left = pos;
-      divider.style.left = pos;
-    };
-
-    const startDrag = (clientX) => {
-      isDragging = true;
-      slider.classList.add("is-dragging");
-      setPositionFromClientX(clientX);
-    };
-
-    const onPointerMove = (e) => {
-      if (!isDragging) return;
-      let clientX;
-      if (e.touches && e.touches.length) clientX = e.touches[0].clientX;
-      else clientX = e.clientX;
-      setPositionFromClientX(clientX);
-    };
-
-    const endDrag = () => {
-      if (!isDragging) return;
-      isDragging = false;
-      slider.classList.remove("is-dragging");
-    };
-
-    const rect = slider.getBoundingClientRect();
-    const initialX = rect.left + (initial / 100) * rect.width;
-    setPositionFromClientX(initialX);
-
-    handle.addEventListener("mousedown", (e) => {
-      e.preventDefault();
-      startDrag(e.clientX);
-    });
-
-    document.addEventListener("mousemove", onPointerMove);
-    document.addEventListener("mouseup", endDrag);
-
-    handle.addEventListener(
-      "touchstart",
-      (e) => {
-        e.preventDefault();
-        if (!e.touches || !e.touches.length) return;
-        startDrag(e.touches[0].clientX);
-      },
-      { passive: false }
-    );
-
-    document.addEventListener("touchmove", onPointerMove, { passive: false });
-    document.addEventListener("touchend", endDrag);
-    document.addEventListener("touchcancel", endDrag);
-  });
-});
-
-/* Programs Accordion (mobile swipe native + desktop mouse drag + click open) */
-document.addEventListener("DOMContentLoaded", () => {
-  const row = document.querySelector(".program-row");
-  const items = Array.from(document.querySelectorAll(".program-item"));
-  if (!row || !items.length) return;
-
-  row.dataset.dragged = "0";
-
-  const isMobile = () => window.matchMedia("(max-width: 992px)").matches;
-
-  const updateFit = () => {
-    if (isMobile()) {
-      row.classList.remove("is-fit");
-      return;
-    }
-    row.classList.toggle("is-fit", row.scrollWidth <= row.clientWidth + 1);
-  };
-
-  const centerActiveItem = (item) => {
-    const rowRect = row.getBoundingClientRect();
-    const itemRect = item.getBoundingClientRect();
-
-    const currentScroll = row.scrollLeft;
-    const itemCenter = itemRect.left + itemRect.width / 2;
-    const rowCenter = rowRect.left + rowRect.width / 2;
-    const delta = itemCenter - rowCenter;
-    const targetScroll = currentScroll + delta;
-
-    row.scrollTo({
-      left: targetScroll,
-      behavior: "smooth"
-    });
-  };
-
-  // Center the active item vertically (for mobile)
-  const centerVerticalItem = (item) => {
-    const rowRect = row.getBoundingClientRect();
-    const itemRect = item.getBoundingClientRect();
-
-    const rowHeight = rowRect.height;
-    const itemHeight = itemRect.height;
-
-    const currentScroll = row.scrollTop;
-    const itemCenter = itemRect.top + itemHeight / 2;
-    const rowCenter = rowRect.top + rowHeight / 2;
-    const delta = itemCenter - rowCenter;
-    const targetScroll = currentScroll + delta;
-
-    row.scrollTo({
-      top: targetScroll,
-      behavior: "smooth"
-    });
-  };
-
-  // Wait for transition (flex-basis change) to finish before scrolling
-  const waitForTransition = (el, property, callback) => {
-    let done = false;
-
-    const handler = (e) => {
-      if (e.target === el && (!property || e.propertyName === property)) {
-        done = true;
-        el.removeEventListener("transitionend", handler);
-        callback();
-      }
-    };
-
-    el.addEventListener("transitionend", handler);
-
-    setTimeout(() => {
-      if (!done) {
-        el.removeEventListener("transitionend", handler);
-        callback();
-      }
-    }, 450); // slightly > your .35s CSS transition
-  };
-
-  const openItem = (item, scroll = true) => {
-    items.forEach(i => i.classList.remove("active"));
-    item.classList.add("active");
-
-    requestAnimationFrame(() => {
-      updateFit();
-
-      if (!isMobile() && scroll) {
-        // Temporarily disable smooth scroll behavior during the expansion
-        row.style.scrollBehavior = "auto"; // Disable smooth scroll
-
-        // Wait for flex-basis transition to finish, THEN center the item
-        waitForTransition(item, "flex-basis", () => {
-          // For mobile, center the item vertically
-          if (isMobile()) {
-            centerVerticalItem(item); // Scroll vertically to the center
-          } else {
-            centerActiveItem(item); // Scroll horizontally to the center
-          }
-
-          // Re-enable smooth scrolling after the scroll action
-          setTimeout(() => {
-            row.style.scrollBehavior = "smooth"; // Re-enable smooth scroll
-          }, 400); // Match this time with your transition duration
-        });
-      }
-    });
-  };
-
-  row.addEventListener("click", (e) => {
-    if (row.dataset.dragged === "1") return;
-
-    const bar = e.target.closest(".program-bar");
-    if (!bar) return;
-
-    const item = bar.closest(".program-item");
-    if (!item) return;
-
-    if (item.classList.contains("active")) {
-      if (!isMobile()) {
-        centerActiveItem(item);
-      }
-      return;
-    }
-
-    openItem(item, true);
-  });
-
-  const DRAG_THRESHOLD = 6;
-  let down = false;
-  let startX = 0;
-  let startLeft = 0;
-  let dragged = false;
-
-  const canDragDesktop = () =>
-    window.matchMedia("(hover:hover) and (pointer:fine)").matches &&
-    row.scrollWidth > row.clientWidth + 1;
-
-  const onMove = (e) => {
-    if (!down) return;
-
-    const dx = e.clientX - startX;
-
-    if (!dragged && Math.abs(dx) > DRAG_THRESHOLD) {
-      dragged = true;
-      row.classList.add("is-dragging");
-      row.classList.add("no-snap"); // Disable snapping during drag
-      document.body.style.userSelect = "none";
-    }
-
-    if (dragged) {
-      e.preventDefault();
-      row.scrollLeft = startLeft - dx;
-    }
-  };
-
-  const onUp = () => {
-    if (!down) return;
-    down = false;
-
-    window.removeEventListener("mousemove", onMove);
-    window.removeEventListener("mouseup", onUp);
-
-    document.body.style.userSelect = "";
-    row.classList.remove("is-dragging");
-    row.classList.remove("no-snap"); // Re-enable snapping after drag
-
-    if (dragged) {
-      row.dataset.dragged = "1";
-      setTimeout(() => (row.dataset.dragged = "0"), 150);
-    }
-
-    dragged = false;
-  };
-
-  row.addEventListener("mousedown", (e) => {
-    if (!canDragDesktop()) return;
-    if (e.button !== 0) return; // left mouse only
-
-    if (e.target.closest(".program-panel")) return;
-
-    down = true;
-    dragged = false;
-    startX = e.clientX;
-    startLeft = row.scrollLeft;
-
-    window.addEventListener("mousemove", onMove, { passive: false });
-    window.addEventListener("mouseup", onUp, { passive: true });
-  });
-
-  row.addEventListener("dragstart", (e) => e.preventDefault());
-
-  openItem(document.querySelector(".program-item.active") || items[0], false);
-  updateFit();
-
-  const ro = new ResizeObserver(() => {
-    updateFit();
-  });
-  ro.observe(row);
-
-  window.addEventListener(
-    "resize",
-    () => {
-      updateFit();
-    },
-    { passive: true }
-  );
-});
-
-/* Product Filters */
-document.addEventListener("DOMContentLoaded", () => {
-  const filterButtons = document.querySelectorAll(".product-filter-btn[data-filter]");
-  const productCards = Array.from(document.querySelectorAll(".product-card-wrapper[data-category]"));
-
-  const toggleBtn = document.querySelector(".products-toggle-btn");
-  const toggleLabel = toggleBtn ? toggleBtn.querySelector(".products-toggle-label") : null;
-
-  if (!filterButtons.length || !productCards.length) return;
-
-  const VISIBLE_LIMIT = 8;
-  let currentFilter = "all";
-  let showAllProducts = false;
-
-  const applyFilter = (filter) => {
-    currentFilter = filter;
-
-    let visibleIndex = 0;
-    let totalMatches = 0;
-
-    productCards.forEach((card) => {
-      const categories = card.dataset.category.split(/\s+/).filter(Boolean);
-      const matches = filter === "all" || categories.includes(filter);
-
-      card.classList.remove("product-card-animate");
-      card.style.animationDelay = "0s";
-
-      if (matches) {
-        totalMatches++;
-        const shouldShow = showAllProducts || visibleIndex < VISIBLE_LIMIT;
-
-        if (shouldShow) {
-          card.classList.remove("d-none");
-          void card.offsetWidth;
-          card.style.animationDelay = `${visibleIndex * 0.05}s`;
-          card.classList.add("product-card-animate");
-          visibleIndex += 1;
-        } else {
-          card.classList.add("d-none");
-        }
-      } else {
-        card.classList.add("d-none");
-      }
-    });
-
-    if (!toggleBtn || !toggleLabel) return;
-
-    if (totalMatches > VISIBLE_LIMIT) {
-      toggleBtn.classList.remove("d-none");
-      toggleLabel.textContent = showAllProducts ? "Hide products" : "See more products";
-    } else {
-      toggleBtn.classList.add("d-none");
-      showAllProducts = false;
-    }
-  };
-
-  filterButtons.forEach((btn) => {
-    btn.addEventListener("click", () => {
-      const filter = btn.getAttribute("data-filter");
-      if (btn.disabled || btn.classList.contains("disabled")) return;
-
-      showAllProducts = false;
-      filterButtons.forEach((b) => b.classList.remove("active"));
-      btn.classList.add("active");
-      applyFilter(filter);
-    });
-  });
-
-  if (toggleBtn && toggleLabel) {
-    toggleBtn.addEventListener("click", () => {
-      showAllProducts = !showAllProducts;
-      applyFilter(currentFilter);
-    });
-  }
-
-  applyFilter("all");
-});
-
-/* Feedback Carousel */
-document.addEventListener("DOMContentLoaded", () => {
-  const carouselEl = document.getElementById("feedbackCarousel");
-  if (!carouselEl || typeof bootstrap === "undefined") return;
-
-  const carousel = bootstrap.Carousel.getOrCreateInstance(carouselEl, {
-    ride: "carousel",
-    interval: 6000,
-    touch: true,
-    wrap: true
-  });
-
-  let isDown = false;
-  let startX = 0;
-  let startY = 0;
-  const threshold = 40;   // minimum horizontal movement
-  const restraint = 80;   // ignore if too diagonal
-
-  carouselEl.addEventListener("pointerdown", (e) => {
-    isDown = true;
-    startX = e.clientX;
-    startY = e.clientY;
-  });
-
-  carouselEl.addEventListener("pointerup", (e) => {
-    if (!isDown) return;
-    isDown = false;
-
-    const dx = e.clientX - startX;
-    const dy = e.clientY - startY;
-
-    if (Math.abs(dx) >= threshold && Math.abs(dy) <= restraint) {
-      if (dx < 0) {
-        carousel.next();
-      } else {
-        carousel.prev();
-      }
-    }
-  });
-
-  carouselEl.addEventListener("pointerleave", () => {
-    isDown = false;
-  });
-
-  carouselEl.addEventListener("pointercancel", () => {
-    isDown = false;
-  });
-});
-
-
-/* Blog Posts Drag List */
-document.addEventListener("DOMContentLoaded", () => {
-  const list = document.getElementById("blogPostsDragList");
-  const featuredImg = document.getElementById("blogFeaturedImg");
-  const featuredLink = document.getElementById("blogFeaturedLink");
-  const featuredWrap = featuredImg ? featuredImg.closest(".blog-feature-visual") : null;
-
-  if (!list || !featuredImg || !featuredLink || !featuredWrap) return;
-
-  const prefersReduced = window.matchMedia("(prefers-reduced-motion: reduce)").matches;
-  const items = Array.from(list.querySelectorAll(".blog-post-row"));
-
-  const swapFeatured = (src, href) => {
-    if (!src) return;
-    featuredWrap.classList.add("is-swapping");
-    setTimeout(
-      () => {
-        featuredImg.src = src;
-        if (href) featuredLink.href = href;
-        featuredWrap.classList.remove("is-swapping");
-      },
-      prefersReduced ? 0 : 140
-    );
-  };
-
-  const setActive = (el) => {
-    items.forEach((i) => i.classList.remove("is-active"));
-    if (el) el.classList.add("is-active");
-  };
-
-  const first = items[0];
-  if (first) {
-    setActive(first);
-    swapFeatured(first.getAttribute("data-img"), first.getAttribute("href"));
-  }
-
-  items.forEach((item) => {
-    const img = item.getAttribute("data-img");
-    const href = item.getAttribute("href");
-
-    item.addEventListener("mouseenter", () => {
-      setActive(item);
-      swapFeatured(img, href);
-    });
-
-    item.addEventListener("focusin", () => {
-      setActive(item);
-      swapFeatured(img, href);
-    });
-
-    item.addEventListener("dragstart", (e) => e.preventDefault());
-    item.querySelectorAll("img").forEach((imgEl) =>
-      imgEl.addEventListener("dragstart", (e) => e.preventDefault())
-    );
-  });
-
-  let activePointer = null;
-  let startY = 0;
-  let startTop = 0;
-  let dragged = false;
-
-  const onDown = (e) => {
-    if (e.button !== undefined && e.button !== 0) return;
-    activePointer = e.pointerId ?? "mouse";
-    dragged = false;
-    startY = e.clientY;
-    startTop = list.scrollTop;
-    list.classList.add("is-dragging");
-    if (list.setPointerCapture && e.pointerId !== undefined) list.setPointerCapture(e.pointerId);
-    e.preventDefault();
-  };
-
-  const onMove = (e) => {
-    if (activePointer === null) return;
-    if (e.pointerId !== undefined && activePointer !== e.pointerId) return;
-
-    const dy = e.clientY - startY;
-    if (Math.abs(dy) > 3) dragged = true;
-    list.scrollTop = startTop - dy;
-  };
-
-  const onUp = (e) => {
-    if (activePointer === null) return;
-    if (e && e.pointerId !== undefined && activePointer !== e.pointerId) return;
-
-    activePointer = null;
-    list.classList.remove("is-dragging");
-  };
-
-  list.addEventListener("pointerdown", onDown, { passive: false });
-  window.addEventListener("pointermove", onMove, { passive: true });
-  window.addEventListener("pointerup", onUp, { passive: true });
-  window.addEventListener("pointercancel", onUp, { passive: true });
-
-  list.addEventListener(
-    "click",
-    (e) => {
-      if (!dragged) return;
-      e.preventDefault();
-      e.stopPropagation();
-    },
-    true
-  );
-});
-
-/* Blog Filters + Featured */
-document.addEventListener("DOMContentLoaded", () => {
-  const filtersEl = document.getElementById("blogFilters");
-  const postBtns = Array.from(document.querySelectorAll(".blog-post-btn"));
-
-  const featuredImg = document.getElementById("featuredImg");
-  const featuredBadge = document.getElementById("featuredBadge");
-  const featuredDate = document.getElementById("featuredDate");
-  const featuredRead = document.getElementById("featuredRead");
-  const featuredTitle = document.getElementById("featuredTitle");
-  const featuredDesc = document.getElementById("featuredDesc");
-  const featuredBullets = document.getElementById("featuredBullets");
-
-  if (
-    !filtersEl ||
-    !postBtns.length ||
-    !featuredImg ||
-    !featuredBadge ||
-    !featuredDate ||
-    !featuredRead ||
-    !featuredTitle ||
-    !featuredDesc ||
-    !featuredBullets
-  ) {
-    return;
-  }
-
-  const filterBtns = Array.from(filtersEl.querySelectorAll("button[data-filter]"));
-
-  const setActiveCard = (btn) => {
-    postBtns.forEach((b) => {
-      b.classList.remove("is-active");
-      const card = b.querySelector(".blog-post-card");
-      if (card) {
-        card.classList.remove("border-primary", "border-2");
-        if (!card.classList.contains("border")) card.classList.add("border");
-      }
-    });
-
-    if (btn) {
-      btn.classList.add("is-active");
-      const card = btn.querySelector(".blog-post-card");
-      if (card) card.classList.add("border-primary", "border-2");
-    }
-  };
-
-  const setFeaturedFrom = (btn) => {
-    if (!btn) return;
-
-    setActiveCard(btn);
-
-    featuredImg.src = btn.dataset.img || featuredImg.src;
-    featuredImg.alt = btn.dataset.title || "Featured blog";
-
-    featuredBadge.innerHTML = btn.dataset.badge || "";
-    featuredDate.textContent = btn.dataset.date || "";
-    featuredRead.textContent = btn.dataset.read || "";
-
-    featuredTitle.textContent = btn.dataset.title || "";
-    featuredDesc.textContent = btn.dataset.desc || "";
-
-    const bullets = [btn.dataset.b1, btn.dataset.b2, btn.dataset.b3].filter(Boolean);
-    featuredBullets.innerHTML = bullets
-      .map(
-        (t) => `
-      <li class="d-flex gap-2 align-items-start">
-        <i class="fa-solid fa-circle-check text-primary-accent mt-1"></i>
-        <span class="text-body-sm">${t}</span>
-      </li>
-    `
-      )
-      .join("");
-  };
-
-  const applyFilter = (topic) => {
-    let firstVisible = null;
-
-    postBtns.forEach((btn) => {
-      const match = topic === "all" || btn.dataset.topic === topic;
-      btn.classList.toggle("d-none", !match);
-      if (match && !firstVisible) firstVisible = btn;
-    });
-
-    const active = document.querySelector(".blog-post-btn.is-active");
-    if (!active || active.classList.contains("d-none")) {
-      setFeaturedFrom(firstVisible || postBtns[0]);
-    }
-  };
-
-  postBtns.forEach((btn) => {
-    btn.addEventListener("click", () => setFeaturedFrom(btn));
-    btn.addEventListener("keydown", (e) => {
-      if (e.key === "Enter" || e.key === " ") {
-        e.preventDefault();
-        setFeaturedFrom(btn);
-      }
-    });
-  });
-
-  filtersEl.addEventListener("click", (e) => {
-    if (filtersEl.dataset.dragged === "1") return;
-
-    const btn = e.target.closest("button[data-filter]");
-    if (!btn || !filtersEl.contains(btn)) return;
-
-    filterBtns.forEach((b) => {
-      b.classList.remove("active");
-      b.setAttribute("aria-pressed", "false");
-    });
-
-    btn.classList.add("active");
-    btn.setAttribute("aria-pressed", "true");
-
-    applyFilter(btn.dataset.filter || "all");
-  });
-
-  let isDown = false;
-  let startX = 0;
-  let startLeft = 0;
-  let dragged = false;
-
-  const onDown = (e) => {
-    isDown = true;
-    dragged = false;
-    filtersEl.dataset.dragged = "0";
-    filtersEl.classList.add("is-dragging");
-    startX = e.clientX;
-    startLeft = filtersEl.scrollLeft;
-  };
-
-  const onMove = (e) => {
-    if (!isDown) return;
-    const dx = e.clientX - startX;
-    if (Math.abs(dx) > 4) {
-      dragged = true;
-      filtersEl.dataset.dragged = "1";
-    }
-    filtersEl.scrollLeft = startLeft - dx;
-  };
-
-  const onUp = () => {
-    isDown = false;
-    filtersEl.classList.remove("is-dragging");
-    if (dragged) setTimeout(() => (filtersEl.dataset.dragged = "0"), 150);
-  };
-
-  filtersEl.addEventListener("pointerdown", onDown, { passive: true });
-  window.addEventListener("pointermove", onMove, { passive: true });
-  window.addEventListener("pointerup", onUp, { passive: true });
-  window.addEventListener("pointercancel", onUp, { passive: true });
-
-  const initial = document.querySelector(".blog-post-btn.is-active") || postBtns[0];
-  setFeaturedFrom(initial);
-  applyFilter("all");
-});
-
-/* Card Description Expand */
-document.addEventListener("DOMContentLoaded", () => {
-  document.querySelectorAll("article").forEach((card) => {
-    const shortEl = card.querySelector(".js-desc-short");
-    const ellipsis = card.querySelector(".js-desc-ellipsis");
-    const moreBtn = card.querySelector(".js-desc-more");
-    const hideBtn = card.querySelector(".js-desc-hide");
-
-    const wrap = card.querySelector(".js-desc-wrap");
-    const inner = card.querySelector(".desc-expand-inner");
-
-    if (!shortEl || !wrap || !inner || !moreBtn || !hideBtn) return;
-
-    const shortLine = shortEl.closest("p");
-
-    const playIn = (el) => {
-      el.classList.remove("fade-out-down", "fade-blocked");
-      el.classList.add("fade-in", "fade-in-up", "fade-play");
-    };
-
-    const playOut = (el) => {
-      el.classList.remove("fade-in", "fade-in-up", "fade-play");
-      el.classList.add("fade-out-down");
-    };
-
-    const open = () => {
-      if (wrap.dataset.open === "1") return;
-      wrap.dataset.open = "1";
-      moreBtn.setAttribute("aria-expanded", "true");
-
-      if (shortLine) playOut(shortLine);
-
-      setTimeout(() => {
-        shortEl.classList.add("d-none");
-        if (ellipsis) ellipsis.classList.add("d-none");
-        moreBtn.classList.add("d-none");
-        hideBtn.classList.remove("d-none");
-
-        inner.classList.add("fade-blocked");
-        wrap.style.height = inner.scrollHeight + "px";
-
-        requestAnimationFrame(() => {
-          inner.classList.remove("fade-blocked");
-          playIn(inner);
-          wrap.style.height = inner.scrollHeight + "px";
-        });
-      }, 220);
-    };
-
-    const close = () => {
-      if (wrap.dataset.open !== "1") return;
-      wrap.dataset.open = "0";
-      moreBtn.setAttribute("aria-expanded", "false");
-
-      playOut(inner);
-
-      wrap.style.height = inner.scrollHeight + "px";
-      requestAnimationFrame(() => {
-        wrap.style.height = "0px";
-      });
-
-      setTimeout(() => {
-        hideBtn.classList.add("d-none");
-        shortEl.classList.remove("d-none");
-        if (ellipsis) ellipsis.classList.remove("d-none");
-        moreBtn.classList.remove("d-none");
-
-        if (shortLine) {
-          shortLine.classList.add("fade-blocked");
-          requestAnimationFrame(() => {
-            shortLine.classList.remove("fade-blocked");
-            playIn(shortLine);
-          });
-        }
-      }, 480);
-    };
-
-    moreBtn.addEventListener("click", open);
-    hideBtn.addEventListener("click", close);
-  });
-});
-
-/* Product Detail Qty + Thumbs */
-document.addEventListener("DOMContentLoaded", () => {
-  const unitEl = document.getElementById("unitPrice");
-  const totalEl = document.getElementById("totalPrice");
-
-  const qtyInput = document.getElementById("qtyInput");
-  const qtyMinus = document.getElementById("qtyMinus");
-  const qtyPlus = document.getElementById("qtyPlus");
-
-  if (unitEl && totalEl && qtyInput && qtyMinus && qtyPlus) {
-    const unit = Number(unitEl.dataset.unit || "0");
-    const minQty = Number(qtyInput.min || "1");
-    const maxQty = Number(qtyInput.dataset.max || qtyInput.max || "999999");
-
-    const fmt = (n) => (Math.round(n * 100) / 100).toFixed(2);
-
-    const updateButtons = (q) => {
-      qtyMinus.disabled = q <= minQty;
-      qtyPlus.disabled = maxQty > 0 ? q >= maxQty : false;
-    };
-
-    const recalc = () => {
-      const q = Number(qtyInput.value || minQty);
-      totalEl.textContent = fmt(unit * q);
-    };
-
-    const clampAndSet = (value) => {
-      let q = parseInt(value, 10);
-      if (Number.isNaN(q)) q = minQty;
-
-      q = Math.max(minQty, q);
-      if (maxQty > 0) q = Math.min(maxQty, q);
-
-      qtyInput.value = q;
-      updateButtons(q);
-      recalc();
-    };
-
-    qtyMinus.addEventListener("click", () => clampAndSet(Number(qtyInput.value || minQty) - 1));
-    qtyPlus.addEventListener("click", () => clampAndSet(Number(qtyInput.value || minQty) + 1));
-
-    qtyInput.addEventListener("input", () => clampAndSet(qtyInput.value));
-    qtyInput.addEventListener("blur", () => clampAndSet(qtyInput.value));
-
-    clampAndSet(qtyInput.value);
-  }
-
-  document.querySelectorAll(".product-thumb-btn").forEach((btn) => {
-    btn.addEventListener("click", () => {
-      const full = btn.getAttribute("data-full");
-      const main = document.getElementById("mainProductImage");
-      if (full && main) main.src = full;
-    });
-  });
-});
-
-/* Cart */
-/* Cart */
-(function () {
-  const d = document;
-
-  function getCookie(name) {
-    const m = d.cookie.match("(^|;)\\s*" + name + "\\s*=\\s*([^;]+)");
-    return m ? m.pop() : "";
-  }
-
-  let currencyFormatter = null;
-
-  function makeCurrencyFormatter() {
-    const routesEl = d.getElementById("cartRoutes");
-
-    const locale = (routesEl && routesEl.dataset.locale) || navigator.language || "en-US";
-    const currency = (routesEl && routesEl.dataset.currency) || "USD";
-
-    return new Intl.NumberFormat(locale, {
-      style: "currency",
-      currency: currency,
-      minimumFractionDigits: 2,
-      maximumFractionDigits: 2
-    });
-  }
-
-  function toNumber(v) {
-    const s = String(v ?? "0");
-    const cleaned = s.replace(/[^0-9.\-]/g, "");
-    const n = Number(cleaned);
-    return Number.isFinite(n) ? n : 0;
-  }
-
-  function money(v) {
-    if (!currencyFormatter) currencyFormatter = makeCurrencyFormatter();
-    return currencyFormatter.format(toNumber(v));
-  }
-
-  function emptyStateHTML() {
-    return `
-      <div class="cart-empty-state text-center">
-        <div class="icon-button icon-button--gradient-border mx-auto mb-2" style="width:54px;height:54px;">
-          <i class="fa-solid fa-cart-shopping"></i>
-        </div>
-        <div class="fw-semibold">Your cart is empty</div>
-        <div class="text-body-sm text-muted">Add an item to get started.</div>
-      </div>
-    `;
-  }
-
-  function updateCartBadges(totalQty) {
-    const qty = parseInt(totalQty, 10) || 0;
-    d.querySelectorAll(".cart-badge").forEach((b) => {
-      b.textContent = qty;
-      if (qty > 0) b.classList.remove("is-hidden");
-      else b.classList.add("is-hidden");
-      b.classList.remove("pop");
-      void b.offsetWidth;
-      b.classList.add("pop");
-    });
-  }
-
-  // ✅ Cart marquee: ONLY when overflowing, and moves LEFT -> RIGHT (reverse)
-  function applyCartTitleMarquee(wrap) {
-    if (!wrap) return;
-
-    const prefersReduced = window.matchMedia("(prefers-reduced-motion: reduce)").matches;
-
-    wrap.querySelectorAll(".js-cart-title").forEach((el) => {
-      const track = el.querySelector(".title-marquee-track");
-      const first = el.querySelector(".title-marquee-item");
-      if (!track || !first) return;
-
-      // reset
-      el.classList.remove("is-marquee");
-      track.style.animationDuration = "";
-      track.style.animationDirection = "";
-
-      if (prefersReduced) return;
-
-      const needs = first.scrollWidth > el.clientWidth + 2;
-      if (!needs) return;
-
-      // enable duplicate + animation
-      el.classList.add("is-marquee");
-
-      // after dup becomes visible, compute duration (slow) and reverse direction
-      requestAnimationFrame(() => {
-        const halfDistance = track.scrollWidth / 2; // because your keyframes go 0 -> -50%
-        const pxPerSec = 26; // slower = smaller number
-        let dur = halfDistance / pxPerSec;
-        dur = Math.min(45, Math.max(18, dur));
-
-        track.style.animationDuration = `${dur}s`;
-        track.style.animationDirection = "alternate";
-        track.style.animationIterationCount = "infinite";
-        track.style.animationTimingFunction = "linear";
-      });
-    });
-  }
-
-  function renderCart(payload) {
-    const wrap = d.getElementById("cartContent");
-    const totalEl = d.getElementById("cartTotal");
-
-    if (totalEl) totalEl.textContent = money(payload.total_price);
-    updateCartBadges(payload.total_qty);
-
-    if (!wrap) return;
-
-    if (!payload.items || !payload.items.length) {
-      wrap.innerHTML = emptyStateHTML();
-      return;
-    }
-
-    // ✅ borders/dividers look better without grid gap when multiple
-    wrap.classList.remove("gap-0", "gap-1", "gap-2", "gap-3", "gap-4", "gap-5");
-    wrap.classList.add(payload.items.length > 1 ? "gap-0" : "gap-3");
-
-    wrap.innerHTML = payload.items
-      .map((it, idx, arr) => {
-        const rx =
-          it.requires_prescription
-            ? `<span class="badge rounded-pill bg-warning-subtle text-warning-emphasis">Prescription</span>`
-            : it.requires_consultation
-            ? `<span class="badge rounded-pill bg-info-subtle text-info-emphasis">Consultation</span>`
-            : ``;
-
-        const hasDivider = arr.length > 1 && idx < arr.length - 1;
-
-        const stock = typeof it.stock === "number" && it.stock > 0 ? it.stock : 999999;
-        const decDisabled = it.qty <= 1 ? "disabled" : "";
-        const incDisabled = it.qty >= stock ? "disabled" : "";
-
-        return `
-        <div class="${hasDivider ? "border-bottom pb-3 mb-3" : ""}">
-          <div class="bg-white rounded-4 p-3">
-            <div class="d-flex gap-3 align-items-start">
-              <div class="ratio ratio-1x1 rounded-3 overflow-hidden bg-muted flex-shrink-0" style="width:64px;">
-                ${it.image ? `<img src="${it.image}" class="w-100 h-100 object-fit-cover" alt="">` : ``}
-              </div>
-
-              <div class="flex-grow-1 min-w-0">
-                <div class="d-flex align-items-start justify-content-between gap-2">
-                  <div class="min-w-0 flex-grow-1">
-                    <!-- ✅ Title line: marquee only if long, stays one line -->
-                    <div class="title-marquee js-cart-title min-w-0">
-                      <div class="title-marquee-track">
-                        <span class="title-marquee-item fw-semibold">${it.name}</span>
-                        <span class="title-marquee-item title-marquee-item-dup fw-semibold" aria-hidden="true">${it.name}</span>
-                      </div>
-                    </div>
-
-                    <!-- ✅ Prescription/Consultation UNDER the title (only if exists) -->
-                    ${rx ? `<div class="mt-1">${rx}</div>` : ``}
-
-                    <div class="text-caption-sm text-muted mt-1">${money(it.unit_price)} each</div>
-                  </div>
-
-                  <button class="icon-button text-danger opacity-75 flex-shrink-0"
-                          type="button"
-                          aria-label="Remove item"
-                          data-action="remove"
-                          data-product="${it.id}">
-                    <i class="fa-solid fa-trash-can"></i>
-                  </button>
-                </div>
-
-                <div class="d-flex align-items-center justify-content-between gap-2 mt-3">
-                  <div class="input-group input-group-sm flex-shrink-0" style="max-width:160px;">
-                    <button class="btn btn-outline-secondary"
-                            type="button"
-                            data-action="dec"
-                            data-product="${it.id}"
-                            ${decDisabled}
-                            aria-label="Decrease quantity">
-                      <i class="fa-solid fa-minus"></i>
-                    </button>
-
-                    <input class="form-control text-center"
-                           type="number"
-                           min="1"
-                           max="${stock}"
-                           value="${it.qty}"
-                           inputmode="numeric"
-                           autocomplete="off"
-                           data-action="qty"
-                           data-product="${it.id}">
-
-                    <button class="btn btn-outline-secondary"
-                            type="button"
-                            data-action="inc"
-                            data-product="${it.id}"
-                            ${incDisabled}
-                            aria-label="Increase quantity">
-                      <i class="fa-solid fa-plus"></i>
-                    </button>
-                  </div>
-
-                  <div class="fw-semibold flex-shrink-0">${money(it.line_total)}</div>
-                </div>
-              </div>
-            </div>
-          </div>
-        </div>
-      `;
-      })
-      .join("");
-
-    // ✅ activate marquee after DOM is injected
-    applyCartTitleMarquee(wrap);
-  }
-
-  async function getJSON(url) {
-    if (!url) return null;
-    const res = await fetch(url, { headers: { "X-Requested-With": "XMLHttpRequest" } });
-    return await res.json().catch(() => null);
-  }
-
-  async function postAction(url, body) {
-    if (!url) return null;
-    const res = await fetch(url, {
-      method: "POST",
-      headers: {
-        "Content-Type": "application/x-www-form-urlencoded",
-        "X-CSRFToken": getCookie("csrftoken"),
-        "X-Requested-With": "XMLHttpRequest"
-      },
-      body: new URLSearchParams(body)
-    });
-    return await res.json().catch(() => null);
-  }
-
-  d.addEventListener("DOMContentLoaded", async () => {
-    const routesEl = d.getElementById("cartRoutes");
-    if (!routesEl) return;
-
-    currencyFormatter = makeCurrencyFormatter();
-
-    const totalEl = d.getElementById("cartTotal");
-    if (totalEl && totalEl.parentElement) {
-      totalEl.parentElement.childNodes.forEach((n) => {
-        if (n.nodeType === Node.TEXT_NODE && n.textContent.trim() !== "") n.textContent = "";
-      });
-    }
-
-    const routes = {
-      summary: routesEl.dataset.cartSummaryUrl,
-      add: routesEl.dataset.cartAddUrl,
-      update: routesEl.dataset.cartUpdateUrl,
-      remove: routesEl.dataset.cartRemoveUrl
-    };
-
-    const init = await getJSON(routes.summary);
-    if (init && init.ok) renderCart(init);
-
-    const off = d.getElementById("cartOffcanvas");
-    if (off && window.bootstrap) {
-      off.addEventListener("shown.bs.offcanvas", async () => {
-        const data = await getJSON(routes.summary);
-        if (data && data.ok) renderCart(data);
-      });
-    }
-
-    d.addEventListener("click", async (e) => {
-      const btn = e.target.closest(".js-add-to-cart");
-      if (!btn) return;
-      if (btn.disabled) return;
-
-      const productId = btn.dataset.product;
-      if (!productId) {
-        console.warn("Missing data-product on add-to-cart button", btn);
-        return;
-      }
-
-      let qty = 1;
-
-      const selector = btn.dataset.qtyInput;
-      if (selector) {
-        const el = d.querySelector(selector);
-        if (el) qty = parseInt(el.value, 10) || 1;
-      } else {
-        const card = btn.closest(".product-card, article, .product-card-wrapper") || d;
-        const el = card.querySelector(".js-qty") || d.getElementById("qtyInput");
-        if (el) qty = parseInt(el.value, 10) || 1;
-      }
-
-      qty = Math.max(1, qty);
-
-      const addUrl = btn.dataset.cartAddUrl || routes.add;
-      const summaryUrl = btn.dataset.cartSummaryUrl || routes.summary;
-
-      btn.disabled = true;
-
-      try {
-        const data = await postAction(addUrl, { product_id: productId, qty: qty });
-
-        if (!data || !data.ok) {
-          alert(data && data.error ? data.error : "Failed to add to cart");
-          return;
-        }
-
-        const sum = await getJSON(summaryUrl);
-        if (sum && sum.ok) renderCart(sum);
-      } finally {
-        btn.disabled = false;
-      }
-    });
-
-    const wrap = d.getElementById("cartContent");
-    if (!wrap) return;
-
-    wrap.addEventListener("click", async (e) => {
-      const btn = e.target.closest('button[data-action]');
-      if (!btn) return;
-
-      const action = btn.dataset.action;
-      const productId = btn.dataset.product;
-      if (!productId) return;
-
-      btn.disabled = true;
-
-      try {
-        if (action === "remove") {
-          const data = await postAction(routes.remove, { product_id: productId });
-          if (data && data.ok) renderCart(data);
-          return;
-        }
-
-        if (action === "inc" || action === "dec") {
-          const input = wrap.querySelector(`input[data-action="qty"][data-product="${productId}"]`);
-          if (!input) return;
-
-          let q = parseInt(input.value, 10) || 1;
-          q = action === "inc" ? q + 1 : q - 1;
-          q = Math.max(1, q);
-
-          const max = parseInt(input.getAttribute("max"), 10);
-          if (!Number.isNaN(max)) q = Math.min(q, max);
-
-          const data = await postAction(routes.update, { product_id: productId, qty: q });
-          if (data && data.ok) renderCart(data);
-        }
-      } finally {
-        btn.disabled = false;
-      }
-    });
-
-    wrap.addEventListener("change", async (e) => {
-      const input = e.target.closest('input[data-action="qty"]');
-      if (!input) return;
-
-      const productId = input.dataset.product;
-      let q = parseInt(input.value, 10) || 1;
-      q = Math.max(1, q);
-
-      const max = parseInt(input.getAttribute("max"), 10);
-      if (!Number.isNaN(max)) q = Math.min(q, max);
-
-      const data = await postAction(routes.update, { product_id: productId, qty: q });
-      if (data && data.ok) renderCart(data);
-    });
-
-    // ✅ keep marquee correct on resize
-    let t;
-    window.addEventListener("resize", () => {
-      clearTimeout(t);
-      t = setTimeout(() => applyCartTitleMarquee(d.getElementById("cartContent")), 120);
-    });
-  });
-})();
-
-
-/* Sidebar Panel Animations */
-document.addEventListener("DOMContentLoaded", () => {
-  const panel = document.getElementById("fsmdSidebarPanel");
-  if (!panel) return;
-
-  panel.addEventListener("shown.bs.offcanvas", () => {
-    panel.querySelectorAll(".fade-blocked").forEach((el) => el.classList.remove("fade-blocked"));
-    panel.querySelectorAll(".fade-in").forEach((el) => el.classList.add("fade-play"));
-  });
-});
-
-  (function(){
-    const applyMarquee = () => {
-      document.querySelectorAll("[data-title-marquee]").forEach(el => {
-        const track = el.querySelector(".title-marquee-track");
-        const first = el.querySelector(".title-marquee-item");
-        if (!track || !first) return;
-        el.classList.remove("is-marquee");
-        const needs = first.scrollWidth > el.clientWidth + 2;
-        if (needs) el.classList.add("is-marquee");
-      });
-    };
-
-    const wireDescToggles = () => {
-      document.querySelectorAll("[data-desc-toggle]").forEach(btn => {
-        const targetSel = btn.getAttribute("data-bs-target");
-        const collapseEl = targetSel ? document.querySelector(targetSel) : null;
-        const label = btn.querySelector("[data-desc-toggle-label]");
-        const card = btn.closest(".product-card");
-        const clamp = card ? card.querySelector("[data-desc-clamp]") : null;
-        if (!collapseEl || !label) return;
-
-        const setState = (expanded) => {
-          label.textContent = expanded ? "Hide" : "See more…";
-          if (clamp) clamp.style.display = expanded ? "none" : "-webkit-box";
-        };
-
-        collapseEl.addEventListener("show.bs.collapse", () => setState(true));
-        collapseEl.addEventListener("hide.bs.collapse", () => setState(false));
-        setState(false);
-      });
-    };
-
-    const init = () => {
-      applyMarquee();
-      wireDescToggles();
-    };
-
-    if (document.readyState === "loading") document.addEventListener("DOMContentLoaded", init);
-    else init();
-
-    let t;
-    window.addEventListener("resize", () => {
-      clearTimeout(t);
-      t = setTimeout(applyMarquee, 120);
-    });
-  })();
\ No newline at end of file
@@ -0,0 +1,19 @@
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+
+class StaticStorage(CompressedManifestStaticFilesStorage):
+    """
+    Content-hashed names plus gzip/brotli variants written at collectstatic time.
+
+    Lenient about missing files: a template referencing a file that doesn't exist (e.g. an
+    OG image that hasn't been added yet) renders the unhashed URL, a 404 for that one
+    asset, instead of a 500 for the whole page.
+    """
+
+    manifest_strict = False
+
+    def stored_name(self, name):
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            return name
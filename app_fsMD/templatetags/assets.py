@@ -0,0 +1,118 @@
+import json
+
+from django import template
+from django.conf import settings
+from django.templatetags.static import static
+from django.utils.html import format_html, format_html_join, mark_safe
+
+from ..assets import (
+    CSS_BUNDLES,
+    JS_MODULES,
+    PAGE_CSS,
+    RESPONSIVE_FORMATS,
+    bundle_path,
+    critical_path,
+    module_path,
+    read_build_file,
+    responsive_manifest,
+)
+
+register = template.Library()
+
+
+def _files(bundles: dict, name: str, ext: str) -> list:
+    if name not in bundles:
+        raise template.TemplateSyntaxError(f"Unknown {ext} bundle {name!r}.")
+    if getattr(settings, "STATIC_BUNDLES", False):
+        return [bundle_path(name, ext)]
+    return bundles[name]
+
+
+@register.simple_tag
+def css_bundle(name):
+    return format_html_join(
+        "\n    ",
+        '<link rel="stylesheet" href="{}">',
+        ((static(path),) for path in _files(CSS_BUNDLES, name, "css")),
+    )
+
+
+@register.simple_tag
+def page_css(page_type):
+    """
+    {% page_css "legal" %}
+
+    The stylesheets a page type needs. With CRITICAL_CSS on and critical/<type>.css built,
+    the critical rules are inlined and the bundles are preloaded instead of blocking render.
+    """
+    if page_type not in PAGE_CSS:
+        raise template.TemplateSyntaxError(f"Unknown page type {page_type!r}.")
+    hrefs = [static(path) for name in PAGE_CSS[page_type] for path in _files(CSS_BUNDLES, name, "css")]
+
+    critical = None
+    if getattr(settings, "CRITICAL_CSS", False):
+        critical = read_build_file(critical_path(page_type))
+    if critical is None:
+        return format_html_join("\n    ", '<link rel="stylesheet" href="{}">', ((href,) for href in hrefs))
+
+    deferred = format_html_join(
+        "\n    ",
+        '<link rel="preload" href="{}" as="style" onload="this.onload=null;this.rel=\'stylesheet\'">',
+        ((href,) for href in hrefs),
+    )
+    fallback = format_html_join("", '<link rel="stylesheet" href="{}">', ((href,) for href in hrefs))
+    # The CSS is our own build output; only a closing </style> could break out of it.
+    inline = mark_safe(critical.replace("</", "<\\/"))
+    return format_html("<style>{}</style>\n    {}\n    <noscript>{}</noscript>", inline, deferred, fallback)
+
+
+@register.simple_tag
+def js_modules():
+    """
+    {% js_modules %}
+
+    The import map for the feature modules ("fsmd/<name>" -> static URL, hashed in
+    production) and the main module that imports them on demand.
+    """
+    bundled = getattr(settings, "STATIC_BUNDLES", False)
+    urls = {name: static(module_path(name) if bundled else source) for name, source in JS_MODULES.items()}
+    importmap = json.dumps({"imports": {f"fsmd/{name}": url for name, url in urls.items() if name != "main"}})
+    return format_html(
+        '<script type="importmap">{}</script>\n    <script type="module" src="{}"></script>',
+        mark_safe(importmap.replace("<", "\\u003c")),
+        urls["main"],
+    )
+
+
+@register.simple_tag
+def static_img(path, alt="", sizes="100vw", **attrs):
+    """
+    {% static_img "images/home/faq.jpg" alt="..." class="img-fluid" sizes="(min-width: 992px) 40vw, 100vw" %}
+
+    A <picture> with AVIF/WebP srcsets when optimize_static_images has built variants
+    for the file, otherwise a plain <img>. The original stays the <img> fallback.
+    """
+    entry = responsive_manifest().get(path)
+    attrs.setdefault("loading", "lazy")
+    attrs.setdefault("decoding", "async")
+    if entry:
+        attrs.setdefault("width", entry["width"])
+        attrs.setdefault("height", entry["height"])
+
+    img = format_html(
+        '<img src="{}" alt="{}"{}>',
+        static(path),
+        alt,
+        format_html_join("", ' {}="{}"', ((k.replace("_", "-"), v) for k, v in attrs.items())),
+    )
+    if not entry:
+        return img
+
+    sources = []
+    for ext in RESPONSIVE_FORMATS:
+        variants = entry["variants"].get(ext)
+        if not variants:
+            continue
+        srcset = ", ".join(f"{static(variant)} {width}w" for width, variant, _ in variants)
+        sources.append(format_html('<source type="image/{}" srcset="{}" sizes="{}">', ext, srcset, sizes))
+    return format_html("<picture>{}{}</picture>", mark_safe("".join(sources)), img)
@@ -0,0 +1,27 @@
+from django import template
+
+from ..fragments import render_fragment
+
+register = template.Library()
+
+
+class CachedIncludeNode(template.Node):
+    def __init__(self, template_name):
+        self.template_name = template_name
+
+    def render(self, context):
+        return render_fragment(self.template_name.resolve(context), context)
+
+
+@register.tag
+def cached_include(parser, token):
+    """
+    {% cached_include "home/h_prdcts.html" %}
+
+    Like {% include %} with the parent context, but served from the fragment cache
+    keyed by the dependencies declared for the template in fragments.FRAGMENTS.
+    """
+    bits = token.split_contents()
+    if len(bits) != 2:
+        raise template.TemplateSyntaxError(f"{bits[0]} takes exactly one template name.")
+    return CachedIncludeNode(parser.compile_filter(bits[1]))
@@ -1,3 +1,592 @@
-from django.test import TestCase
+import csv
+import json
+import os
+import shutil
+import tempfile
+import time
+from datetime import timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+from io import BytesIO, StringIO
+from unittest import mock
 
-# Create your tests here.
+from PIL import Image
+
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.http import QueryDict
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from . import autocomplete, exports, newsletter, related, search, sitemaps
+from .assets import minify_js
+from .bulk import bulk_update
+from .autocomplete import PrefixIndex
+from .facets import FacetIndex, parse_filters
+from .cart_events import CURSOR_NAME, SETTLE_SECONDS, aggregate
+from .models import (
+    AggregationCursor, BlogPost, CartEvent, Category, NewsletterSubscription, Product, ProductImage, ProductPair,
+)
+from .management.commands.gc_media import delete_if_orphan
+from .signals import bump_counts
+from .utils.buffers import BufferedWriter
+from .sitemaps import flush_sitemaps
+from .utils.images import convert_imagefield_to_webp, is_cas_name
+from .views import _client_ip
+
+LOCMEM_CACHE = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "ratelimit": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "ratelimit"},
+}
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class AppTestCase(TestCase):
+    """
+    Caches per test process, write-behind buffers without their threads, and sitemap
+    shards built into a temp dir: on-commit callbacks run by
+    captureOnCommitCallbacks(execute=True) must not touch the real SITEMAP_DIR.
+    """
+
+    def setUp(self):
+        super().setUp()
+        # Write-behind buffers flush when a test says so, not from their threads mid-test.
+        threads = mock.patch.object(BufferedWriter, "threaded", False)
+        threads.start()
+        self.addCleanup(threads.stop)
+        sitemap_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, sitemap_dir, True)
+        override = self.settings(SITEMAP_DIR=sitemap_dir)
+        override.enable()
+        self.addCleanup(override.disable)
+        # Cleanups run last-in first: whatever the test queued is written now, into the
+        # test database and the temp dir, not by the writer threads or at exit after the
+        # test database is gone.
+        self.addCleanup(flush_sitemaps)
+        self.addCleanup(related.flush_related)
+        self.addCleanup(newsletter.flush_subscriptions)
+
+
+class CartPairAggregationTests(AppTestCase):
+    def _add(self, basket, product_id, age):
+        return CartEvent.objects.create(
+            basket=basket,
+            product_id=product_id,
+            action=CartEvent.Action.ADD,
+            created_at=timezone.now() - timedelta(seconds=age),
+        )
+
+    def _pairs(self):
+        return {(a, b): n for a, b, n in ProductPair.objects.values_list("product_a", "product_b", "carts")}
+
+    def test_unsettled_event_below_settled_ones_is_not_skipped(self):
+        old = SETTLE_SECONDS + 30
+        self._add(1, 10, old)
+        late = self._add(1, 11, 5)  # lower id than the next event, still inside the window
+        self._add(1, 12, old)
+
+        aggregate()
+        self.assertLess(AggregationCursor.objects.get(name=CURSOR_NAME).last_id, late.id)
+        self.assertEqual(self._pairs(), {(10, 10): 1})
+
+        CartEvent.objects.filter(pk=late.pk).update(created_at=timezone.now() - timedelta(seconds=old))
+        aggregate()
+        self.assertEqual(
+            self._pairs(),
+            {(10, 10): 1, (11, 11): 1, (12, 12): 1, (10, 11): 1, (10, 12): 1, (11, 12): 1},
+        )
+
+
+class ClientIPTests(SimpleTestCase):
+    def _ip(self, remote, forwarded=None):
+        extra = {"REMOTE_ADDR": remote}
+        if forwarded is not None:
+            extra["HTTP_X_FORWARDED_FOR"] = forwarded
+        return _client_ip(RequestFactory().get("/", **extra))
+
+    def test_forwarded_header_ignored_without_trusted_proxies(self):
+        with self.settings(TRUSTED_PROXIES=[]):
+            self.assertEqual(self._ip("10.0.0.2", "203.0.113.9"), "10.0.0.2")
+
+    def test_right_most_untrusted_hop_behind_trusted_proxy(self):
+        with self.settings(TRUSTED_PROXIES=["10.0.0.0/8"]):
+            self.assertEqual(self._ip("10.0.0.2", "198.51.100.1, 203.0.113.9, 10.0.0.7"), "203.0.113.9")
+            # Not from the proxy: the header is the client's own claim.
+            self.assertEqual(self._ip("192.0.2.4", "203.0.113.9"), "192.0.2.4")
+
+
+class MinifyJsTests(SimpleTestCase):
+    def test_template_literal_lines_kept_verbatim(self):
+        source = (
+            "function row(it) {\n"
+            "  // a comment\n"
+            "  return `\n"
+            "    <li>\n"
+            "// not a comment\n"
+            "      ${it.ok ? `<b>${it.name}</b>` : ``}\n"
+            "    </li>  \n"
+            "  `;\n"
+            "}\n"
+        )
+        self.assertEqual(
+            minify_js(source),
+            "function row(it) {\n"
+            "return `\n"
+            "    <li>\n"
+            "// not a comment\n"
+            "      ${it.ok ? `<b>${it.name}</b>` : ``}\n"
+            "    </li>  \n"
+            "  `;\n"
+            "}\n",
+        )
+
+    def test_backticks_in_strings_and_comments_ignored(self):
+        source = "const a = \"`\";  // `\n  /* ` */\n  const b = 1;\n"
+        self.assertEqual(minify_js(source), "const a = \"`\";  // `\nconst b = 1;\n")
+
+
+class PrefixIndexTests(SimpleTestCase):
+    def test_name_starts_before_later_words_then_kind_and_length(self):
+        index = PrefixIndex(1, [
+            ("GLP Research Notes", "/blog/?slug=glp", "post", "glp"),
+            ("Semaglutide (GLP-1)", "/p/semaglutide/", "product", "semaglutide"),
+            ("GLP-1 Agonists", "/c/glp/", "program", "glp"),
+            ("GLP-1 Pen", "/p/glp-pen/", "product", "glp-pen"),
+        ])
+        self.assertEqual(
+            [label for label, _, _ in index.lookup("glp")],
+            ["GLP-1 Agonists", "GLP-1 Pen", "GLP Research Notes", "Semaglutide (GLP-1)"],
+        )
+        self.assertEqual(index.lookup("g"), [])
+        self.assertEqual(index.lookup("glp", limit=2), index.lookup("glp")[:2])
+
+    def test_scan_capped_per_group(self):
+        index = PrefixIndex(1, [(f"Peptide {i}", f"/p/{i}/", "product", "") for i in range(10)])
+        self.assertEqual(len(index.lookup("pep")), autocomplete.MAX_SUGGESTIONS)
+        with mock.patch.object(autocomplete, "MAX_SCAN", 3):
+            self.assertEqual([label for label, _, _ in index.lookup("pep")], ["Peptide 0", "Peptide 1", "Peptide 2"])
+
+
+class FacetIndexTests(SimpleTestCase):
+    def setUp(self):
+        weight = SimpleNamespace(slug="weight", name="Weight", kind="program")
+        skin = SimpleNamespace(slug="skin", name="Skin", kind="program")
+        rows = [  # category, price, in stock
+            (weight, "30", True), (weight, "10", False), (weight, "50", True), (skin, "20", True), (skin, "40", False),
+        ]
+        products = [
+            SimpleNamespace(
+                id=i, name=f"P{i}", url=f"/p/{i}/", category=category, main_image_url="", price=Decimal(price),
+                final_price=Decimal(price), requires_prescription=False, requires_consultation=False,
+                quantity=int(stock), created_at=i,
+            )
+            for i, (category, price, stock) in enumerate(rows)
+        ]
+        self.index = FacetIndex(SimpleNamespace(version=1, products=products, categories=[weight, skin]))
+
+    def _listing(self, **params):
+        query = QueryDict(mutable=True)
+        for key, value in params.items():
+            query.setlist(key, value if isinstance(value, list) else [value])
+        return self.index.listing(parse_filters(query))
+
+    def test_counts_leave_their_own_facet_out(self):
+        listing = self._listing(category="weight", in_stock="1")
+        self.assertEqual(listing["count"], 2)
+        # Other categories are counted under the stock filter only, so picking one more
+        # is shown with what it would add.
+        self.assertEqual({c["slug"]: c["count"] for c in listing["facets"]["category"]}, {"weight": 2, "skin": 1})
+        self.assertEqual(listing["facets"]["in_stock"], {"true": 2, "false": 1})
+        self.assertEqual(listing["facets"]["price"], {"min": "30", "max": "50"})
+
+    def test_price_range_ignores_the_price_filter(self):
+        listing = self._listing(price_min="60")
+        self.assertEqual((listing["count"], listing["results"]), (0, []))
+        self.assertEqual(listing["facets"]["price"], {"min": "10", "max": "50"})
+
+    def test_no_price_range_when_other_filters_match_nothing(self):
+        listing = self._listing(kind="peptide", price_min="15")
+        self.assertEqual(listing["count"], 0)
+        self.assertIsNone(listing["facets"]["price"])
+        self.assertEqual(listing["facets"]["kind"], {"program": 4})
+
+
+class ExportTests(AppTestCase):
+    NAMES = ["=HYPERLINK(\"http://x\")", "+1", "-2", "@SUM(A1)", "Plain"]
+
+    def setUp(self):
+        super().setUp()
+        with self.captureOnCommitCallbacks(execute=True):
+            category = Category.objects.create(name="Recovery", slug="recovery")
+            self.ids = [
+                Product.objects.create(category=category, name=name, slug=f"p-{i}", price=Decimal("10.00")).pk
+                for i, name in enumerate(self.NAMES)
+            ]
+        # Several fetches and one block per line, so the rows really arrive piecemeal.
+        for name, value in (("EXPORT_CHUNK", 2), ("WRITE_BYTES", 1)):
+            patcher = mock.patch.object(exports, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _export(self, fmt):
+        response = exports.export_response(
+            Product.objects.order_by("-name"), ["id", "name"], fmt, "products", ["ID", "Name"]
+        )
+        blocks = [b.decode() for b in response.streaming_content]
+        return response, blocks
+
+    def test_csv_escapes_formulas_and_streams_in_pk_order(self):
+        response, blocks = self._export("csv")
+        self.assertTrue(response.streaming)
+        self.assertEqual(len(blocks), len(self.NAMES) + 1)
+        self.assertTrue(blocks[0].startswith("\ufeff"))
+        rows = list(csv.reader("".join(blocks).lstrip("\ufeff").splitlines()))
+        self.assertEqual(rows[0], ["ID", "Name"])
+        self.assertEqual([int(row[0]) for row in rows[1:]], self.ids)
+        self.assertEqual([row[1] for row in rows[1:]], ["'" + name for name in self.NAMES[:4]] + ["Plain"])
+
+    def test_jsonl_keeps_values_as_they_are(self):
+        _, blocks = self._export("jsonl")
+        self.assertEqual(
+            [json.loads(line) for line in blocks],
+            [{"ID": pk, "Name": name} for pk, name in zip(self.ids, self.NAMES)],
+        )
+
+
+class NewsletterTests(AppTestCase):
+    def test_resubscribe_after_unsubscribe_is_written(self):
+        email = "reader@example.com"
+        self.assertEqual(newsletter.subscribe(email, "192.0.2.1"), newsletter.OK)
+        newsletter.flush_subscriptions()
+        self.assertEqual(newsletter.unsubscribe([email]), 1)
+
+        self.assertEqual(newsletter.subscribe(email, "192.0.2.1"), newsletter.OK)
+        newsletter.flush_subscriptions()
+        self.assertTrue(NewsletterSubscription.objects.get(email=email).is_active)
+
+    def test_rate_limit_per_client_ip(self):
+        results = [newsletter.subscribe(f"reader{i}@example.com", "192.0.2.7") for i in range(newsletter.RATE_LIMIT + 1)]
+        self.assertEqual(results[-2:], [newsletter.OK, newsletter.LIMITED])
+        self.assertEqual(newsletter.subscribe("other@example.com", "192.0.2.8"), newsletter.OK)
+
+    def test_get_redirects_back(self):
+        response = self.client.get(reverse("newsletter_subscribe"), HTTP_REFERER="http://testserver/about/")
+        self.assertRedirects(response, "http://testserver/about/", fetch_redirect_response=False)
+
+
+class CacheBumpTests(AppTestCase):
+    def setUp(self):
+        super().setUp()
+        with self.captureOnCommitCallbacks(execute=True):
+            category = Category.objects.create(name="Recovery", slug="recovery")
+            self.product = Product.objects.create(
+                category=category, name="BPC-157", slug="bpc-157", price=Decimal("49.00")
+            )
+            self.images = [
+                ProductImage.objects.create(product=self.product, image=f"products/gallery/bpc-{i}.webp", sort_order=i)
+                for i in range(2)
+            ]
+        self.client.force_login(User.objects.create_superuser("admin", "admin@example.com", "pw"))
+        bump_counts.clear()
+
+    def _form(self):
+        product = self.product
+        data = {
+            "category": product.category_id,
+            "name": product.name,
+            "slug": product.slug,
+            "price": "55.00",
+            "quantity": 3,
+            "discount_type": product.discount_type,
+            "discount_value": product.discount_value,
+            "is_active": "on",
+            "images-TOTAL_FORMS": len(self.images),
+            "images-INITIAL_FORMS": len(self.images),
+            "images-MIN_NUM_FORMS": 0,
+            "images-MAX_NUM_FORMS": 1000,
+        }
+        for i, image in enumerate(self.images):
+            data.update({
+                f"images-{i}-id": image.pk,
+                f"images-{i}-product": product.pk,
+                f"images-{i}-alt_text": f"Vial, view {i}",
+                f"images-{i}-sort_order": i,
+                f"images-{i}-is_active": "on",
+            })
+        return data
+
+    def test_admin_save_with_inlines_bumps_once(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(f"/admin/app_fsMD/product/{self.product.pk}/change/", self._form())
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(ProductImage.objects.filter(alt_text__startswith="Vial").count(), 2)
+        self.assertEqual(bump_counts["site_cache_v"], 1)
+
+    def test_rollback_bumps_nothing(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                self.product.save()
+                ProductImage.objects.filter(pk=self.images[0].pk).delete()
+                transaction.set_rollback(True)
+        self.assertEqual(sum(bump_counts.values()), 0)
+
+
+class BulkUpdateTests(AppTestCase):
+    def setUp(self):
+        super().setUp()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.recovery = Category.objects.create(name="Recovery", slug="recovery")
+            self.skin = Category.objects.create(name="Skin", slug="skin")
+            self.products = [
+                Product.objects.create(
+                    category=self.recovery, name=f"Peptide {i}", slug=f"peptide-{i}", price=Decimal("10.00")
+                )
+                for i in range(3)
+            ]
+        bump_counts.clear()
+
+    def _counts(self):
+        return dict(Category.objects.values_list("slug", "active_product_count"))
+
+    def test_one_bump_for_the_whole_set(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            rows = bulk_update(Product.objects.filter(category=self.recovery), is_active=False)
+        self.assertEqual(rows, 3)
+        self.assertEqual(bump_counts["site_cache_v"], 1)
+        self.assertEqual(bump_counts["search_v"], 1)
+        self.assertEqual(self._counts(), {"recovery": 0, "skin": 0})
+
+    def test_move_to_category_refreshes_both_counts(self):
+        self.assertEqual(self._counts(), {"recovery": 3, "skin": 0})
+        self.client.force_login(User.objects.create_superuser("admin", "admin@example.com", "pw"))
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post("/admin/app_fsMD/product/", {
+                "action": "move_to_category",
+                "index": 0,
+                "_selected_action": [p.pk for p in self.products[:2]],
+                "category": self.skin.pk,
+            })
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(Product.objects.filter(category=self.skin).count(), 2)
+        self.assertEqual(self._counts(), {"recovery": 1, "skin": 2})
+        self.assertEqual(bump_counts["site_cache_v"], 1)
+
+
+class RelatedUpdateTests(AppTestCase):
+    def setUp(self):
+        super().setUp()
+        with self.captureOnCommitCallbacks(execute=True):
+            category = Category.objects.create(name="Recovery", slug="recovery")
+            self.products = [
+                Product.objects.create(category=category, name=f"Peptide {i}", slug=f"peptide-{i}", price=Decimal("10.00"))
+                for i in range(4)
+            ]
+        related.flush_related()
+        related.rebuild_related()
+
+    def test_save_is_queued_and_applied_by_flush(self):
+        first = self.products[0]
+        self.assertIn(self.products[1].pk, related.listed_by([first.pk]))
+        version = related.related_version()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.is_active = False
+            first.save()
+        self.assertEqual(related.related_version(), version)  # nothing recomputed in the request
+
+        related.flush_related()
+        table = related.neighbour_table()
+        self.assertNotIn(first.pk, table)
+        self.assertNotIn(first.pk, table[self.products[1].pk])
+        self.assertEqual(related.listed_by([first.pk]), set())
+        self.assertEqual(related.listed_by([self.products[1].pk]), {p.pk for p in self.products[2:]})
+
+
+class WebPUploadTests(AppTestCase):
+    def setUp(self):
+        super().setUp()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        override = self.settings(MEDIA_ROOT=media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def _upload(self, data):
+        category = Category(name="Recovery", slug="recovery", image=SimpleUploadedFile("vial.webp", data))
+        convert_imagefield_to_webp(category, "image", max_px=100)
+        return category.image
+
+    def _webp(self, size):
+        out = BytesIO()
+        Image.new("RGB", size, "teal").save(out, format="WEBP")
+        return out.getvalue()
+
+    def test_small_webp_is_stored_as_uploaded_under_cas_name(self):
+        data = self._webp((80, 40))
+        image = self._upload(data)
+        self.assertTrue(is_cas_name(image.name))
+        with image.storage.open(image.name) as fh:
+            self.assertEqual(fh.read(), data)
+        self.assertEqual(self._upload(data).name, image.name)
+
+    def test_large_webp_is_resized(self):
+        image = self._upload(self._webp((400, 200)))
+        self.assertTrue(is_cas_name(image.name))
+        with image.storage.open(image.name) as fh, Image.open(fh) as im:
+            self.assertEqual(im.size, (100, 50))
+
+
+class ListEditableTests(AppTestCase):
+    def setUp(self):
+        super().setUp()
+        self.posts = [
+            BlogPost.objects.create(
+                title=f"Post {i}", slug=f"post-{i}", excerpt="Excerpt", body="Body", main_image="blog/post.webp", sort_order=i
+            )
+            for i in range(4)
+        ]
+        self.client.force_login(User.objects.create_superuser("admin", "admin@example.com", "pw"))
+
+    def test_rows_with_the_same_changes_are_one_update(self):
+        data = {"_save": "Save", "form-TOTAL_FORMS": 4, "form-INITIAL_FORMS": 4}
+        for i, post in enumerate(self.posts):
+            data[f"form-{i}-id"] = post.pk
+            # Three posts deactivated, the last one only moved.
+            data[f"form-{i}-sort_order"] = 9 if i == 3 else i
+            if i == 3:
+                data[f"form-{i}-is_active"] = "on"
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post("/admin/app_fsMD/blogpost/", data)
+        self.assertEqual(response.status_code, 302)
+        updates = [q["sql"] for q in queries if q["sql"].startswith('UPDATE "app_fsMD_blogpost"')]
+        self.assertEqual(len(updates), 2)
+        self.assertEqual(BlogPost.objects.filter(is_active=False).count(), 3)
+        self.assertEqual(BlogPost.objects.get(pk=self.posts[3].pk).sort_order, 9)
+
+
+class SearchTests(AppTestCase):
+    def setUp(self):
+        super().setUp()
+        with self.captureOnCommitCallbacks(execute=True):
+            category = Category.objects.create(name="Weight", slug="weight")
+            Product.objects.create(category=category, name="Semaglutide", slug="semaglutide", price=Decimal("10.00"))
+            # Newer, so it would come first if body hits weren't ranked below title hits.
+            Product.objects.create(
+                category=category, name="Tirzepatide", slug="tirzepatide", price=Decimal("10.00"),
+                long_details="Often compared with semaglutide.",
+            )
+
+    def _titles(self, query, **kwargs):
+        return [r["title"] for r in search.search(query, **kwargs)["results"]]
+
+    def test_title_hits_rank_above_body_hits(self):
+        self.assertEqual(self._titles("semaglu"), ["Semaglutide", "Tirzepatide"])
+        self.assertEqual(self._titles("compared"), ["Tirzepatide"])
+
+    def test_typo_retried_with_closest_title_word(self):
+        result = search.search("tirzepatyde")
+        self.assertEqual(result["corrected"], "tirzepatide")
+        self.assertEqual([r["title"] for r in result["results"]], ["Tirzepatide"])
+
+    def test_no_correction_when_something_matches(self):
+        self.assertIsNone(search.search("tirz")["corrected"])
+        with mock.patch.object(search, "process", None):
+            self.assertEqual(search.search("tirzepatyde"), {"results": [], "corrected": None})
+
+
+class BlogAdminSearchTests(AppTestCase):
+    def test_body_text_finds_published_and_hidden_posts(self):
+        for i, active in enumerate([True, False]):
+            BlogPost.objects.create(
+                title=f"Post {i}",
+                slug=f"post-{i}",
+                excerpt="Dosing notes",
+                body="Reconstitution with bacteriostatic water",
+                main_image="blog/post.webp",
+                is_active=active,
+            )
+        BlogPost.objects.create(title="Other", slug="other", excerpt="Shipping", body="Cold packs", main_image="blog/post.webp")
+        self.client.force_login(User.objects.create_superuser("admin", "admin@example.com", "pw"))
+
+        response = self.client.get("/admin/app_fsMD/blogpost/", {"q": "bacteriostatic wat"})
+        self.assertEqual(
+            sorted(post.slug for post in response.context["cl"].result_list), ["post-0", "post-1"]
+        )
+
+
+class SitemapShardTests(AppTestCase):
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch.object(sitemaps, "SHARD_MAX_URLS", 2)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        with self.captureOnCommitCallbacks(execute=True):
+            category = Category.objects.create(name="Recovery", slug="recovery")
+            self.products = [
+                Product.objects.create(category=category, name=f"Peptide {i}", slug=f"peptide-{i}", price=Decimal("10.00"))
+                for i in range(5)
+            ]
+        flush_sitemaps()
+
+    def _pages(self):
+        return [page for page, _ in sitemaps._manifest()["products"]]
+
+    def test_save_rebuilds_only_its_shard_after_commit(self):
+        last = self.products[-1]
+        pages = self._pages()
+        self.assertIn(sitemaps.shard_of(last.pk), pages)
+
+        with mock.patch.object(sitemaps, "_render_shard", wraps=sitemaps._render_shard) as render:
+            with self.captureOnCommitCallbacks(execute=True):
+                last.is_active = False
+                last.save()
+                last.save()
+            self.assertEqual(render.call_count, 0)  # queued, not built in the request
+            flush_sitemaps()
+        self.assertEqual(
+            [(call.args[0], call.args[1]) for call in render.call_args_list],
+            [("products", sitemaps.shard_of(last.pk))],
+        )
+        self.assertEqual(self._pages(), sorted({sitemaps.shard_of(p.pk) for p in self.products[:-1]}))
+
+
+class GcMediaTests(AppTestCase):
+    def setUp(self):
+        super().setUp()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        override = self.settings(MEDIA_ROOT=media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.cutoff = timezone.now() - timedelta(hours=1)
+
+    def _old_file(self, name):
+        default_storage.save(name, ContentFile(b"bytes"))
+        stamp = time.time() - 2 * 24 * 3600
+        os.utime(default_storage.path(name), (stamp, stamp))
+        return name
+
+    def test_reused_cas_name_is_touched(self):
+        name = self._old_file("cas/ab/" + "ab" * 16 + ".webp")
+        default_storage.save(name, ContentFile(b"bytes"))
+        self.assertGreaterEqual(default_storage.get_modified_time(name), self.cutoff)
+
+    def test_orphan_referenced_since_the_scan_is_kept(self):
+        name = self._old_file("cas/cd/" + "cd" * 16 + ".webp")
+        Category.objects.filter(pk=Category.objects.create(name="Skin", slug="skin").pk).update(image=name)
+        self.assertFalse(delete_if_orphan(default_storage, name, self.cutoff))
+        self.assertTrue(default_storage.exists(name))
+
+    def test_only_managed_directories_are_collected(self):
+        orphan = self._old_file("cas/ef/" + "ef" * 16 + ".webp")
+        other = self._old_file("_probe/probe.bin")
+        call_command("gc_media", stdout=StringIO())
+        self.assertFalse(default_storage.exists(orphan))
+        self.assertTrue(default_storage.exists(other))
@@ -0,0 +1,94 @@
+"""
+The Postgres branches: tsquery search over the 0016 GIN index and the pg_class row
+estimate. Run under the test profile (see project_fsMD/settings_test.py):
+
+    TEST_DATABASE_URL=postgres://... DJANGO_SETTINGS_MODULE=project_fsMD.settings_test \
+        python manage.py test app_fsMD.tests_postgres
+
+Skipped everywhere else.
+"""
+import os
+from decimal import Decimal
+from unittest import mock, skipUnless
+
+from django.db import connection
+
+from . import paginators, search
+from .models import BlogPost, Category, Product, SearchDocument
+from .paginators import EstimatedCountPaginator, estimate_rows
+from .tests import AppTestCase
+
+ON_POSTGRES = bool(os.environ.get("TEST_DATABASE_URL")) and connection.vendor == "postgresql"
+
+
+@skipUnless(ON_POSTGRES, "needs TEST_DATABASE_URL pointing at Postgres")
+class PostgresSearchTests(AppTestCase):
+    def setUp(self):
+        super().setUp()
+        with self.captureOnCommitCallbacks(execute=True):
+            category = Category.objects.create(name="Weight", slug="weight")
+            Product.objects.create(
+                category=category, name="Tirzepatide", slug="tirzepatide", price=Decimal("10.00"),
+                long_details="Often compared with semaglutide.",
+            )
+            Product.objects.create(category=category, name="Semaglutide", slug="semaglutide", price=Decimal("10.00"))
+            BlogPost.objects.create(
+                title="Semaglutide dosing", slug="semaglutide-dosing", excerpt="Notes",
+                body="Weekly injections", main_image="blog/post.webp",
+            )
+
+    def test_title_hits_rank_above_body_hits(self):
+        titles = [r["title"] for r in search.search("semaglu", kind=SearchDocument.Kind.PRODUCT)["results"]]
+        self.assertEqual(titles, ["Semaglutide", "Tirzepatide"])
+
+    def test_only_the_last_term_is_a_prefix(self):
+        self.assertEqual([r["title"] for r in search.search("semaglutide dos")["results"]], ["Semaglutide dosing"])
+        with mock.patch.object(search, "process", None):  # no typo fallback
+            self.assertEqual(search.search("semaglu dosing")["results"], [])
+
+    def test_matching_documents_for_admin_search(self):
+        ids = search.matching_documents("compared semaglu", SearchDocument.Kind.PRODUCT)
+        self.assertEqual(list(Product.objects.filter(pk__in=ids).values_list("slug", flat=True)), ["tirzepatide"])
+        self.assertIsNone(search.matching_documents("  ", SearchDocument.Kind.PRODUCT))
+
+    def test_query_can_use_the_gin_index(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM pg_indexes WHERE indexname = 'app_fsmd_searchdocument_tsv'")
+            self.assertIsNotNone(cursor.fetchone())
+            # Three rows would always be a seq scan; the point is that PG_VECTOR matches
+            # the indexed expression, so the planner can use it at all.
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute(
+                f'EXPLAIN SELECT id FROM "app_fsMD_searchdocument" '
+                f"WHERE {search.PG_VECTOR} @@ to_tsquery('simple', %s)",
+                ["semaglu:*"],
+            )
+            plan = "\n".join(row[0] for row in cursor.fetchall())
+        self.assertIn("app_fsmd_searchdocument_tsv", plan)
+
+
+@skipUnless(ON_POSTGRES, "needs TEST_DATABASE_URL pointing at Postgres")
+class PostgresEstimateTests(AppTestCase):
+    def setUp(self):
+        super().setUp()
+        with self.captureOnCommitCallbacks(execute=True):
+            category = Category.objects.create(name="Recovery", slug="recovery")
+            for i in range(5):
+                Product.objects.create(category=category, name=f"Peptide {i}", slug=f"peptide-{i}", price=Decimal("10.00"))
+
+    def _analyze(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {connection.ops.quote_name(Product._meta.db_table)}")
+
+    def test_reltuples_after_analyze(self):
+        self._analyze()
+        self.assertEqual(estimate_rows(Product), 5)
+
+    def test_unfiltered_count_uses_the_estimate(self):
+        self._analyze()
+        Product.objects.filter(slug="peptide-0").delete()  # not in reltuples until the next ANALYZE
+        with mock.patch.object(paginators, "EXACT_BELOW", 1):
+            self.assertEqual(EstimatedCountPaginator(Product.objects.order_by("pk"), 2).count, 5)
+            self.assertEqual(
+                EstimatedCountPaginator(Product.objects.filter(is_active=True).order_by("pk"), 2).count, 4
+            )
@@ -1,13 +1,5 @@
 from django.urls import path
-from django.contrib.sitemaps.views import sitemap
 from . import views
-from .sitemaps import StaticViewSitemap, CategorySitemap, ProductSitemap
-
-sitemaps = {
-    "static": StaticViewSitemap,
-    "categories": CategorySitemap,
-    "products": ProductSitemap,
-}
 
 urlpatterns = [
     path('', views.home, name='home'),
@@ -24,19 +16,25 @@ urlpatterns = [
 
     path('blogs-and-updates/', views.blgs_updts, name='blgs_updts'),
     path('newsletter/subscribe/', views.newsletter_subscribe, name='newsletter_subscribe'),
+    path('newsletter/subscribe/async/', views.newsletter_subscribe_async, name='newsletter_subscribe_async'),
+    path('search/', views.search, name='search'),
+    path('autocomplete/', views.autocomplete, name='autocomplete'),
 
     path("program-details/<slug:slug>/", views.prgrm_dtls, name="prgrm_dtls"),
     path("product-details/<slug:slug>/", views.prdct_dtls, name="prdct_dtls"),
     path("programs-and-services/", views.prgrms_srvcs, name="prgrms_srvcs"),
+    path("api/products/", views.product_listing, name="product_listing"),
     
     path("cart/add/", views.cart_add, name="cart_add"),
     path("cart/summary/", views.cart_summary, name="cart_summary"),
     path("cart/", views.cart_page, name="cart_page"),   
     path("cart/update/", views.cart_update, name="cart_update"),
     path("cart/remove/", views.cart_remove, name="cart_remove"),
+    path("cart/recommendations/", views.recommendations, name="cart_recommendations"),
 
     path("robots.txt", views.robots_txt, name="robots_txt"),
-    path("sitemap.xml", sitemap, {"sitemaps": sitemaps}, name="django.contrib.sitemaps.views.sitemap"),
+    path("sitemap.xml", views.sitemap_xml, name="sitemap"),
+    path("sitemap-<slug:section>-<int:page>.xml", views.sitemap_xml, name="sitemap_shard"),
     path("test-404/", views.test_404, name="test_404"),
 
 ]
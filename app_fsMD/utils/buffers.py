@@ -0,0 +1,80 @@
+import atexit
+import logging
+import threading
+
+from django.db import DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+
+class BufferedWriter:
+    """
+    Per-process write-behind buffer. `append()` only takes a lock and adds to a list; a
+    daemon thread hands everything buffered to `write(rows)` every `flush_seconds`, or as
+    soon as `flush_size` rows wait. When `write` raises a DatabaseError the rows are kept
+    for the next flush, up to `max_buffered`; beyond that new rows are dropped and counted.
+    Whatever is still buffered is written at interpreter exit. With `threaded` off (the
+    test suite), no thread runs and rows wait for an explicit flush().
+    """
+
+    threaded = True
+
+    def __init__(self, name, write, *, flush_size=200, flush_seconds=2.0, max_buffered=10_000):
+        self.name = name
+        self.write = write
+        self.flush_size = flush_size
+        self.flush_seconds = flush_seconds
+        self.max_buffered = max_buffered
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._rows = []
+        self._thread = None
+        atexit.register(self.flush)
+
+    def __len__(self):
+        return len(self._rows)
+
+    def append(self, row) -> bool:
+        """Buffer one row; False if the buffer is full and the row was dropped."""
+        with self._lock:
+            if len(self._rows) >= self.max_buffered:
+                self.dropped += 1
+                return False
+            self._rows.append(row)
+            full = len(self._rows) >= self.flush_size
+            # Also after a fork: the child inherits the buffer but not the thread.
+            if self.threaded and (self._thread is None or not self._thread.is_alive()):
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+        if full:
+            self._wake.set()
+        return True
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_seconds)
+            self._wake.clear()
+            if not self.threaded:
+                continue
+            try:
+                self.flush()
+            finally:
+                connections.close_all()
+
+    def flush(self) -> int:
+        """Write everything buffered so far; returns the number of rows written."""
+        with self._lock:
+            rows, self._rows = self._rows, []
+        if not rows:
+            return 0
+        try:
+            self.write(rows)
+        except DatabaseError:
+            logger.warning("%s: could not write %d rows; keeping them for the next flush.", self.name, len(rows), exc_info=True)
+            with self._lock:
+                room = max(0, self.max_buffered - len(self._rows))
+                self.dropped += max(0, len(rows) - room)
+                self._rows[:0] = rows[max(0, len(rows) - room):] if room else []
+            return 0
+        return len(rows)
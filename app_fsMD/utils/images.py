@@ -1,11 +1,181 @@
+import hashlib
+import math
 import os
+import re
 from io import BytesIO
+from tempfile import SpooledTemporaryFile
 
-from PIL import Image, ImageOps
-from django.core.files.base import ContentFile
+from PIL import Image, ImageOps, features
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.base import File
+
+
+HASHED_NAME = re.compile(r"\.[0-9a-f]{12}\.[A-Za-z0-9]+$")
+CAS_NAME = re.compile(r"^cas/[0-9a-f]{2}/[0-9a-f]{32}\.[A-Za-z0-9]+$")
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:12]
+
+
+def cas_name(digest: str, ext: str) -> str:
+    """Content-addressed storage name: `cas/3f/3f9a...(32 hex).webp`."""
+    return f"cas/{digest[:2]}/{digest[:32]}.{ext}"
+
+
+def is_cas_name(name: str) -> bool:
+    return bool(CAS_NAME.match(name or ""))
+
+
+def is_hashed_name(name: str) -> bool:
+    """True for names like `card4.3f9a1c0b7e2d.webp` or cas/ names, whose content never changes."""
+    return is_cas_name(name) or bool(HASHED_NAME.search(name or ""))
+
+
+def source_digest(fh, *params) -> str:
+    """
+    sha256 of a file's bytes (read in chunks) plus the parameters it will be encoded
+    with, so the same upload at the same settings always maps to the same cas/ name.
+    """
+    digest = hashlib.sha256(repr(params).encode())
+    for chunk in fh.chunks():
+        digest.update(chunk)
+    fh.seek(0)
+    return digest.hexdigest()
+
+
+# Encoded output above this spills from memory to a temp file on its way to storage.
+SPOOL_MAX_BYTES = 1024 * 1024
+
+
+def check_image_limits(size: int, im: Image.Image = None) -> None:
+    """
+    Reject uploads over IMAGE_UPLOAD_MAX_BYTES, or (given the opened image, of which only
+    the header has been read) over IMAGE_MAX_PIXELS, before anything is decoded.
+    """
+    max_bytes = settings.IMAGE_UPLOAD_MAX_BYTES
+    if size and size > max_bytes:
+        raise ValidationError(
+            f"Image is {size / 1024 / 1024:.1f} MB; the limit is {max_bytes / 1024 / 1024:.0f} MB.",
+            code="image_too_large",
+        )
+    if im is not None and im.width * im.height > settings.IMAGE_MAX_PIXELS:
+        raise ValidationError(
+            f"Image is {im.width}x{im.height} ({im.width * im.height / 1e6:.0f} MP); "
+            f"the limit is {settings.IMAGE_MAX_PIXELS / 1e6:.0f} MP.",
+            code="image_too_many_pixels",
+        )
+
+
+def open_image(fh, size: int = 0) -> Image.Image:
+    check_image_limits(size)
+    try:
+        im = Image.open(fh)
+    except Image.DecompressionBombError as exc:
+        raise ValidationError(str(exc), code="image_too_many_pixels")
+    try:
+        check_image_limits(0, im)
+    except ValidationError:
+        im.close()
+        raise
+    return im
+
+
+def validate_image_upload(value) -> None:
+    """Model field validator: the same limits, checked in forms before the pipeline runs."""
+    if getattr(value, "_committed", False):
+        return
+    with open_image(value, value.size):
+        pass
+    value.seek(0)
+
+
+def prepare_image(im: Image.Image, max_px: int = 0) -> Image.Image:
+    """
+    Shrink to fit max_px (0 = no limit), EXIF-rotate and normalise to RGB/RGBA.
+
+    JPEGs are decoded at the smallest 1/2, 1/4 or 1/8 scale that still covers max_px
+    (draft), and rotation happens after the shrink, so a 24 MP photo never exists in
+    memory at full resolution.
+    """
+    if max_px and max(im.size) > max_px:
+        ratio = max_px / max(im.size)
+        im.draft(None, (math.ceil(im.width * ratio), math.ceil(im.height * ratio)))
+        im.thumbnail((max_px, max_px), Image.Resampling.LANCZOS)
+
+    ImageOps.exif_transpose(im, in_place=True)
+
+    if im.mode not in ("RGB", "RGBA"):
+        im = im.convert("RGBA" if "A" in im.mode else "RGB")
+    if im.mode != "RGBA":
+        im = im.convert("RGB")
+    return im
+
+
+def resize_to_width(im: Image.Image, width: int) -> Image.Image:
+    if im.width <= width:
+        return im
+    height = max(1, round(im.height * width / im.width))
+    return im.resize((width, height), Image.Resampling.LANCZOS)
+
+
+def write_image(im: Image.Image, fh, format: str = "WEBP", *, quality: int = 82) -> None:
+    if format == "WEBP":
+        im.save(fh, format="WEBP", quality=quality, method=6)
+    else:
+        im.save(fh, format=format, quality=quality)
+
+
+def encode_image(im: Image.Image, format: str = "WEBP", *, quality: int = 82) -> bytes:
+    out = BytesIO()
+    write_image(im, out, format, quality=quality)
+    return out.getvalue()
+
+
+def save_webp(fh, storage, name: str, *, size: int = 0, quality: int = 82, max_px: int = 2400) -> str:
+    """
+    Decode fh within the size limits and write it to storage as WebP. The encoded bytes
+    go through a spooled file that storage reads in chunks, not a bytes copy per hop.
+    """
+    with open_image(fh, size) as im, SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES) as out:
+        write_image(prepare_image(im, max_px), out, quality=quality)
+        out.seek(0)
+        return storage.save(name, File(out, name=os.path.basename(name)))
+
+
+def avif_supported() -> bool:
+    return features.check("avif")
+
+
+def _use_stored(field, name: str) -> None:
+    """
+    Point the field at a file already in storage. Skips upload_to: cas/ names don't
+    depend on the owning row, and re-applying it to a stored name nests the directories.
+    """
+    field.close()
+    field.name = name
+    field._committed = True
+
+
+def _fits(fh, max_px: int) -> bool:
+    """True if the image is within max_px on both sides; only the header is read."""
+    with open_image(fh, fh.size) as im:
+        fits = not max_px or max(im.size) <= max_px
+    fh.seek(0)
+    return fits
 
 
 def convert_imagefield_to_webp(instance, field_name: str, *, quality: int = 82, max_px: int = 2400) -> None:
+    """
+    Encode the field's image as WebP under a content-addressed name keyed by the source
+    bytes. An image that was uploaded before (to any product, category, post, ...) is
+    already in storage under that name, so it is neither re-encoded nor stored twice.
+    A WebP upload gets the same name; it is stored as uploaded unless it is over max_px.
+    Raises ValidationError for images over the size limits.
+    The previous file is left for `manage.py gc_media`, which deletes it once no
+    ImageField references it.
+    """
     field = getattr(instance, field_name, None)
     if not field or not getattr(field, "name", ""):
         return
@@ -14,7 +184,9 @@ def convert_imagefield_to_webp(instance, field_name: str, *, quality: int = 82,
     field.name = clean_name
 
     name_lower = clean_name.lower()
-    if name_lower.endswith(".webp"):
+    is_webp = name_lower.endswith(".webp")
+    # Stored WebP names predate content addressing; they are left where they are.
+    if is_cas_name(clean_name) or (is_webp and field._committed):
         return
     if name_lower.endswith("products/no_image_available.png"):
         return
@@ -25,46 +197,47 @@ def convert_imagefield_to_webp(instance, field_name: str, *, quality: int = 82,
         except FileNotFoundError:
             return
 
-        with Image.open(field) as im:
-            im = ImageOps.exif_transpose(im)
-
-            if max_px and max(im.size) > max_px:
-                im.thumbnail((max_px, max_px), Image.Resampling.LANCZOS)
-
-            if im.mode not in ("RGB", "RGBA"):
-                im = im.convert("RGBA" if "A" in im.mode else "RGB")
-            if im.mode != "RGBA":
-                im = im.convert("RGB")
-
-            out = BytesIO()
-            im.save(out, format="WEBP", quality=quality, method=6)
-            out.seek(0)
-
-        directory = os.path.dirname(clean_name).replace("\\", "/")
-        base = os.path.splitext(os.path.basename(clean_name))[0]
-        base = base[:60] if base else f"{instance._meta.model_name}-{getattr(instance, 'pk', 'x')}"
-        new_name = f"{directory}/{base}.webp" if directory else f"{base}.webp"
-
-        max_len = getattr(field.field, "max_length", 255) or 255
-        if len(new_name) > max_len:
-            short_base = f"{instance._meta.model_name}-{getattr(instance, 'pk', 'x')}-{field_name}"
-            short_base = short_base[:60]
-            new_name = f"{directory}/{short_base}.webp" if directory else f"{short_base}.webp"
-
-        old_name = clean_name
+        new_name = cas_name(source_digest(field, "webp", quality, max_px), "webp")
         storage = field.storage
-
-        field.close()
-        field.save(new_name, ContentFile(out.read()), save=False)
-
-        if old_name != field.name and storage.exists(old_name):
-            try:
-                storage.delete(old_name)
-            except PermissionError:
-                pass
+        if storage.exists(new_name):
+            # Reused: mark it recent for gc_media, like ContentAddressedMixin.save does.
+            touch = getattr(storage, "touch", None)
+            if touch is not None:
+                touch(new_name)
+        elif is_webp and _fits(field, max_px):
+            storage.save(new_name, field)
+        else:
+            save_webp(field, storage, new_name, size=field.size, quality=quality, max_px=max_px)
+        _use_stored(field, new_name)
 
     finally:
         try:
             field.close()
         except Exception:
             pass
+
+
+def rehash_imagefield(instance, field_name: str) -> bool:
+    """
+    Move an already-converted file to its content-addressed name (`cas/..`), sharing
+    the stored copy with any other field holding the same bytes. The old file is left
+    for `manage.py gc_media`. Returns True if the field changed; the caller saves the
+    instance.
+    """
+    field = getattr(instance, field_name, None)
+    if not field or not getattr(field, "name", "") or is_cas_name(field.name):
+        return False
+
+    old_name = field.name.replace("\\", "/")
+    storage = field.storage
+    try:
+        with storage.open(old_name, "rb") as fh:
+            digest = source_digest(fh)
+            new_name = cas_name(digest, os.path.splitext(old_name)[1].lstrip(".").lower() or "bin")
+            if not storage.exists(new_name):
+                storage.save(new_name, fh)
+    except FileNotFoundError:
+        return False
+
+    _use_stored(field, new_name)
+    return True
@@ -1,15 +1,29 @@
+import gzip
+import ipaddress
+from datetime import datetime, timezone
+from functools import lru_cache
+
 from django.conf import settings
-from django.core.cache import cache
-from django.db.models import Count, Prefetch, Q
-from django.http import HttpResponse, JsonResponse
+from django.http import Http404, HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
+from django.utils.functional import SimpleLazyObject
 from django.utils.html import strip_tags
+from django.utils.http import url_has_allowed_host_and_scheme
 from django.views.decorators.cache import never_cache
-from django.views.decorators.http import require_POST
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.views.decorators.http import condition, require_POST
 
+from .autocomplete import get_prefix_index, index_version
 from .cart import Cart
-from .models import BlogPost, Category, CategoryBullet, Feedback, NewsletterSubscription, Product
+from .cart_events import bought_together, log_cart_event, pairs_version
+from . import newsletter
+from .catalog import get_catalog, site_cache_version
+from .facets import get_facet_index, parse_filters
+from .models import BlogPost, CartEvent, Category, Feedback, Product, SearchDocument
+from .related import related_for, related_version
+from .search import search as search_documents
+from .sitemaps import SITEMAP_SECTIONS, build_sitemaps, sitemap_path
 
 
 def _meta_text(*parts, fallback="", max_len=160) -> str:
@@ -29,74 +43,113 @@ def robots_txt(request):
         "Disallow: /cart/remove/",
         "Disallow: /cart/summary/",
         "Disallow: /newsletter/subscribe/",
+        "Disallow: /search/",
+        "Disallow: /autocomplete/",
+        "Disallow: /api/products/",
+        "Disallow: /cart/recommendations/",
         f"Sitemap: {sitemap_url}",
     ]
     return HttpResponse("\n".join(lines), content_type="text/plain")
 
 
-TTL_NAV = 60 * 60
-TTL_LIST = 5 * 60
-TTL_DETAIL = 10 * 60
+def _sitemap_stat(request, section=None, page=None):
+    if section is not None and section not in SITEMAP_SECTIONS:
+        return None
+    path = sitemap_path(section, page)
+    if section is None and not path.exists():
+        build_sitemaps()
+    try:
+        return path.stat()
+    except FileNotFoundError:
+        return None
+
+
+def _sitemap_etag(request, section=None, page=None):
+    st = _sitemap_stat(request, section, page)
+    return f'"{st.st_mtime_ns:x}-{st.st_size:x}"' if st else None
+
+
+def _sitemap_last_modified(request, section=None, page=None):
+    st = _sitemap_stat(request, section, page)
+    return datetime.fromtimestamp(st.st_mtime, tz=timezone.utc) if st else None
+
+
+@condition(etag_func=_sitemap_etag, last_modified_func=_sitemap_last_modified)
+def sitemap_xml(request, section=None, page=None):
+    """Serve a prebuilt sitemap file (sitemaps.py): the gzip bytes as-is when accepted."""
+    if section is not None and section not in SITEMAP_SECTIONS:
+        raise Http404
+    try:
+        data = sitemap_path(section, page).read_bytes()
+    except FileNotFoundError:
+        raise Http404
+
+    response = HttpResponse(content_type="application/xml")
+    if "gzip" in request.headers.get("Accept-Encoding", ""):
+        response["Content-Encoding"] = "gzip"
+        response.content = data
+    else:
+        response.content = gzip.decompress(data)
+    patch_vary_headers(response, ["Accept-Encoding"])
+    patch_cache_control(response, public=True, max_age=3600)
+    return response
+
+
+def search(request):
+    """JSON search over products and blog posts: ?q=...&kind=product|post&limit=20"""
+    query = request.GET.get("q", "").strip()[:100]
+    kind = request.GET.get("kind", "")
+    if kind not in SearchDocument.Kind.values:
+        kind = ""
+    try:
+        limit = int(request.GET.get("limit", 20))
+    except ValueError:
+        limit = 20
 
+    response = JsonResponse({"query": query, **search_documents(query, kind, limit)})
+    patch_cache_control(response, public=True, max_age=300)
+    return response
 
-def _site_cache_version() -> int:
-    return cache.get_or_set("site_cache_v", 1, None)
 
+def _autocomplete_etag(request):
+    return "ac-" + "-".join(str(v) for v in index_version())
 
-def _ck(prefix: str, *parts) -> str:
-    v = _site_cache_version()
-    return f"{v}:{prefix}:" + ":".join(str(p) for p in parts)
 
+@condition(etag_func=_autocomplete_etag)
+def autocomplete(request):
+    """Navbar typeahead, from the in-memory prefix index: {"q": ..., "items": [[label, url, kind], ...]}"""
+    query = request.GET.get("q", "")[:60]
+    items = [list(entry) for entry in get_prefix_index().lookup(query)]
+    response = JsonResponse({"q": query, "items": items})
+    patch_cache_control(response, public=True, max_age=300)
+    return response
 
-def cache_get(key: str, ttl: int, builder):
-    data = cache.get(key)
-    if data is None:
-        data = builder()
-        cache.set(key, data, ttl)
-    return data
 
+def _listing_etag(request):
+    return f"products-{site_cache_version()}"
 
-def _active_category_bullets_qs():
-    return CategoryBullet.objects.filter(is_active=True).order_by("sort_order", "id")
+
+@condition(etag_func=_listing_etag)
+def product_listing(request):
+    """
+    JSON product listing with filters, sorting and facet counts:
+    ?category=<slug>&kind=&price_min=&price_max=&requires_prescription=1&in_stock=1&sort=price&page=2
+    """
+    response = JsonResponse(get_facet_index().listing(parse_filters(request.GET)))
+    patch_cache_control(response, public=True, max_age=300)
+    return response
 
 
 def get_nav_programs():
-    key = _ck("nav_programs")
-    return cache_get(
-        key,
-        TTL_NAV,
-        lambda: list(
-            Category.objects.filter(is_active=True)
-            .prefetch_related(Prefetch("bullets", queryset=_active_category_bullets_qs()))
-            .order_by("sort_order", "name")
-        ),
-    )
+    return get_catalog().categories
 
 
 def get_core_program_categories():
-    key = _ck("core_categories")
-    return cache_get(
-        key,
-        TTL_LIST,
-        lambda: list(
-            Category.objects.filter(is_active=True)
-            .annotate(product_count=Count("products", filter=Q(products__is_active=True)))
-            .order_by("sort_order", "name")
-        ),
-    )
+    return get_catalog().categories
 
 
 def get_home_products():
-    key = _ck("home_products")
-    return cache_get(
-        key,
-        TTL_LIST,
-        lambda: list(
-            Product.objects.filter(is_active=True, category__is_active=True)
-            .select_related("category")
-            .order_by("name")
-        ),
-    )
+    return get_catalog().products
 
 
 def home(request):
@@ -110,7 +163,8 @@ def home(request):
         BlogPost.objects.filter(is_active=True, is_featured_home=True)
         .order_by("sort_order", "-published_at")[:5]
     )
-    featured_post = home_posts[0] if home_posts else None
+    # Lazy, so cached h_fdbck/h_blg fragments don't cost a query.
+    featured_post = SimpleLazyObject(lambda: home_posts[0] if home_posts else None)
 
     return render(
         request,
@@ -179,16 +233,62 @@ def blgs_updts(request):
     )
 
 
+@lru_cache(maxsize=1)
+def _trusted_networks(proxies: tuple) -> tuple:
+    return tuple(ipaddress.ip_network(p, strict=False) for p in proxies)
+
+
+def _is_trusted(address: str, networks) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in networks)
+
+
+def _client_ip(request) -> str:
+    """
+    REMOTE_ADDR, unless it is one of settings.TRUSTED_PROXIES: then the right-most
+    X-Forwarded-For address that isn't a trusted proxy. Entries further left are
+    whatever the client chose to send.
+    """
+    addr = request.META.get("REMOTE_ADDR", "")
+    networks = _trusted_networks(tuple(settings.TRUSTED_PROXIES))
+    if not networks or not _is_trusted(addr, networks):
+        return addr
+    forwarded = [a.strip() for a in request.META.get("HTTP_X_FORWARDED_FOR", "").split(",") if a.strip()]
+    for hop in reversed(forwarded):
+        if not _is_trusted(hop, networks):
+            return hop
+    return forwarded[0] if forwarded else addr
+
+
+def _newsletter_response(request, result):
+    if request.headers.get("x-requested-with") == "XMLHttpRequest" or "application/json" in request.headers.get("accept", ""):
+        status = {newsletter.OK: 200, newsletter.INVALID: 400, newsletter.LIMITED: 429}[result]
+        return JsonResponse({"ok": result == newsletter.OK, "status": result}, status=status)
+    return _redirect_back(request)
+
+
+def _redirect_back(request):
+    back = request.META.get("HTTP_REFERER", "")
+    if not url_has_allowed_host_and_scheme(back, allowed_hosts={request.get_host()}, require_https=request.is_secure()):
+        back = reverse("blgs_updts")
+    return redirect(back)
+
+
 def newsletter_subscribe(request):
-    if request.method == "POST":
-        email = request.POST.get("email", "").strip().lower()
-        if email:
-            sub, created = NewsletterSubscription.objects.get_or_create(email=email)
-            if not created and not sub.is_active:
-                sub.is_active = True
-                sub.unsubscribed_at = None
-                sub.save()
-    return redirect(request.META.get("HTTP_REFERER", reverse("blgs_updts")))
+    """Queue a sign-up (newsletter.py); no database write happens in the request. A GET just goes back."""
+    if request.method != "POST":
+        return _redirect_back(request)
+    return _newsletter_response(request, newsletter.subscribe(request.POST.get("email"), _client_ip(request)))
+
+
+async def newsletter_subscribe_async(request):
+    """newsletter_subscribe for ASGI deployments: the cache round trips are awaited."""
+    if request.method != "POST":
+        return _redirect_back(request)
+    return _newsletter_response(request, await newsletter.asubscribe(request.POST.get("email"), _client_ip(request)))
 
 
 def terms_conditions(request):
@@ -220,30 +320,16 @@ def accessibility_statement(request):
 
 
 def prgrm_dtls(request, slug):
-    nav_programs = get_nav_programs()
+    catalog = get_catalog()
+    nav_programs = catalog.categories
 
-    cat_id_key = _ck("category_id", slug)
-    category_id = cache_get(
-        cat_id_key,
-        TTL_DETAIL,
-        lambda: Category.objects.values_list("id", flat=True).get(slug=slug, is_active=True),
-    )
+    category = catalog.categories_by_slug.get(slug)
+    if category is None:
+        raise Http404("No Category matches the given query.")
 
-    category = get_object_or_404(Category, id=category_id, is_active=True)
-
-    prod_key = _ck("category_products", slug)
-    products = cache_get(
-        prod_key,
-        TTL_LIST,
-        lambda: list(
-            Product.objects.filter(category=category, is_active=True, category__is_active=True)
-            .select_related("category")
-            .prefetch_related("images")
-            .order_by("name")
-        ),
-    )
+    products = catalog.products_for(category.id)
 
-    canonical_url = request.build_absolute_uri(reverse("prgrm_dtls", kwargs={"slug": category.slug}))
+    canonical_url = request.build_absolute_uri(category.url)
 
     meta_description = _meta_text(
         category.tagline,
@@ -252,7 +338,7 @@ def prgrm_dtls(request, slug):
         max_len=160,
     )
 
-    og_image = request.build_absolute_uri(category.image.url) if getattr(category, "image", None) else None
+    og_image = request.build_absolute_uri(category.image_url) if category.image_url else None
 
     return render(
         request,
@@ -271,32 +357,17 @@ def prgrm_dtls(request, slug):
 
 
 def prdct_dtls(request, slug):
-    nav_programs = get_nav_programs()
+    catalog = get_catalog()
+    nav_programs = catalog.categories
 
-    product = get_object_or_404(
-        Product.objects.select_related("category").prefetch_related("images"),
-        slug=slug,
-        is_active=True,
-        category__is_active=True,
-    )
+    product = catalog.products_by_slug.get(slug)
+    if product is None:
+        raise Http404("No Product matches the given query.")
 
-    related_key = _ck("related_products", product.category_id, product.id)
-    related_products = cache_get(
-        related_key,
-        TTL_LIST,
-        lambda: list(
-            Product.objects.filter(
-                is_active=True,
-                category__is_active=True,
-                category_id=product.category_id,
-            )
-            .exclude(id=product.id)
-            .select_related("category")
-            .order_by("name")[:12]
-        ),
-    )
+    bought_with = bought_together([product.id], catalog)
+    related_products = [p for p in related_for(product, catalog) if p not in bought_with]
 
-    canonical_url = request.build_absolute_uri(reverse("prdct_dtls", kwargs={"slug": product.slug}))
+    canonical_url = request.build_absolute_uri(product.url)
 
     meta_description = _meta_text(
         product.short_details,
@@ -305,7 +376,7 @@ def prdct_dtls(request, slug):
         max_len=160,
     )
 
-    og_image = request.build_absolute_uri(product.main_image.url) if getattr(product, "main_image", None) else None
+    og_image = request.build_absolute_uri(product.main_image_url) if product.main_image_url else None
 
     return render(
         request,
@@ -313,6 +384,7 @@ def prdct_dtls(request, slug):
         {
             "nav_programs": nav_programs,
             "product": product,
+            "bought_with": bought_with,
             "related_products": related_products,
             "meta_description": meta_description,
             "canonical_url": canonical_url,
@@ -370,6 +442,7 @@ def cart_add(request):
     qty = _clamp_qty_to_stock(product, qty)
     cart = Cart(request)
     cart.add(product_id=product.id, qty=qty, replace=False)
+    log_cart_event(request, CartEvent.Action.ADD, product.id, qty)
     return JsonResponse(_cart_payload(cart))
 
 
@@ -386,6 +459,7 @@ def cart_update(request):
     qty = _clamp_qty_to_stock(product, qty)
     cart = Cart(request)
     cart.set(product_id=product.id, qty=qty)
+    log_cart_event(request, CartEvent.Action.SET, product.id, qty)
     return JsonResponse(_cart_payload(cart))
 
 
@@ -395,9 +469,49 @@ def cart_remove(request):
     product_id = int(request.POST.get("product_id"))
     cart = Cart(request)
     cart.remove(product_id=product_id)
+    log_cart_event(request, CartEvent.Action.REMOVE, product_id)
     return JsonResponse(_cart_payload(cart))
 
 
+def _recommendations_etag(request):
+    return f"rec-{site_cache_version()}-{pairs_version()}-{related_version()}"
+
+
+@condition(etag_func=_recommendations_etag)
+def recommendations(request):
+    """
+    Products to suggest next to ?product=<id>&product=<id>... (a product page, or the side
+    cart's contents): most often in the same carts, then the first product's related list.
+    """
+    ids = []
+    for value in request.GET.getlist("product")[:20]:
+        if value.isdigit():
+            ids.append(int(value))
+    try:
+        limit = min(12, max(1, int(request.GET.get("limit", 4))))
+    except ValueError:
+        limit = 4
+
+    catalog = get_catalog()
+    products = bought_together(ids, catalog, limit)
+    first = catalog.products_by_id.get(ids[0]) if ids else None
+    if first is not None and len(products) < limit:
+        for p in related_for(first, catalog):
+            if len(products) == limit:
+                break
+            if p.id not in ids and p not in products:
+                products.append(p)
+
+    response = JsonResponse({
+        "items": [
+            {"id": p.id, "name": p.name, "url": p.url, "image": p.main_image_url, "final_price": str(p.final_price)}
+            for p in products
+        ]
+    })
+    patch_cache_control(response, public=True, max_age=300)
+    return response
+
+
 @never_cache
 def cart_summary(request):
     cart = Cart(request)
@@ -422,33 +536,15 @@ def cart_page(request):
 
 
 def prgrms_srvcs(request):
-    nav_programs = get_nav_programs()
-
-    key = _ck("prgrms_srvcs_categories")
-    categories = cache_get(
-        key,
-        TTL_LIST,
-        lambda: list(
-            Category.objects.filter(is_active=True)
-            .annotate(product_count=Count("products", filter=Q(products__is_active=True), distinct=True))
-            .order_by("sort_order", "name")
-        ),
-    )
+    catalog = get_catalog()
+    nav_programs = catalog.categories
+    categories = catalog.categories
 
     programs = [c for c in categories if c.kind == Category.Kind.PROGRAM]
     services = [c for c in categories if c.kind == Category.Kind.SERVICE]
     program_slides = [programs[i:i + 3] for i in range(0, len(programs), 3)]
 
-    products_key = _ck("prgrms_srvcs_products")
-    products = cache_get(
-        products_key,
-        TTL_LIST,
-        lambda: list(
-            Product.objects.filter(is_active=True, category__is_active=True)
-            .select_related("category")
-            .order_by("name")
-        ),
-    )
+    products = catalog.products
 
     canonical_url = request.build_absolute_uri(reverse("prgrms_srvcs"))
 
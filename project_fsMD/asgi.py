@@ -9,8 +9,18 @@ https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 
 import os
 
+from django.conf import settings
+from django.core.management import call_command
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project_fsMD.settings')
 
 application = get_asgi_application()
+
+if getattr(settings, "SERVE_MEDIA", False):
+    from app_fsMD.media import MediaFilesASGI
+
+    application = MediaFilesASGI(application)
+
+if getattr(settings, "PRECOMPILE_TEMPLATES", False):
+    call_command("precompile_templates", verbosity=0)
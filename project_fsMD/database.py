@@ -0,0 +1,82 @@
+import os
+
+import dj_database_url
+
+
+SQLITE_PRAGMA_DEFAULTS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": "5000",
+    "mmap_size": str(128 * 1024 * 1024),
+    "cache_size": "-20000",
+    "temp_store": "MEMORY",
+}
+
+
+def sqlite_pragmas() -> dict:
+    """
+    PRAGMAs applied to every new SQLite connection.
+    Each one can be overridden with SQLITE_<NAME> (e.g. SQLITE_MMAP_SIZE=0 disables mmap),
+    an empty value skips the pragma entirely.
+    """
+    pragmas = {}
+    for name, default in SQLITE_PRAGMA_DEFAULTS.items():
+        value = os.environ.get(f"SQLITE_{name.upper()}", default).strip()
+        if value:
+            pragmas[name] = value
+    return pragmas
+
+
+def sqlite_options(pragmas=None) -> dict:
+    """
+    OPTIONS for the sqlite3 backend.
+    `init_command` runs on connection creation, `transaction_mode=IMMEDIATE` takes the
+    write lock at BEGIN so concurrent writers wait on busy_timeout instead of failing
+    with `database is locked` when upgrading a read transaction.
+    """
+    pragmas = sqlite_pragmas() if pragmas is None else pragmas
+    busy_ms = int(pragmas.get("busy_timeout") or 0)
+
+    options = {
+        "init_command": ";".join(f"PRAGMA {k}={v}" for k, v in pragmas.items()),
+        "transaction_mode": os.environ.get("SQLITE_TRANSACTION_MODE", "IMMEDIATE") or None,
+    }
+    if busy_ms:
+        options["timeout"] = busy_ms / 1000
+    return options
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.environ.get(name, default))
+
+
+def database_config(default_url: str, env: str = "DATABASE_URL") -> dict:
+    """
+    Build a DATABASES entry from a database URL (DATABASE_URL by default).
+
+    - sqlite: persistent connections + the pragmas above.
+    - postgres: psycopg3 connection pool when DATABASE_POOL=1 (the default), otherwise
+      persistent connections with health checks. Django refuses CONN_MAX_AGE together
+      with a pool, so pooling forces it to 0.
+    """
+    config = dj_database_url.config(
+        env=env,
+        default=default_url,
+        conn_max_age=_env_int("DATABASE_CONN_MAX_AGE", 60),
+        conn_health_checks=True,
+    )
+    options = config.setdefault("OPTIONS", {})
+    engine = config["ENGINE"]
+
+    if engine.endswith("sqlite3"):
+        options.update(sqlite_options())
+    elif engine.endswith("postgresql") and os.environ.get("DATABASE_POOL", "1") == "1":
+        options["pool"] = {
+            "min_size": _env_int("DATABASE_POOL_MIN_SIZE", 2),
+            "max_size": _env_int("DATABASE_POOL_MAX_SIZE", 10),
+            "timeout": _env_int("DATABASE_POOL_TIMEOUT", 10),
+        }
+        config["CONN_MAX_AGE"] = 0
+        config["CONN_HEALTH_CHECKS"] = False
+
+    return config
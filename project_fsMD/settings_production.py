@@ -0,0 +1,39 @@
+"""
+Production profile: DJANGO_SETTINGS_MODULE=project_fsMD.settings_production
+
+Same as settings.py, but never runs with DEBUG, requires a real secret key, and parses
+every template once at startup behind the cached loader.
+"""
+from .settings import *  # noqa: F401,F403
+from .settings import STORAGES, TEMPLATES
+import os
+
+DEBUG = False
+SECRET_KEY = os.environ["DJANGO_SECRET_KEY"]
+
+TEMPLATES[0]["APP_DIRS"] = False
+TEMPLATES[0]["OPTIONS"]["loaders"] = [
+    (
+        "django.template.loaders.cached.Loader",
+        [
+            "django.template.loaders.filesystem.Loader",
+            "django.template.loaders.app_directories.Loader",
+        ],
+    ),
+]
+
+# wsgi.py/asgi.py run `precompile_templates` on boot; a broken template stops the worker.
+PRECOMPILE_TEMPLATES = True
+
+FRAGMENT_TIMING = False
+
+# settings.py derives these from DEBUG before it is overridden above.
+SITEMAP_PROTOCOL = os.environ.get("SITEMAP_PROTOCOL", "https")
+# Media comes from the reverse proxy or the S3 bucket, never a worker (app_fsMD/media.py).
+SERVE_MEDIA = os.environ.get("SERVE_MEDIA", "0") == "1"
+
+# Hashed, gzip/brotli-precompressed static files (run `manage.py build_static --collect`).
+# WhiteNoise serves hashed names with `Cache-Control: max-age=315360000, public, immutable`.
+STORAGES["staticfiles"] = {"BACKEND": "app_fsMD.storage.StaticStorage"}
+STATIC_BUNDLES = True
+CRITICAL_CSS = True
@@ -4,10 +4,12 @@ from django.contrib import admin
 from django.urls import path, include
 from django.views.generic import RedirectView
 from django.contrib.staticfiles.storage import staticfiles_storage
+from django.utils.functional import lazy
 
 urlpatterns = [
     path("favicon.ico", RedirectView.as_view(
-        url=staticfiles_storage.url("images/favicon.ico"),
+        # Resolved on first request: the hashed name needs collectstatic's manifest.
+        url=lazy(staticfiles_storage.url, str)("images/favicon.ico"),
         permanent=True
     )),
 
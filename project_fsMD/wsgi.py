@@ -9,8 +9,18 @@ https://docs.djangoproject.com/en/5.2/howto/deployment/wsgi/
 
 import os
 
+from django.conf import settings
+from django.core.management import call_command
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project_fsMD.settings')
 
 application = get_wsgi_application()
+
+if getattr(settings, "SERVE_MEDIA", False):
+    from app_fsMD.media import MediaFiles
+
+    application = MediaFiles(application)
+
+if getattr(settings, "PRECOMPILE_TEMPLATES", False):
+    call_command("precompile_templates", verbosity=0)